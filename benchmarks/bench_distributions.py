@@ -0,0 +1,27 @@
+"""Ch. 3: the curve or probabilities of every distribution, at the page's default parameters."""
+import pytest
+
+from stat2vis import distributions as dist
+
+BRANCHES = {
+    "normal": lambda: dist.normal_curve(0.0, 1.0),
+    "uniform": lambda: dist.uniform_curve(0.0, 10.0),
+    "exponential": lambda: dist.exponential_curve(1.0),
+    "gamma": lambda: dist.gamma_curve(2.0, 1.0),
+    "chi-square": lambda: dist.chi_square_curve(5),
+    "t": lambda: dist.t_curve(5),
+    "f": lambda: dist.f_curve(15, 20),
+    "beta": lambda: dist.beta_curve(5.0, 5.0),
+    "binomial": lambda: dist.binomial_pmf(10, 0.5),
+    "hypergeometric": lambda: dist.hypergeometric_pmf(20, 10, 10),
+    "geometric": lambda: dist.geometric_pmf(0.3),
+    "negative-binomial": lambda: dist.negative_binomial_pmf(5, 0.4),
+    "poisson": lambda: dist.poisson_pmf(10.0),
+    "multinomial": lambda: dist.multinomial_sample(20, [0.33, 0.33, 0.34]),
+}
+
+
+@pytest.mark.benchmark(group="ch3-distributions")
+@pytest.mark.parametrize("branch", list(BRANCHES))
+def bench_distribution(benchmark, branch):
+    benchmark(BRANCHES[branch])
@@ -0,0 +1,81 @@
+"""EDA I and EDA II: summary table, histogram, derived level columns, point samples, crosstabs, correlations, hierarchies and pairplot."""
+import pytest
+
+from stat2vis.binning import level_column
+from stat2vis.contingency import ContingencyCube
+from stat2vis.correlation import CorrelationService
+from stat2vis.hierarchy import path_counts
+from stat2vis.incremental import FrameStats
+from stat2vis.pairplot import PairGrid, pairplot_counts, pairplot_figure
+from stat2vis.sampling import sample_rows
+
+CATEGORICAL = ["Cut_Quality", "Color_Grade", "Clarity_Grade"]
+NUMERICAL = ["Price_usd", "Weight_carat", "Length_mm", "Width_mm", "Depth_mm"]
+DISTPLOT_MAX_ROWS = 10 ** 5  # create_distplot evaluates a KDE at every point; beyond this it runs for minutes
+
+
+# --- EDA I ---
+@pytest.mark.benchmark(group="eda1-summary")
+def bench_summary(measure, frame):
+    measure(lambda: FrameStats(frame).describe())
+
+
+@pytest.mark.benchmark(group="eda1-histogram")
+def bench_histogram(measure, frame, rows):
+    if rows > DISTPLOT_MAX_ROWS:
+        pytest.skip(f"create_distplot is impractical above {DISTPLOT_MAX_ROWS} rows")
+    import plotly.figure_factory as ff
+
+    def histogram():
+        # Same steps as the page: list of values, default bin size, histogram + KDE figure
+        data = frame["Price_usd"].dropna().tolist()
+        bin_size = round((max(data) - min(data)) / 20)
+        return ff.create_distplot([data], ["Price_usd"], show_hist=True, show_curve=True, bin_size=bin_size)
+
+    measure(histogram)
+
+
+@pytest.mark.benchmark(group="eda-binning")
+@pytest.mark.parametrize("scheme, bins, edges", [
+    ("equal-width", 3, ()), ("quantile", 4, ()), ("custom", 0, (5000.0, 10000.0)),
+], ids=["equal-width", "quantile", "custom"])
+def bench_binning(measure, frame, scheme, bins, edges):
+    measure(lambda: level_column(frame["Price_usd"], scheme, bins, edges))
+
+
+@pytest.mark.benchmark(group="eda-point-sample")
+@pytest.mark.parametrize("stratum", [None, "Color_Grade"], ids=["uniform", "stratified"])
+def bench_point_sample(measure, frame, stratum):
+    measure(lambda: sample_rows(frame, 5000, stratum))
+
+
+# --- EDA II ---
+@pytest.mark.benchmark(group="eda2-crosstab")
+@pytest.mark.parametrize("variables", [CATEGORICAL[:2], CATEGORICAL], ids=["two-way", "three-way"])
+def bench_crosstab(measure, frame, variables):
+    def crosstab():
+        cube = ContingencyCube.from_frame(frame, variables)
+        return cube.table(), cube.chi_square()
+
+    measure(crosstab)
+
+
+@pytest.mark.benchmark(group="eda2-correlation")
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def bench_correlation(measure, frame, method):
+    measure(lambda: CorrelationService(frame).matrix(NUMERICAL, method))
+
+
+@pytest.mark.benchmark(group="eda2-correlation")
+def bench_correlation_incremental(measure, frame):
+    measure(lambda: FrameStats(frame).matrix(NUMERICAL))
+
+
+@pytest.mark.benchmark(group="eda2-hierarchy")
+def bench_hierarchy(measure, frame):
+    measure(path_counts, frame, CATEGORICAL, max_leaves=200)
+
+
+@pytest.mark.benchmark(group="eda2-pairplot")
+def bench_pairplot(measure, frame):
+    measure(lambda: pairplot_figure(pairplot_counts(PairGrid(frame), NUMERICAL, bins=30), NUMERICAL))
@@ -0,0 +1,78 @@
+"""Ch. 4-6: CLT sampling, one-sample tests with the coverage simulation and two-sample tests."""
+import numpy as np
+import pytest
+
+from stat2vis.clt import POPULATIONS as CLT_POPULATIONS, binned_kde, generate_population, simulate_sample_means
+from stat2vis.coverage import coverage_intervals, shade_intervals, simulate_sample_stats
+from stat2vis.inference import one_sample_curves, one_sample_test, two_sample_curves, two_sample_test
+from stat2vis.sequential import empty_group_stats, sequential_step, update_group_stats
+
+SAMPLE_SIZE = 30
+NUM_SAMPLES = 500
+BATCH_SIZE = 1000
+
+
+# --- Ch. 4: CLT, with a population of ``rows`` values ---
+@pytest.mark.benchmark(group="ch4-clt")
+@pytest.mark.parametrize("population", list(CLT_POPULATIONS))
+def bench_clt(measure, rows, population):
+    def clt():
+        values = generate_population(population, size=rows)
+        means = simulate_sample_means(values, SAMPLE_SIZE, NUM_SAMPLES)
+        return binned_kde(values), binned_kde(means)
+
+    measure(clt)
+
+
+# --- Ch. 5: test on a column of the synthetic data, and ``rows`` draws split into coverage samples ---
+@pytest.mark.benchmark(group="ch5-one-sample")
+@pytest.mark.parametrize("sigma_known", [True, False], ids=["z", "t"])
+def bench_one_sample_test(measure, frame, sigma_known):
+    def one_sample():
+        price = frame["Price_usd"].to_numpy(dtype=float)
+        test = one_sample_test(price.mean(), price.std(ddof=1), len(price), 3900.0, 0.05, sigma_known)
+        return one_sample_curves(price.mean(), test["se"], test["ci_low"], test["ci_high"])
+
+    measure(one_sample)
+
+
+@pytest.mark.benchmark(group="ch5-coverage")
+def bench_coverage(measure, rows):
+    def coverage():
+        means, sds = simulate_sample_stats("Exponential", 100.0, 15.0, SAMPLE_SIZE, max(1, rows // SAMPLE_SIZE), 42)
+        low, high, covered = coverage_intervals(means, sds, 100.0, 15.0, SAMPLE_SIZE, 0.05)["t"]
+        return shade_intervals(low, high, covered, low.min(), high.max())
+
+    measure(coverage)
+
+
+# --- Ch. 6: Ideal vs. Premium prices, in one go and as a stream of batches ---
+@pytest.mark.benchmark(group="ch6-two-sample")
+@pytest.mark.parametrize("method", ["pooled", "welch", "paired"])
+def bench_two_sample_test(measure, frame, method):
+    def two_sample():
+        a = frame.loc[frame["Cut_Quality"] == "Ideal", "Price_usd"].to_numpy(dtype=float)
+        b = frame.loc[frame["Cut_Quality"] == "Premium", "Price_usd"].to_numpy(dtype=float)
+        test = two_sample_test(a.mean(), a.std(ddof=1), len(a), b.mean(), b.std(ddof=1), len(b), 0.05, method, sd_diff=1000.0)
+        return two_sample_curves(test["diff"], test["se"], test["crit_left"], test["crit_right"])
+
+    measure(two_sample)
+
+
+@pytest.mark.benchmark(group="ch6-sequential")
+def bench_sequential(measure, frame, rows):
+    groups = frame["Cut_Quality"].to_numpy()
+    price = frame["Price_usd"].to_numpy(dtype=float)
+
+    def sequential():
+        g1, g2 = empty_group_stats(), empty_group_stats()
+        p_always = 1.0
+        for start in range(0, rows, BATCH_SIZE):
+            batch_groups, batch = groups[start:start + BATCH_SIZE], price[start:start + BATCH_SIZE]
+            g1 = update_group_stats(g1, batch[batch_groups == "Ideal"])
+            g2 = update_group_stats(g2, batch[batch_groups == "Premium"])
+            if g1["n"] > 1 and g2["n"] > 1:
+                p_always = sequential_step(g1, g2, False, 500.0, rows, p_always)["p_always"]
+        return g1, g2, p_always
+
+    measure(sequential)
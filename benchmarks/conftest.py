@@ -0,0 +1,83 @@
+"""Benchmark suite for the computations behind every page.
+
+Each ``bench_*`` function times one page's hot path with pytest-benchmark.
+Data-driven benchmarks run once per scale on a synthetic frame with the
+schema of ``data.csv`` (its rows resampled with replacement, so the columns
+keep their levels, ranges and correlations). pytest and pytest-benchmark
+are development dependencies, installed with the app's requirements by
+``pip install -r requirements-dev.txt``.
+
+    python -m pytest benchmarks                          # 10^3, 10^5 and 10^7 rows
+    python -m pytest benchmarks --scales 1e3,1e5         # skip the largest frame
+    python -m pytest benchmarks --benchmark-autosave     # store a JSON baseline
+    python -m pytest benchmarks --benchmark-compare      # compare with the latest baseline
+
+Baselines are stored as JSON under ``benchmarks/baselines/<machine>/``, so
+runs are only compared with runs on the same machine. When comparing, any
+benchmark whose median is more than ``--regression-threshold`` (default 20%)
+slower than the baseline is reported as a regression and fails the run.
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pytest_benchmark.utils import parse_compare_fail
+
+from stat2vis.schema import read_csv
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_CSV = ROOT / "data.csv"
+BASELINES = Path(__file__).resolve().parent / "baselines"
+DEFAULT_STORAGE = "file://./.benchmarks"
+LARGE = 10 ** 6  # from this size on, each benchmark runs a single round
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("stat2vis")
+    group.addoption("--scales", default="1e3,1e5,1e7", help="comma-separated row counts of the synthetic data")
+    group.addoption(
+        "--regression-threshold", type=float, default=0.2,
+        help="relative slowdown of the median that counts as a regression with --benchmark-compare",
+    )
+
+
+def pytest_configure(config):
+    # Runs before pytest-benchmark's own (trylast) configure hook, which reads these options
+    if config.getoption("benchmark_storage") == DEFAULT_STORAGE:
+        config.option.benchmark_storage = f"file://{BASELINES}"
+    if config.getoption("benchmark_compare") and not config.getoption("benchmark_compare_fail"):
+        threshold = config.getoption("regression_threshold")
+        config.option.benchmark_compare_fail = [parse_compare_fail(f"median:{round(threshold * 100)}%")]
+
+
+def pytest_generate_tests(metafunc):
+    if "rows" in metafunc.fixturenames:
+        scales = [int(float(s)) for s in metafunc.config.getoption("scales").split(",") if s.strip()]
+        metafunc.parametrize("rows", scales, ids=[f"{s:.0e}".replace("+0", "") for s in scales], scope="session")
+
+
+# --- Synthetic data ---
+def synthetic_frame(rows, seed=0):
+    """``rows`` rows of ``data.csv`` drawn with replacement, with the column types the pages load it with."""
+    schema, _ = read_csv(SCHEMA_CSV)
+    idx = np.random.default_rng(seed).integers(0, len(schema), size=rows)
+    return schema.iloc[idx].reset_index(drop=True)
+
+
+@pytest.fixture(scope="session")
+def frame(rows):
+    return synthetic_frame(rows)
+
+
+# --- Timing ---
+@pytest.fixture
+def measure(benchmark, request):
+    """``benchmark`` that gives large inputs a single round, so a full run stays within minutes."""
+    rows = getattr(request.node, "callspec", None) and request.node.callspec.params.get("rows", 0)
+
+    def run(fn, *args, **kwargs):
+        if rows and rows >= LARGE:
+            return benchmark.pedantic(fn, args=args, kwargs=kwargs, rounds=1, iterations=1)
+        return benchmark(fn, *args, **kwargs)
+
+    return run
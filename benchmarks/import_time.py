@@ -0,0 +1,159 @@
+"""Cold-start import benchmark for every page.
+
+Each page script is executed once, in bare mode (no Streamlit server), in a
+fresh interpreter started with ``python -X importtime``. The report sums the
+cumulative time of every top-level import made while the page runs, so it
+measures what the first visit to a page costs a new server process.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --baseline-ref HEAD~1 --target 0.3
+    python benchmarks/import_time.py --output after.json --baseline-json before.json
+
+With ``--baseline-ref`` the given git revision is exported to a temporary
+directory and measured on the same machine, so the comparison does not depend
+on stored timings. The exit status is 1 when the total reduction is below
+``--target``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MARKER = "stat2vis-page-start"
+
+# Runs the page after the interpreter has started, so startup imports are excluded
+DRIVER = f"""
+import runpy, sys, time
+sys.path.insert(0, {{root!r}})
+sys.stderr.write("{MARKER}\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+runpy.run_path({{page!r}}, run_name="__main__")
+sys.stderr.write("stat2vis-page-wall %f\\n" % (time.perf_counter() - start))
+"""
+
+
+def page_scripts(root):
+    return [root / "Home.py"] + sorted((root / "pages").glob("*.py"))
+
+
+def parse_importtime(stderr):
+    """Return (total import seconds, {top-level module: seconds}, wall seconds)."""
+    started = False
+    modules = {}
+    wall = None
+    for line in stderr.splitlines():
+        if line.startswith(MARKER):
+            started = True
+            continue
+        if line.startswith("stat2vis-page-wall"):
+            wall = float(line.split()[1])
+            continue
+        if not started or not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # header row
+        name = fields[2]
+        # Nested imports are indented by two spaces per level after the single separator space
+        if name.startswith("  "):
+            continue
+        modules[name.strip()] = modules.get(name.strip(), 0) + int(fields[1]) / 1e6
+    return sum(modules.values()), modules, wall
+
+
+def measure_page(root, page, repeat):
+    driver = DRIVER.format(root=str(root), page=str(page))
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1", STREAMLIT_LOG_LEVEL="error")
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", driver],
+            cwd=root, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{page.name} failed:\n{proc.stderr[-2000:]}")
+        runs.append(parse_importtime(proc.stderr))
+    totals = [r[0] for r in runs]
+    median_run = runs[totals.index(sorted(totals)[len(totals) // 2])]
+    top = sorted(median_run[1].items(), key=lambda kv: kv[1], reverse=True)[:5]
+    return {
+        "import_s": statistics.median(totals),
+        "wall_s": statistics.median(r[2] for r in runs if r[2] is not None),
+        "top_imports": {name: round(sec, 4) for name, sec in top},
+    }
+
+
+def measure_tree(root, repeat):
+    return {page.relative_to(root).as_posix(): measure_page(root, page, repeat) for page in page_scripts(root)}
+
+
+def export_revision(ref, target):
+    archive = subprocess.run(["git", "archive", "--format=tar", ref], cwd=ROOT, capture_output=True, check=True).stdout
+    archive_path = Path(target) / "tree.tar"
+    archive_path.write_bytes(archive)
+    with tarfile.open(archive_path) as tar:
+        tar.extractall(target)
+    return Path(target)
+
+
+def print_report(results, baseline=None):
+    header = f"{'page':<40} {'import (s)':>11} {'wall (s)':>9}"
+    if baseline:
+        header += f" {'baseline':>9} {'change':>8}"
+    print(header)
+    for page, res in results.items():
+        line = f"{page:<40} {res['import_s']:>11.3f} {res['wall_s']:>9.3f}"
+        if baseline and page in baseline:
+            before = baseline[page]["import_s"]
+            line += f" {before:>9.3f} {(res['import_s'] - before) / before:>+8.1%}"
+        print(line)
+        print("    " + ", ".join(f"{name} {sec:.3f}s" for name, sec in res["top_imports"].items()))
+
+
+def total_reduction(results, baseline):
+    pages = [p for p in results if p in baseline]
+    before = sum(baseline[p]["import_s"] for p in pages)
+    after = sum(results[p]["import_s"] for p in pages)
+    return (before - after) / before if before else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per page; the median is reported")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline-json", help="compare against a JSON file written by --output")
+    parser.add_argument("--baseline-ref", help="compare against this git revision, measured now")
+    parser.add_argument("--target", type=float, default=None, help="required total import-time reduction, e.g. 0.3")
+    args = parser.parse_args(argv)
+
+    results = measure_tree(ROOT, args.repeat)
+
+    baseline = None
+    if args.baseline_json:
+        baseline = json.loads(Path(args.baseline_json).read_text())
+    elif args.baseline_ref:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = measure_tree(export_revision(args.baseline_ref, tmp), args.repeat)
+
+    print_report(results, baseline)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    if baseline:
+        reduction = total_reduction(results, baseline)
+        print(f"\nTotal import-time reduction: {reduction:.1%}")
+        if args.target is not None and reduction < args.target:
+            print(f"Below the target of {args.target:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
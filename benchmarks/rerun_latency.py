@@ -0,0 +1,299 @@
+"""End-to-end rerun benchmark: what one widget interaction costs on each page.
+
+Every page is driven headlessly with ``streamlit.testing.v1.AppTest`` through
+a scripted sequence of interactions (ticking "Use demo data", moving the CLT
+sample-size slider, switching distributions, changing the EDA II
+multiselects, ...). Each step is one full-script rerun, and for each step the
+report gives
+
+- ``cold_s``: wall time with Streamlit's caches cleared before the scenario,
+- ``warm_s``: median wall time when the scenario is replayed with warm caches,
+- ``peak_mb``: peak Python memory allocated during the rerun (tracemalloc,
+  measured in a separate pass so it does not slow the timed runs),
+- ``payload_kb``: size of the messages the rerun sends to the browser,
+  including media files such as rendered images.
+
+    python benchmarks/rerun_latency.py
+    python benchmarks/rerun_latency.py --pages pages/04_Ch4_CLT.py --repeat 5
+    python benchmarks/rerun_latency.py --baseline-ref HEAD~1 --threshold 0.2
+    python benchmarks/rerun_latency.py --output after.json --baseline-json before.json
+
+With ``--baseline-ref`` the given git revision is exported to a temporary
+directory and measured now on the same machine by this script. The exit
+status is 1 when the total warm rerun time grew by more than ``--threshold``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+from import_time import export_revision
+
+ROOT = Path(__file__).resolve().parent.parent
+# Each step is a single interaction, so holding reruns for further input would only add idle time
+os.environ.setdefault("STAT2VIS_DEBOUNCE_MS", "0")
+
+
+# --- Widget lookup by label, since most widgets have no key ---
+def widget(at, kind, label):
+    for w in getattr(at, kind):
+        if w.label.startswith(label):
+            return w
+    raise LookupError(f"No {kind} labelled {label!r}")
+
+
+def choose(at, kind, label, index):
+    w = widget(at, kind, label)
+    return w.set_value(w.options[index])
+
+
+def use_demo_data(at):
+    return widget(at, "checkbox", "Use demo data").check()
+
+
+# --- Scripted interactions; the first step of every scenario is the initial page load ---
+SCENARIOS = {
+    "Home.py": [],
+    "pages/01_Ch1_EDA I.py": [
+        ("use demo data", use_demo_data),
+        ("categorical variable", lambda at: choose(at, "selectbox", "Select a categorical variable", 2)),
+        ("sort by name", lambda at: widget(at, "radio", "Sorting method").set_value("Name")),
+        ("numerical variable", lambda at: choose(at, "selectbox", "Select a numerical variable", 1)),
+        ("editor page 2", lambda at: widget(at, "number_input", "Page").set_value(2)),
+    ],
+    "pages/02_Ch2_EDA II.py": [
+        ("use demo data", use_demo_data),
+        ("two categorical variables", lambda at: widget(at, "multiselect", "Select categorical variables").set_value(["Cut_Quality", "Color_Grade"])),
+        ("three categorical variables", lambda at: widget(at, "multiselect", "Select categorical variables").set_value(["Cut_Quality", "Color_Grade", "Clarity_Grade"])),
+        ("numerical variables", lambda at: widget(at, "multiselect", "Select numerical variables").set_value(["Price_USD", "Weight", "Length_mm", "Width_mm"])),
+        ("Spearman correlation", lambda at: widget(at, "radio", "Correlation method").set_value("Spearman")),
+        ("chart type", lambda at: choose(at, "radio", "Select chart type", 1)),
+    ],
+    "pages/03_Ch3_Prob. Dist..py": [
+        ("binomial n", lambda at: widget(at, "slider", "Number of trials").set_value(25)),
+        ("Poisson", lambda at: choose(at, "selectbox", "Discrete Distributions", 4)),
+        ("continuous", lambda at: choose(at, "radio", "Distribution Type", 1)),
+        ("normal", lambda at: choose(at, "selectbox", "Continuous Distributions", 1)),
+        ("normal SD", lambda at: widget(at, "slider", "Standard Deviation").set_value(2.0)),
+        ("F", lambda at: choose(at, "selectbox", "Continuous Distributions", 6)),
+    ],
+    "pages/04_Ch4_CLT.py": [
+        ("sample size", lambda at: widget(at, "slider", "Sample size (n)").set_value(100)),
+        ("population", lambda at: choose(at, "selectbox", "Select a distribution", 1)),
+        ("show final distribution", lambda at: widget(at, "button", "⏩ Show Final").click()),
+        ("number of samples", lambda at: widget(at, "slider", "Number of samples").set_value(1000)),
+    ],
+    "pages/05_Ch5_One-sample Test.py": [
+        ("sample size", lambda at: widget(at, "slider", "Sample Size (n)").set_value(100)),
+        ("t distribution", lambda at: choose(at, "radio", "Choose distribution type", 1)),
+        ("number of intervals", lambda at: widget(at, "select_slider", "Number of intervals").set_value(5000)),
+        ("population", lambda at: choose(at, "selectbox", "Population", 1)),
+    ],
+    "pages/06_Ch6_Two-sample Test.py": [
+        ("Welch test", lambda at: choose(at, "radio", "Choose distribution type", 1)),
+        ("group 1 size", lambda at: widget(at, "slider", "Group 1 Sample Size").set_value(100)),
+        ("ingest batch", lambda at: widget(at, "button", "➕ Ingest next").click()),
+        ("ingest 10 batches", lambda at: widget(at, "button", "⏩ Ingest 10").click()),
+    ],
+}
+
+
+# --- Measurement ---
+class Payload:
+    """Counts the bytes of the messages and media files each rerun produces."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def __enter__(self):
+        from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+        from streamlit.testing.v1 import local_script_runner
+
+        parse = local_script_runner.parse_tree_from_messages
+        load = MemoryMediaFileStorage.load_and_get_id
+
+        def counted_parse(messages):
+            self.bytes += sum(msg.ByteSize() for msg in messages)
+            return parse(messages)
+
+        def counted_load(storage, path_or_data, *args, **kwargs):
+            if isinstance(path_or_data, bytes):
+                self.bytes += len(path_or_data)
+            return load(storage, path_or_data, *args, **kwargs)
+
+        self._patches = [
+            mock.patch.object(local_script_runner, "parse_tree_from_messages", counted_parse),
+            mock.patch.object(MemoryMediaFileStorage, "load_and_get_id", counted_load),
+        ]
+        for patch in self._patches:
+            patch.start()
+        return self
+
+    def __exit__(self, *exc):
+        for patch in self._patches:
+            patch.stop()
+
+    def take(self):
+        value, self.bytes = self.bytes, 0
+        return value
+
+
+def clear_caches():
+    import streamlit as st
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    try:
+        from stat2vis.artifacts import cache
+    except ImportError:  # revisions before the shared artifact cache
+        return
+    cache.clear()
+
+
+def play(root, page, trace_memory=False, timeout=300):
+    """Run a page's scenario once; one dict of measurements per step."""
+    from streamlit.testing.v1 import AppTest
+
+    steps = [("load", None)] + SCENARIOS[page]
+    results = []
+    at = AppTest.from_file(str(root / page), default_timeout=timeout)
+    with Payload() as payload:
+        for name, interact in steps:
+            error = None
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            try:
+                (interact(at) if interact else at).run()
+            except LookupError as exc:  # the widget does not exist in this version of the page
+                error = str(exc)
+            wall = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+            if trace_memory:
+                tracemalloc.stop()
+            if at.exception:
+                error = at.exception[0].message
+            results.append({"step": name, "wall_s": wall, "peak_bytes": peak, "payload_bytes": payload.take(), "error": error})
+            if error:
+                break
+    return results
+
+
+def measure_page(root, page, repeat):
+    clear_caches()
+    memory = play(root, page, trace_memory=True)
+    clear_caches()
+    cold = play(root, page)
+    warm = [play(root, page) for _ in range(max(repeat - 1, 1))]
+    steps = {}
+    for i, run in enumerate(cold):
+        warm_times = [w[i]["wall_s"] for w in warm if i < len(w)]
+        steps[run["step"]] = {
+            "cold_s": run["wall_s"],
+            "warm_s": statistics.median(warm_times) if warm_times else None,
+            "peak_mb": memory[i]["peak_bytes"] / 2 ** 20 if i < len(memory) else None,
+            "payload_kb": run["payload_bytes"] / 2 ** 10,
+            "error": run["error"],
+        }
+    return steps
+
+
+def measure_tree(root, pages, repeat):
+    from streamlit import logger
+
+    logger.set_log_level("error")  # bare-mode warnings on every run
+    os.chdir(root)  # the pages read demo_data.csv relative to the working directory
+    sys.path.insert(0, str(root))
+    return {page: measure_page(root, page, repeat) for page in pages}
+
+
+def measure_revision(ref, pages, repeat):
+    """Measure ``ref`` in a separate interpreter, so its own stat2vis package is imported."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = export_revision(ref, tmp)
+        output = Path(tmp) / "baseline.json"
+        subprocess.run(
+            [sys.executable, __file__, "--root", str(tree), "--repeat", str(repeat), "--output", str(output), "--quiet", "--pages", *pages],
+            check=True,
+        )
+        return json.loads(output.read_text())
+
+
+# --- Report ---
+def print_report(results, baseline=None):
+    header = f"{'page / step':<52} {'cold (s)':>9} {'warm (s)':>9} {'peak (MB)':>10} {'payload (KB)':>13}"
+    if baseline:
+        header += f" {'baseline':>9} {'change':>8}"
+    print(header)
+    for page, steps in results.items():
+        print(page)
+        for step, res in steps.items():
+            warm = f"{res['warm_s']:>9.3f}" if res["warm_s"] is not None else f"{'-':>9}"
+            peak = f"{res['peak_mb']:>10.1f}" if res["peak_mb"] is not None else f"{'-':>10}"
+            line = f"  {step:<50} {res['cold_s']:>9.3f} {warm} {peak} {res['payload_kb']:>13.1f}"
+            before = (baseline or {}).get(page, {}).get(step)
+            if before and before.get("warm_s") and res["warm_s"] is not None:
+                line += f" {before['warm_s']:>9.3f} {(res['warm_s'] - before['warm_s']) / before['warm_s']:>+8.1%}"
+            print(line)
+            if res["error"]:
+                print(f"    error: {res['error']}")
+
+
+def total_change(results, baseline):
+    pairs = [
+        (baseline[page][step]["warm_s"], res["warm_s"])
+        for page, steps in results.items() for step, res in steps.items()
+        if step in baseline.get(page, {}) and res["warm_s"] is not None and baseline[page][step].get("warm_s") is not None
+    ]
+    before = sum(b for b, _ in pairs)
+    after = sum(a for _, a in pairs)
+    return (after - before) / before if before else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="+", default=list(SCENARIOS), help="pages to run, as paths relative to the repository")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario; the first is cold, the median of the rest is reported as warm")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline-json", help="compare against a JSON file written by --output")
+    parser.add_argument("--baseline-ref", help="compare against this git revision, measured now")
+    parser.add_argument("--threshold", type=float, default=None, help="allowed growth of the total warm rerun time, e.g. 0.2")
+    parser.add_argument("--root", default=str(ROOT), help=argparse.SUPPRESS)
+    parser.add_argument("--quiet", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    unknown = [page for page in args.pages if page not in SCENARIOS]
+    if unknown:
+        parser.error(f"no scenario for {', '.join(unknown)}")
+
+    baseline = None
+    if args.baseline_json:
+        baseline = json.loads(Path(args.baseline_json).read_text())
+    elif args.baseline_ref:
+        baseline = measure_revision(args.baseline_ref, args.pages, args.repeat)
+
+    results = measure_tree(Path(args.root), args.pages, args.repeat)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    if args.quiet:
+        return 0
+
+    print_report(results, baseline)
+    if baseline:
+        change = total_change(results, baseline)
+        print(f"\nTotal warm rerun time change: {change:+.1%}")
+        if args.threshold is not None and change > args.threshold:
+            print(f"Above the allowed growth of {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
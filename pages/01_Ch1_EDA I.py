@@ -1,8 +1,23 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px  # For interactive charts
-import plotly.figure_factory as ff  # For distplots, table charts
-import plotly.graph_objects as go  # For more flexible chart components
+from stat2vis.binning import binned_level, binning_panel
+from stat2vis.dataset import column_types, data_input
+from stat2vis.editor import paged_editor
+from stat2vis.graph import page_graph
+from stat2vis.jobs import start_job, wait_for
+from stat2vis.lazy import lazy_import
+from stat2vis.levels import level_counts
+from stat2vis.profiling import page_profiler
+from stat2vis.sampling import box_stats, point_budget, point_sample, sample_caption
+from stat2vis.schema import memory_summary
+from stat2vis.sections import debounce, page_section
+
+# Chart libraries are imported on first use, i.e. once a dataset is selected
+px = lazy_import("plotly.express")  # For interactive charts
+ff = lazy_import("plotly.figure_factory")  # For distplots, table charts
+go = lazy_import("plotly.graph_objects")  # For more flexible chart components
+stats = lazy_import("scipy.stats")  # For the density curve
 
 # --- Set up the Streamlit page layout and metadata ---
 st.set_page_config(
@@ -15,6 +30,8 @@ st.set_page_config(
         'Get Help': 'https://github.com/TeddYenn/stat2vis',
         'Report a bug': "https://github.com/TeddYenn/stat2vis/issues"
     })
+profiler = page_profiler("Ch1 EDA I")
+graph = page_graph()
 
 # --- App header and introduction ---
 st.title("Ch. 1: Exploratory Data Analysis I  |  探索式資料分析 I")
@@ -27,260 +44,292 @@ st.write("探索式資料分析是一種資料分析方法，結合了資料視
 # --- Section 1: Data Input ---
 st.write("")
 st.write("")
+profiler.start("1 Data Input")
 st.write("### 1️⃣ Data Input  |  資料輸入")
 st.write("##### 🔸 You can use the demo data or upload your own Excel file for this section.")
 st.write("")
 st.write("**📌 Data Selection:**")
 
-# --- Initialize session state for checkboxes ---
-if "use_demo_data" not in st.session_state:
-    st.session_state.use_demo_data = False
-if "upload_data" not in st.session_state:
-    st.session_state.upload_data = False
-
-# --- Callback: Only one checkbox can be selected at a time ---
-def toggle_use_demo():
-    if st.session_state.use_demo_data:
-        st.session_state.upload_data = False
-
-def toggle_upload_data():
-    if st.session_state.upload_data:
-        st.session_state.use_demo_data = False
-
-# --- Data selection checkboxes (mutually exclusive) ---
-st.checkbox(
-    "Use demo data",
-    key="use_demo_data",
-    on_change=toggle_use_demo
-)
-
-st.checkbox(
-    "Upload your own data",
-    key="upload_data",
-    on_change=toggle_upload_data
-)
-
-# --- Load data from selected source ---
-df = None
-uploaded_file = None
-
-# Upload your own data
-if st.session_state.upload_data:
-    uploaded_file = st.file_uploader("📂 Upload your data file (上傳您的數據)", type=["xlsx", "csv"])
-
-# Load demo or uploaded data
-if st.session_state.use_demo_data:
-    df = pd.read_csv('demo_data.csv')
-elif uploaded_file is not None:
-    if uploaded_file.type == 'text/csv':
-        df = pd.read_csv(uploaded_file)
-    else:
-        df = pd.read_excel(uploaded_file)
+# --- Computed values of the page, nodes of the session's computation graph; each reads only its inputs ---
+def summary_table(edits):
+    # Built in the background, since the order statistics of a large file take a while
+    return wait_for(start_job("summary", edits.token(), lambda: edits.stats().describe()))
+
+def category_counts(column):
+    # Frequency of each category, in level order (grades and binned ranges in their natural order)
+    counts = level_counts(column)
+    return pd.DataFrame({'Category': counts.index.astype(str), 'Count': counts.to_numpy()})
+
+def sorted_counts(value_counts, sort_order):
+    if sort_order == 'Name':
+        return value_counts
+    return value_counts.sort_values(by='Count', ascending=False, kind='stable')
+
+def bar_chart(value_counts, column):
+    column = column.name
+    fig_bar = px.bar(
+        value_counts,
+        x='Category',
+        y='Count',
+        color='Category',
+        labels={'Category': column, 'Count': 'Count'},
+        category_orders={'Category': value_counts['Category'].tolist()},
+        title=f'Bar Chart',
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+
+    fig_bar.update_layout(
+        title_font_size=20,
+        xaxis_title_font_size=16,
+        yaxis_title_font_size=16,
+        xaxis_tickfont_size=14,
+        yaxis_tickfont_size=14,
+        bargap=0.3,
+        legend=dict(title=None, orientation="h", yanchor="bottom", y=-0.7)
+    )
+    return fig_bar
+
+def pie_chart(value_counts):
+    fig_pie = px.pie(
+        value_counts,
+        names='Category',
+        values='Count',
+        category_orders={'Category': value_counts['Category'].tolist()},
+        title=f'Pie Chart',
+        color_discrete_sequence=px.colors.qualitative.Set3,
+        hole=0.3
+    )
+
+    fig_pie.update_layout(
+        title_font_size=20,
+        legend=dict(title=None, orientation="h", yanchor="bottom", y=-0.7)
+    )
+    return fig_pie
+
+def numeric_values(column):
+    return column.dropna().to_numpy()
+
+def kde_curve(data, points=500):
+    # The density curve create_distplot draws, computed apart from the histogram so the bin size does not redo it
+    x = data.min() + np.arange(points) * (data.max() - data.min()) / points
+    return x, stats.gaussian_kde(data)(x)
+
+def histogram_figure(data, column, curve, bin_size):
+    column = column.name
+    colors = px.colors.qualitative.Set2
+    fig_dist = ff.create_distplot(
+        [data], [column],
+        show_hist=True,
+        show_curve=False,
+        colors=colors,
+        bin_size=bin_size
+    )
+    # Histogram, density curve and rug, in create_distplot's trace order
+    curve_trace = go.Scatter(x=curve[0], y=curve[1], xaxis="x1", yaxis="y1", mode="lines", name=column,
+                             legendgroup=column, showlegend=False, marker=dict(color=colors[0]))
+    fig_dist = go.Figure([fig_dist.data[0], curve_trace, *fig_dist.data[1:]], layout=fig_dist.layout)
+
+    fig_dist.update_layout(
+        title=f'Histogram & Density Plot',
+        title_font_size=20,
+        xaxis_title=column,
+        xaxis_title_font_size=16,
+        yaxis_title="Density",
+        yaxis_title_font_size=16,
+        xaxis_tickfont_size=14,
+        yaxis_tickfont_size=14,
+        bargap=0.01,
+        showlegend=False
+    )
+    return fig_dist
+
+# --- Data selection (demo or uploaded data), kept in the session and shared by the EDA pages ---
+dataset = data_input()
+df = dataset.frame if dataset is not None else None
 
 # --- Display editable data table ---
 if df is not None:
     st.markdown("---")
     st.write("##### 🔸 Your data should be displayed here.")
     st.write("##### 🔽 Editable Table!")
-    edited_df = st.data_editor(df)  # Allow user to interactively edit table
+    st.caption(f"Memory (記憶體用量): {memory_summary(dataset.report)}")
+    with st.expander("Column types (欄位型別)"):
+        st.dataframe(dataset.report, width="stretch")
+    # Only the current page is sent to the browser; edits are kept as an overlay shared by the EDA pages
+    edits = paged_editor(df, "data_edits", dataset.source)
+    df = edits.view()  # Downstream sections use the edited data
+    # Derived level columns are kept with the edits, so both EDA pages see them without reloading the data
+    binning_panel(edits, df)
+    if edits.derived:
+        levels = {name: binned_level(df, edits.token([name]), *spec) for name, spec in edits.derived.items()}
+        df = pd.concat([df, pd.DataFrame(levels, index=df.index)], axis=1, copy=False)
     st.markdown("---")
 
 if df is not None:
     # --- Variable type detection ---
     cols = df.columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-    numerical_cols = df.select_dtypes(exclude=['object', 'category']).columns.tolist()
+    # The data and the widgets are the graph's sources: a change recomputes only the values that depend on it.
+    # A selected column is a source of its own, keyed by the edits of that column only
+    graph.source("frame", df, key=edits.token(cols))
+    graph.source("edits", edits, key=edits.token())
+    shared = dataset.is_demo and not edits.edits  # values of the unedited demo data are the same for every session
+    categorical_cols, numerical_cols = graph.node("column_types", column_types, "frame", shared=shared)
+    budget = point_budget()  # sidebar controls stay outside the sections, which cannot draw into the sidebar
+
+    # Each numbered section below reruns on its own when one of its widgets changes;
+    # a change above (data, edits, level columns) reruns them all
 
     # ==========================================
     # 2️⃣ Descriptive Statistics
     # ==========================================
-    st.write("### 2️⃣ Descriptive Statistics  |  敘述統計量")
-    st.write("🔸 **Type**: Categorical (Cat.), Numerical (Num.); **Level**: The number of unique values in categorical data; **Top**: The most frequently occurring value in categorical data; **Freq**: The count of how many times the 'Top' value appears.")
-
-    # Create summary table with describe()
-    summary_df = df.describe(include='all').transpose()
-
-    # Rename columns for clarity
-    rename_dict = {
-        'count': 'Count', 'mean': 'Mean', 'std': 'Std', 'min': 'Min',
-        '25%': 'Q1', '50%': 'Q2; Median', '75%': 'Q3', 'max': 'Max',
-        'unique': 'Level', 'top': 'Mode', 'freq': 'Freq'
-    }
-    summary_df.rename(columns={col: rename_dict[col] for col in summary_df.columns if col in rename_dict}, inplace=True)
-
-    # Add a 'Type' column to indicate if variable is categorical or numerical
-    summary_df['Type'] = summary_df.index.map(lambda x: 'Cat.' if x in categorical_cols else 'Num.')
-
-    # --- Add statistics for numerical variables ---
-    if numerical_cols:
-        # Compute additional stats for numerical variables
-        mode_values = df[numerical_cols].mode().iloc[0]
-        variance_values = df[numerical_cols].var(ddof=1)
-        std_values = df[numerical_cols].std(ddof=1)
-        cv_values = (std_values / df[numerical_cols].mean()).replace([float('inf'), -float('inf')], None)
-
-        # Insert new stats into summary table
-        for col in numerical_cols:
-            if col in summary_df.index:
-                summary_df.loc[col, 'Mode'] = mode_values[col]
-                summary_df["Mode"] = summary_df["Mode"].astype(str)
-                summary_df.loc[col, 'Variance'] = variance_values[col]
-                summary_df.loc[col, 'SD'] = std_values[col]
-                summary_df.loc[col, 'CV'] = cv_values[col]
-
-    # --- Clean and display summary table ---
-    # Reorder and filter the summary columns
-    desired_cols = ['Type', 'Count', 'Level', 'Mode', 'Freq', 'Mean', 'Variance', 'SD', 'CV', 'Min', 'Q1', 'Q2; Median', 'Q3', 'Max']
-    summary_df = summary_df[[col for col in desired_cols if col in summary_df.columns]]
-
-    # Round numeric values
-    numeric_cols = summary_df.select_dtypes(include=['number']).columns.tolist()
-    summary_df[numeric_cols] = summary_df[numeric_cols].round(2)
-
-    # Show summary statistics table
-    st.write(summary_df)
-    st.markdown("---")
+    @page_section(profiler, "2 Descriptive Statistics")
+    def descriptive_statistics(categorical_cols, numerical_cols, shared):
+        st.write("### 2️⃣ Descriptive Statistics  |  敘述統計量")
+        st.write("🔸 **Type**: Categorical (Cat.), Numerical (Num.); **Level**: The number of unique values in categorical data; **Top**: The most frequently occurring value in categorical data; **Freq**: The count of how many times the 'Top' value appears.")
+
+        # Summary table with describe()'s statistics, maintained under table edits instead of recomputed
+        summary_df = graph.node("summary", summary_table, "edits", shared=shared).copy()
+
+        # Rename columns for clarity
+        rename_dict = {
+            'count': 'Count', 'mean': 'Mean', 'std': 'Std', 'min': 'Min',
+            '25%': 'Q1', '50%': 'Q2; Median', '75%': 'Q3', 'max': 'Max',
+            'unique': 'Level', 'top': 'Mode', 'freq': 'Freq'
+        }
+        summary_df.rename(columns={col: rename_dict[col] for col in summary_df.columns if col in rename_dict}, inplace=True)
+
+        # Add a 'Type' column to indicate if variable is categorical or numerical
+        summary_df['Type'] = summary_df.index.map(lambda x: 'Cat.' if x in categorical_cols else 'Num.')
+
+        # --- Mode of numerical variables is shown as text, like the categorical modes ---
+        if numerical_cols:
+            summary_df["Mode"] = summary_df["Mode"].astype(str)
+
+        # --- Clean and display summary table ---
+        # Reorder and filter the summary columns
+        desired_cols = ['Type', 'Count', 'Level', 'Mode', 'Freq', 'Mean', 'Variance', 'SD', 'CV', 'Min', 'Q1', 'Q2; Median', 'Q3', 'Max']
+        summary_df = summary_df[[col for col in desired_cols if col in summary_df.columns]]
+
+        # Round numeric values
+        numeric_cols = summary_df.select_dtypes(include=['number']).columns.tolist()
+        summary_df[numeric_cols] = summary_df[numeric_cols].round(2)
+
+        # Show summary statistics table
+        st.write(summary_df)
+        st.markdown("---")
+
+    descriptive_statistics(categorical_cols, numerical_cols, shared)
 
     # ==========================================
     # 3️⃣ Categorical Data Visualization
     # ==========================================
-    st.write("### 3️⃣ Categorical Data Visualization  |  類別型資料視覺化")
-    st.write("##### 🔸 Data with categorical variables (e.g., groups, labels).")
-
-    if len(categorical_cols) > 0:
-        # Let user choose a categorical variable
-        selected_cat_col = st.selectbox("Select a categorical variable:", categorical_cols, key="category_selection")
-
-        # Let user choose sort method
-        sort_order = st.radio("Sorting method:", ('Freqency', 'Name'), key="category_sort_order")
-
-        # Count frequency of each category
-        value_counts = df[selected_cat_col].value_counts().reset_index()
-        value_counts.columns = ['Category', 'Count']
-
-        # Apply sorting
-        if sort_order == 'Name':
-            value_counts = value_counts.sort_values(by='Category')
-        else:
-            value_counts = value_counts.sort_values(by='Count', ascending=False)
-
-        # --- Bar chart ---
-        fig_bar = px.bar(
-            value_counts,
-            x='Category',
-            y='Count',
-            color='Category',
-            labels={'Category': selected_cat_col, 'Count': 'Count'},
-            title=f'Bar Chart',
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-
-        fig_bar.update_layout(
-            title_font_size=20,
-            xaxis_title_font_size=16,
-            yaxis_title_font_size=16,
-            xaxis_tickfont_size=14,
-            yaxis_tickfont_size=14,
-            bargap=0.3,
-            legend=dict(title=None, orientation="h", yanchor="bottom", y=-0.7)
-        )
-
-        # --- Pie chart ---
-        fig_pie = px.pie(
-            value_counts,
-            names='Category',
-            values='Count',
-            title=f'Pie Chart',
-            color_discrete_sequence=px.colors.qualitative.Set3,
-            hole=0.3
-        )
-
-        fig_pie.update_layout(
-            title_font_size=20,
-            legend=dict(title=None, orientation="h", yanchor="bottom", y=-0.7)
-        )
-
-        # Show bar and pie charts side by side
-        col1, col2 = st.columns(2)
-        with col1:
-            st.plotly_chart(fig_bar)
-        with col2:
-            st.plotly_chart(fig_pie)
+    @page_section(profiler, "3 Categorical Data Visualization")
+    def categorical_visualization(df, edits, categorical_cols):
+        st.write("### 3️⃣ Categorical Data Visualization  |  類別型資料視覺化")
+        st.write("##### 🔸 Data with categorical variables (e.g., groups, labels).")
 
-        st.markdown("---")
+        if len(categorical_cols) > 0:
+            # Let user choose a categorical variable
+            selected_cat_col = st.selectbox("Select a categorical variable:", categorical_cols, key="category_selection")
+
+            # Let user choose sort method
+            sort_order = st.radio("Sorting method:", ('Freqency', 'Name'), key="category_sort_order")
+            graph.source("eda1/category", df[selected_cat_col], key=edits.token([selected_cat_col]))
+            graph.source("eda1/sort_order", sort_order)
+
+            value_counts = graph.node("eda1/value_counts", category_counts, "eda1/category")
+            if getattr(df[selected_cat_col].dtype, 'ordered', False):
+                st.caption("Ordered levels (有序等級): " + " → ".join(value_counts['Category']))
+
+            # Apply sorting
+            graph.define("eda1/sorted_counts", sorted_counts, "eda1/value_counts", "eda1/sort_order")
+
+            # --- Bar chart and pie chart ---
+            fig_bar = graph.node("eda1/bar_chart", bar_chart, "eda1/sorted_counts", "eda1/category")
+            fig_pie = graph.node("eda1/pie_chart", pie_chart, "eda1/sorted_counts")
+
+            # Show bar and pie charts side by side
+            col1, col2 = st.columns(2)
+            with col1:
+                st.plotly_chart(fig_bar)
+            with col2:
+                st.plotly_chart(fig_pie)
+
+            st.markdown("---")
+
+    categorical_visualization(df, edits, categorical_cols)
 
     # ==========================================
     # 4️⃣ Numerical Data Visualization
     # ==========================================
-    st.write("### 4️⃣ Numerical Data Visualization  |  連續型資料視覺化")
-    st.write("##### 🔸 Data with continuous variables (e.g., height, weight).")
-
-    if len(numerical_cols) > 0:
-        # User selects one numerical variable
-        selected_num_col = st.selectbox("Select a numerical variable:", numerical_cols, key="num_selection")
-        data = df[selected_num_col].dropna().tolist()
-
-        # Calculate default bin size for histogram
-        data_range = max(data) - min(data) if len(data) > 1 else 1
-        min_bin = max(1, round(data_range / 50))
-        max_bin = max(10, round(data_range / 5))
-        default_bin = round(data_range / 20)
-
-        # Let user adjust bin size
-        bin_size = st.slider("Adjust histogram bin size:", min_value=min_bin, max_value=max_bin, value=default_bin, step=min_bin)
-
-        # --- Box plot ---
-        box_trace = go.Box(
-            y=data,
-            name="Box Plot",
-            boxpoints="all",
-            jitter=0.25,
-            line=dict(width=3),
-            pointpos=0,
-            marker=dict(color=px.colors.qualitative.Set2[0], opacity=0.4, size=8)
-        )
-
-        fig_combined = go.Figure([box_trace])
-        fig_combined.update_layout(
-            title=f'Box Plot',
-            title_font_size=20,
-            yaxis_title=selected_num_col,
-            yaxis_title_font_size=16,
-            xaxis_tickfont_size=14,
-            yaxis_tickfont_size=14
-        )
-
-        # --- Histogram + density plot ---
-        fig_dist = ff.create_distplot(
-            [data], [selected_num_col],
-            show_hist=True,
-            show_curve=True,
-            colors=px.colors.qualitative.Set2,
-            bin_size=bin_size
-        )
-
-        fig_dist.update_layout(
-            title=f'Histogram & Density Plot',
-            title_font_size=20,
-            xaxis_title=selected_num_col,
-            xaxis_title_font_size=16,
-            yaxis_title="Density",
-            yaxis_title_font_size=16,
-            xaxis_tickfont_size=14,
-            yaxis_tickfont_size=14,
-            bargap=0.01,
-            showlegend=False
-        )
-
-        # Display both plots side by side
-        col1, col2 = st.columns(2)
-        with col1:
-            st.plotly_chart(fig_combined)
-        with col2:
-            st.plotly_chart(fig_dist)
+    @page_section(profiler, "4 Numerical Data Visualization")
+    def numerical_visualization(df, edits, numerical_cols, budget):
+        st.write("### 4️⃣ Numerical Data Visualization  |  連續型資料視覺化")
+        st.write("##### 🔸 Data with continuous variables (e.g., height, weight).")
+
+        if len(numerical_cols) > 0:
+            # User selects one numerical variable
+            selected_num_col = st.selectbox("Select a numerical variable:", numerical_cols, key="num_selection")
+            graph.source("eda1/numeric", df[selected_num_col], key=edits.token([selected_num_col]))
+            data = graph.node("eda1/values", numeric_values, "eda1/numeric")
+
+            # Calculate default bin size for histogram
+            data_range = data.max() - data.min() if len(data) > 1 else 1
+            min_bin = max(1, round(data_range / 50))
+            max_bin = max(10, round(data_range / 5))
+            default_bin = round(data_range / 20)
+
+            # Let user adjust bin size
+            bin_size = st.slider("Adjust histogram bin size:", min_value=min_bin, max_value=max_bin, value=default_bin, step=min_bin)
+            debounce("eda1_bin_size", bin_size)
+            graph.source("eda1/bin_size", bin_size)
+
+            # --- Box plot ---
+            # Box and whiskers come from the full data; only a sample of the points within the budget is drawn
+            positions = point_sample(df, edits.token([]), budget, None)
+            points = df[selected_num_col].iloc[positions].dropna()
+            box_trace = go.Box(
+                x=["Box Plot"],
+                y=[points.tolist()],
+                **{stat: [value] for stat, value in graph.node("eda1/box_stats", box_stats, "eda1/values").items()},
+                name="Box Plot",
+                boxpoints="all",
+                jitter=0.25,
+                line=dict(width=3),
+                pointpos=0,
+                marker=dict(color=px.colors.qualitative.Set2[0], opacity=0.4, size=8)
+            )
+
+            fig_combined = go.Figure([box_trace])
+            if caption := sample_caption(len(positions), len(df)):
+                st.caption(caption)
+            fig_combined.update_layout(
+                title=f'Box Plot',
+                title_font_size=20,
+                yaxis_title=selected_num_col,
+                yaxis_title_font_size=16,
+                xaxis_tickfont_size=14,
+                yaxis_tickfont_size=14
+            )
+
+            # --- Histogram + density plot ---
+            # The density curve depends on the data only; a new bin size redraws the histogram around it
+            graph.define("eda1/kde", kde_curve, "eda1/values")
+            fig_dist = graph.node("eda1/histogram", histogram_figure, "eda1/values", "eda1/numeric", "eda1/kde", "eda1/bin_size")
+
+            # Display both plots side by side
+            col1, col2 = st.columns(2)
+            with col1:
+                st.plotly_chart(fig_combined)
+            with col2:
+                st.plotly_chart(fig_dist)
+
+    numerical_visualization(df, edits, numerical_cols, budget)
 
 
 # Footer
 st.markdown("---")
 st.write("stat2vis: Collection of Applications for Visualizing Statistics")
-st.write("GitHub: https://github.com/TeddYenn/stat2vis")
\ No newline at end of file
+st.write("GitHub: https://github.com/TeddYenn/stat2vis")
+graph.view()
+profiler.finish()
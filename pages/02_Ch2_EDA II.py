@@ -1,6 +1,23 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px 
+from stat2vis.binning import binned_level, binning_panel
+from stat2vis.dataset import column_types, data_input
+from stat2vis.contingency import ContingencyCube
+from stat2vis.correlation import CorrelationService
+from stat2vis.editor import paged_editor
+from stat2vis.graph import page_graph
+from stat2vis.hierarchy import path_counts
+from stat2vis.jobs import start_job, wait_for
+from stat2vis.lazy import lazy_import
+from stat2vis.levels import category_orders
+from stat2vis.pairplot import PairGrid, pairplot_figure, pairplot_steps
+from stat2vis.profiling import page_profiler
+from stat2vis.sampling import point_budget, point_sample, sample_caption
+from stat2vis.schema import memory_summary
+from stat2vis.sections import debounce, page_section
+
+# Chart library is imported on first use, i.e. once a dataset is selected
+px = lazy_import("plotly.express")
 
 # Streamlit page configuration
 st.set_page_config(
@@ -13,6 +30,8 @@ st.set_page_config(
         'Get Help': 'https://github.com/TeddYenn/stat2vis',
         'Report a bug': "https://github.com/TeddYenn/stat2vis/issues"
     })
+profiler = page_profiler("Ch2 EDA II")
+graph = page_graph()
 
 # App header and intro
 st.title("Ch. 2: Exploratory Data Analysis II  |  探索式資料分析 II")
@@ -24,121 +43,115 @@ st.write("透過上一章節基本的探索式資料分析，我們已了解資
 # Section: Data Input
 st.write("")
 st.write("")
+profiler.start("1 Data Input")
 st.write("### 1️⃣ Data Input  |  資料輸入")
 st.write("##### 🔸 You can use the demo data or upload your own Excel file for this section.")
 st.write("")
 st.write("**📌 Data Selection:**")
 
-# --- Initialize state for checkboxes ---
-if "use_demo_data" not in st.session_state:
-    st.session_state.use_demo_data = False
-if "upload_data" not in st.session_state:
-    st.session_state.upload_data = False
-
-# --- Callback: Only one checkbox can be selected at a time ---
-def toggle_use_demo():
-    if st.session_state.use_demo_data:
-        st.session_state.upload_data = False
-
-def toggle_upload_data():
-    if st.session_state.upload_data:
-        st.session_state.use_demo_data = False
-
-# --- Data selection checkboxes (mutually exclusive) ---
-st.checkbox(
-    "Use demo data",
-    key="use_demo_data",
-    on_change=toggle_use_demo
-)
-
-st.checkbox(
-    "Upload your own data",
-    key="upload_data",
-    on_change=toggle_upload_data
-)
-
-# --- Load data from selected source ---
-df = None
-uploaded_file = None
-
-# Upload your own data
-if st.session_state.upload_data:
-    uploaded_file = st.file_uploader("📂 Upload your data file (上傳您的數據)", type=["xlsx", "csv"])
-
-# Load demo or uploaded data
-if st.session_state.use_demo_data:
-    df = pd.read_csv('demo_data.csv')
-elif uploaded_file is not None:
-    if uploaded_file.type == 'text/csv':
-        df = pd.read_csv(uploaded_file)
-    else:
-        df = pd.read_excel(uploaded_file)
+# Cached results are keyed by an edit token of the columns they read (not by hashing the frame),
+# so an edit only invalidates the results that depend on the edited columns
+
+# --- Contingency counts for all selected variables in one pass; a node of the session's computation graph ---
+def contingency_cube(selected):
+    return ContingencyCube.from_frame(selected, list(selected.columns))
+
+# --- Hierarchy counts computed once per selected path, rare leaves folded into "Other" ---
+def hierarchy_counts(selected, max_leaves):
+    return path_counts(selected, list(selected.columns), max_leaves)
+
+hierarchy_charts = {"Sunburst": "sunburst", "Treemap": "treemap", "Icicle": "icicle"}
+
+def hierarchy_figure(counts, chart):
+    path = [col for col in counts.columns if col != "count"]
+    return getattr(px, hierarchy_charts[chart])(counts, path=path, values="count")
+
+# --- Correlations of all numeric columns, computed once per dataset and sliced per selection ---
+@st.cache_resource(max_entries=5, show_spinner=False)
+def correlation_service(_df, token):
+    return CorrelationService(_df)
+
+# --- Binned pairplot cells, cached per dataset ---
+@st.cache_resource(max_entries=5, show_spinner=False)
+def pair_grid(_df, token):
+    return PairGrid(_df)
+
+def chi_square_caption(cube, level=None):
+    test = cube.chi_square(level)
+    return f"χ² test of independence (獨立性檢定): χ² = {test['statistic']:.2f}, df = {test['dof']}, p-value = {test['p_value']:.4f}"
+
+# --- Data selection (demo or uploaded data), kept in the session and shared by the EDA pages ---
+dataset = data_input()
+df = dataset.frame if dataset is not None else None
 
 # --- Display editable data table ---
 if df is not None:
     st.markdown("---")
     st.write("##### 🔸 Your data should be displayed here.")
     st.write("##### 🔽 Editable Table!")
-    edited_df = st.data_editor(df)  # Allow user to interactively edit table
+    st.caption(f"Memory (記憶體用量): {memory_summary(dataset.report)}")
+    with st.expander("Column types (欄位型別)"):
+        st.dataframe(dataset.report, width="stretch")
+    # Only the current page is sent to the browser; edits are kept as an overlay shared by the EDA pages
+    edits = paged_editor(df, "data_edits", dataset.source)
+    df = edits.view()  # Downstream sections use the edited data
+    # Derived level columns are kept with the edits, so both EDA pages see them without reloading the data
+    binning_panel(edits, df)
+    if edits.derived:
+        levels = {name: binned_level(df, edits.token([name]), *spec) for name, spec in edits.derived.items()}
+        df = pd.concat([df, pd.DataFrame(levels, index=df.index)], axis=1, copy=False)
     st.markdown("---")
 
 if df is not None:
     # --- Variable type detection ---
     cols = df.columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-    numerical_cols = df.select_dtypes(exclude=['object', 'category']).columns.tolist()
+    # The data and the widgets are the graph's sources, shared with the EDA I page: a change recomputes only the values that depend on it
+    graph.source("frame", df, key=edits.token(cols))
+    graph.source("edits", edits, key=edits.token())
+    shared = dataset.is_demo and not edits.edits  # values of the unedited demo data are the same for every session
+    categorical_cols, numerical_cols = graph.node("column_types", column_types, "frame", shared=shared)
+    budget = point_budget()  # sidebar controls stay outside the sections, which cannot draw into the sidebar
+
+    # Each numbered section below reruns on its own when one of its widgets changes;
+    # a change above (data, edits, level columns) reruns them all
 
     # ==========================================
     # 2️⃣ Categorical Dataset Visualization
     # ==========================================
-    st.write("### 2️⃣ Categorical Dataset Visualization  |  類別型資料集視覺化")
-    st.write("##### 🔸 Dataset with more than one categorical variables.")
-
-    # Allow user to select multiple categorical variables
-    selected_cat_col = st.multiselect("Select categorical variables:", categorical_cols, key="cat_selector")
-
-    if len(selected_cat_col) == 2:
-        # Create a 2-way contingency table
-        row_var, col_var = selected_cat_col
-        cross_tab = pd.crosstab(df[row_var], df[col_var])
-        st.write("")
-        st.write("##### 🔽 Contingency table")
-        st.dataframe(cross_tab)
-
-        # Create heatmap
-        fig1 = px.imshow(
-            cross_tab.values,
-            x=cross_tab.columns,
-            y=cross_tab.index,
-            text_auto=True,
-            color_continuous_scale="Emrld",
-            labels=dict(x=col_var, y=row_var, color="Count"),
-            aspect="auto",
-        )
-
-        # Create sunburst chart based on hierarchy of categorical variables
-        fig2 = px.sunburst(df, path=selected_cat_col)
-
-        # Show both charts side by side
-        col1, col2 = st.columns(2)
-        with col1:
-            st.plotly_chart(fig1, use_container_width=False)
-        with col2:
-            st.plotly_chart(fig2, use_container_width=False)
-
-    elif len(selected_cat_col) == 3:
-        # For 3 categorical variables: one as group (faceting)
-        row_var, col_var, group_var = selected_cat_col
-        st.write("")
-        st.write("##### 🔽 Contingency table, " f"grouped by: {group_var}")
-
-        for level in df[group_var].dropna().unique():
-            sub_df = df[df[group_var] == level]
-            cross_tab = pd.crosstab(sub_df[row_var], sub_df[col_var])
-
-            st.write(f"Group: {group_var} = {level}")
+    @page_section(profiler, "2 Categorical Dataset Visualization")
+    def categorical_visualization(df, edits, categorical_cols):
+        st.write("### 2️⃣ Categorical Dataset Visualization  |  類別型資料集視覺化")
+        st.write("##### 🔸 Dataset with more than one categorical variables.")
+
+        # Allow user to select multiple categorical variables
+        selected_cat_col = st.multiselect("Select categorical variables:", categorical_cols, key="cat_selector")
+
+        if len(selected_cat_col) in (2, 3):
+            col1, col2 = st.columns(2)
+            with col1:
+                hierarchy_chart = st.radio("Hierarchy chart:", list(hierarchy_charts), horizontal=True, key="hierarchy_chart")
+            with col2:
+                max_leaves = st.slider("Max. number of leaves (rare categories are grouped as 'Other')", 10, 500, 100, 10, key="hierarchy_max_leaves")
+                debounce("hierarchy_max_leaves", max_leaves)
+            # The selected columns are one source, keyed by the edits of those columns only
+            graph.source("eda2/categories", df[selected_cat_col], key=edits.token(selected_cat_col))
+            graph.source("eda2/hierarchy_chart", hierarchy_chart)
+            graph.source("eda2/max_leaves", max_leaves)
+            graph.define("eda2/contingency", contingency_cube, "eda2/categories")
+            graph.define("eda2/hierarchy_counts", hierarchy_counts, "eda2/categories", "eda2/max_leaves")
+            graph.define("eda2/hierarchy_figure", hierarchy_figure, "eda2/hierarchy_counts", "eda2/hierarchy_chart")
+
+        if len(selected_cat_col) == 2:
+            # Create a 2-way contingency table
+            row_var, col_var = selected_cat_col
+            cube = graph["eda2/contingency"]
+            cross_tab = cube.table()
+            st.write("")
+            st.write("##### 🔽 Contingency table")
             st.dataframe(cross_tab)
+            st.caption(chi_square_caption(cube))
 
+            # Create heatmap
             fig1 = px.imshow(
                 cross_tab.values,
                 x=cross_tab.columns,
@@ -147,151 +160,223 @@ if df is not None:
                 color_continuous_scale="Emrld",
                 labels=dict(x=col_var, y=row_var, color="Count"),
                 aspect="auto",
-                width=500,
-                height=500
             )
-            st.plotly_chart(fig1, use_container_width=False)
 
-        # Sunburst for 3-layer categorical structure
-        fig2 = px.sunburst(df, path=selected_cat_col)
-        st.plotly_chart(fig2, use_container_width=False)
+            # Create sunburst/treemap/icicle chart based on hierarchy of categorical variables
+            fig2 = graph["eda2/hierarchy_figure"]
+
+            # Show both charts side by side
+            col1, col2 = st.columns(2)
+            with col1:
+                st.plotly_chart(fig1, use_container_width=False)
+            with col2:
+                st.plotly_chart(fig2, use_container_width=False)
+
+        elif len(selected_cat_col) == 3:
+            # For 3 categorical variables: one as group (faceting)
+            row_var, col_var, group_var = selected_cat_col
+            st.write("")
+            st.write("##### 🔽 Contingency table, " f"grouped by: {group_var}")
+
+            # One count cube for all groups; each group's table is a slice of it
+            cube = graph["eda2/contingency"]
+            for level in cube.group_levels():
+                cross_tab = cube.table(level)
+
+                st.write(f"Group: {group_var} = {level}")
+                st.dataframe(cross_tab)
+                st.caption(chi_square_caption(cube, level))
+
+                fig1 = px.imshow(
+                    cross_tab.values,
+                    x=cross_tab.columns,
+                    y=cross_tab.index,
+                    text_auto=True,
+                    color_continuous_scale="Emrld",
+                    labels=dict(x=col_var, y=row_var, color="Count"),
+                    aspect="auto",
+                    width=500,
+                    height=500
+                )
+                st.plotly_chart(fig1, use_container_width=False)
+
+            # Sunburst/treemap/icicle for 3-layer categorical structure
+            fig2 = graph["eda2/hierarchy_figure"]
+            st.plotly_chart(fig2, use_container_width=False)
 
-    else:
-        st.info("Please select 2 or 3 variables.")
+        else:
+            st.info("Please select 2 or 3 variables.")
 
-    st.markdown("---")
+        st.markdown("---")
+
+    categorical_visualization(df, edits, categorical_cols)
 
     # ==========================================
     # 3️⃣ Numerical Dataset Visualization
     # ==========================================
-    st.write("### 3️⃣ Numerical Dataset Visualization  |  連續型資料視覺化")
-    st.write("##### 🔸 Dataset with more than one numerical variables.")
-
-    # User selects numerical variables
-    selected_num_col = st.multiselect("Select numerical variables:", numerical_cols, key="num_selector")
-
-    if len(selected_num_col) < 2:
-        st.info("Please select at least 2 variables.")
-    else:
-        # Scatter matrix (pairplot) using Plotly
-        st.write("")
-        st.write("##### 🔽 Pairplot")
-        fig3 = px.scatter_matrix(
-            df,
-            dimensions=selected_num_col,
-            title="",
-            height=600,
-            width=600
-        )
-        fig3.update_traces(diagonal_visible=False)
-        st.plotly_chart(fig3, use_container_width=False)
-
-        # Correlation heatmap
-        st.write("##### 🔽 Correlation heatmap")
-        corr = df[selected_num_col].corr()
-        fig4 = px.imshow(
-            corr,
-            text_auto=".3f",
-            color_continuous_scale="RdBu",
-            zmin=-1, zmax=1,
-            labels=dict(color="Correlation"),
-            aspect="auto",
-            width=600,
-            height=500
-        )
-        fig4.update_traces(textfont=dict(size=16))
-        st.plotly_chart(fig4, use_container_width=False)
+    @page_section(profiler, "3 Numerical Dataset Visualization")
+    def numerical_visualization(df, edits, numerical_cols):
+        st.write("### 3️⃣ Numerical Dataset Visualization  |  連續型資料視覺化")
+        st.write("##### 🔸 Dataset with more than one numerical variables.")
+
+        # User selects numerical variables
+        selected_num_col = st.multiselect("Select numerical variables:", numerical_cols, key="num_selector")
+
+        if len(selected_num_col) < 2:
+            st.info("Please select at least 2 variables.")
+        else:
+            # Pairplot: 2D histograms off the diagonal, histograms on the diagonal
+            st.write("")
+            st.write("##### 🔽 Pairplot")
+            pair_bins = st.slider("Number of bins (組數)", 10, 80, 30, 5, key="pair_bins")
+            debounce("pair_bins", pair_bins)
+            # Counted in the background; changing the selection or the bins cancels the previous pairplot
+            pair_cells = wait_for(start_job(
+                "pairplot", (edits.token(numerical_cols), tuple(selected_num_col), pair_bins),
+                pairplot_steps, pair_grid(df, edits.token(numerical_cols)), list(selected_num_col), bins=pair_bins,
+            ))
+            fig3 = pairplot_figure(pair_cells, list(selected_num_col), size=600)
+            st.plotly_chart(fig3, use_container_width=False)
+
+            # Correlation heatmap
+            st.write("##### 🔽 Correlation heatmap")
+            corr_method = st.radio("Correlation method:", ["Pearson", "Spearman", "Kendall"], horizontal=True, key="corr_method")
+            if corr_method == "Pearson":
+                # Sums and cross-products are maintained under table edits, so no full recompute per edit
+                correlations = edits.stats()
+            else:
+                correlations = correlation_service(df, edits.token(numerical_cols))
+            corr = correlations.matrix(selected_num_col, corr_method.lower())
+            pair_counts = correlations.pair_counts(selected_num_col).values
+            if pair_counts.min() < len(df):
+                st.caption(f"Missing values are handled pairwise: each correlation uses {pair_counts.min()} to {pair_counts.max()} complete observations. (缺失值以成對方式排除)")
+            fig4 = px.imshow(
+                corr,
+                text_auto=".3f",
+                color_continuous_scale="RdBu",
+                zmin=-1, zmax=1,
+                labels=dict(color="Correlation"),
+                aspect="auto",
+                width=600,
+                height=500
+            )
+            fig4.update_traces(textfont=dict(size=16))
+            st.plotly_chart(fig4, use_container_width=False)
 
-    st.markdown("---")
+        st.markdown("---")
+
+    numerical_visualization(df, edits, numerical_cols)
 
     # ==========================================
     # 4️⃣ Mixed-Type Dataset Visualization
     # ==========================================
-    st.write("### 4️⃣ Mixed-Type Dataset Visualization  |  混合型資料集視覺化")
-    st.write("##### 🔸 Dataset with both numeric and categorical variables.")
-
-    # User selects type of visualization
-    chart_type = st.radio(
-        "Select chart type to display:",
-        ["Box plot", "Violin plot", "Scatter plot (2D)", "Scatter plot (3D)"],
-        index=0
-    )
-
-    # --- Box plot ---
-    if chart_type == "Box plot":
-        cat_var1 = st.selectbox("Choose a categorical variable for X-axis", categorical_cols)
-        num_var1 = st.selectbox("Choose a numerical variable for Y-axis", numerical_cols)
-        cat_var2 = st.selectbox("Choose a categorical variable for color", ["None"] + categorical_cols, index=1)
-        color_arg = cat_var2 if cat_var2 != "None" else None
-
-        fig5 = px.box(
-            df,
-            x=cat_var1,
-            y=num_var1,
-            color=color_arg,
-            width=700,
-            height=500
-        )
-        st.plotly_chart(fig5, use_container_width=False)
-
-    # --- Violin plot ---
-    elif chart_type == "Violin plot":
-        cat_var1 = st.selectbox("Choose a categorical variable for X-axis", categorical_cols)
-        num_var1 = st.selectbox("Choose a numerical variable for Y-axis", numerical_cols)
-        cat_var2 = st.selectbox("Choose a categorical variable for color", ["None"] + categorical_cols, index=1)
-        color_arg = cat_var2 if cat_var2 != "None" else None
-
-        fig5 = px.violin(
-            df,
-            x=cat_var1,
-            y=num_var1,
-            color=color_arg,
-            box=True,
-            points="all",
-            width=700,
-            height=500
-        )
-        st.plotly_chart(fig5, use_container_width=False)
-
-    # --- 2D Scatter plot (strip plot) ---
-    elif chart_type == "Scatter plot (2D)":
-        num_var1 = st.selectbox("Choose a numerical variable for X-axis", numerical_cols, index=0)
-        num_var2 = st.selectbox("Choose a numerical variable for Y-axis", numerical_cols, index=1)
-        cat_var1 = st.selectbox("Choose a categorical variable for color", ["None"] + categorical_cols, index=1)
-        color_arg = cat_var1 if cat_var1 != "None" else None
-
-        fig5 = px.strip(
-            df,
-            x=num_var1,
-            y=num_var2,
-            color=color_arg,
-            stripmode='overlay',
-            width=700,
-            height=500
-        )
-        st.plotly_chart(fig5, use_container_width=False)
-
-    # --- 3D Scatter plot ---
-    elif chart_type == "Scatter plot (3D)":
-        num_var1 = st.selectbox("Choose numerical variable for X-axis", numerical_cols, key="x_axis", index=0)
-        num_var2 = st.selectbox("Choose numerical variable for Y-axis", numerical_cols, key="y_axis", index=1)
-        num_var3 = st.selectbox("Choose numerical variable for Z-axis", numerical_cols, key="z_axis", index=2)
-
-        cat_var1 = st.selectbox("Choose a categorical variable for color", ["None"] + categorical_cols, key="color_axis", index=1)
-        color_arg = cat_var1 if cat_var1 != "None" else None
-
-        fig5 = px.scatter_3d(
-            df,
-            x=num_var1,
-            y=num_var2,
-            z=num_var3,
-            color=color_arg,
-            width=700,
-            height=500
+    @page_section(profiler, "4 Mixed-Type Dataset Visualization")
+    def mixed_visualization(df, edits, categorical_cols, numerical_cols, budget):
+        st.write("### 4️⃣ Mixed-Type Dataset Visualization  |  混合型資料集視覺化")
+        st.write("##### 🔸 Dataset with both numeric and categorical variables.")
+
+        # User selects type of visualization
+        chart_type = st.radio(
+            "Select chart type to display:",
+            ["Box plot", "Violin plot", "Scatter plot (2D)", "Scatter plot (3D)"],
+            index=0
         )
-        st.plotly_chart(fig5, use_container_width=False)
+
+        # --- Box plot ---
+        if chart_type == "Box plot":
+            cat_var1 = st.selectbox("Choose a categorical variable for X-axis", categorical_cols)
+            num_var1 = st.selectbox("Choose a numerical variable for Y-axis", numerical_cols)
+            cat_var2 = st.selectbox("Choose a categorical variable for color", ["None"] + categorical_cols, index=1)
+            color_arg = cat_var2 if cat_var2 != "None" else None
+
+            fig5 = px.box(
+                df,
+                x=cat_var1,
+                y=num_var1,
+                color=color_arg,
+                category_orders=category_orders(df, categorical_cols),
+                width=700,
+                height=500
+            )
+            st.plotly_chart(fig5, use_container_width=False)
+
+        # --- Violin plot ---
+        elif chart_type == "Violin plot":
+            cat_var1 = st.selectbox("Choose a categorical variable for X-axis", categorical_cols)
+            num_var1 = st.selectbox("Choose a numerical variable for Y-axis", numerical_cols)
+            cat_var2 = st.selectbox("Choose a categorical variable for color", ["None"] + categorical_cols, index=1)
+            color_arg = cat_var2 if cat_var2 != "None" else None
+
+            # Points drawn: a sample within the point budget, stratified by the color variable
+            positions = point_sample(df, edits.token([color_arg] if color_arg else []), budget, color_arg)
+            if caption := sample_caption(len(positions), len(df), color_arg):
+                st.caption(caption)
+            fig5 = px.violin(
+                df.iloc[positions],
+                x=cat_var1,
+                y=num_var1,
+                color=color_arg,
+                category_orders=category_orders(df, categorical_cols),
+                box=True,
+                points="all",
+                width=700,
+                height=500
+            )
+            st.plotly_chart(fig5, use_container_width=False)
+
+        # --- 2D Scatter plot (strip plot) ---
+        elif chart_type == "Scatter plot (2D)":
+            num_var1 = st.selectbox("Choose a numerical variable for X-axis", numerical_cols, index=0)
+            num_var2 = st.selectbox("Choose a numerical variable for Y-axis", numerical_cols, index=1)
+            cat_var1 = st.selectbox("Choose a categorical variable for color", ["None"] + categorical_cols, index=1)
+            color_arg = cat_var1 if cat_var1 != "None" else None
+
+            # Points drawn: a sample within the point budget, stratified by the color variable
+            positions = point_sample(df, edits.token([color_arg] if color_arg else []), budget, color_arg)
+            if caption := sample_caption(len(positions), len(df), color_arg):
+                st.caption(caption)
+            fig5 = px.strip(
+                df.iloc[positions],
+                x=num_var1,
+                y=num_var2,
+                color=color_arg,
+                category_orders=category_orders(df, categorical_cols),
+                stripmode='overlay',
+                width=700,
+                height=500
+            )
+            st.plotly_chart(fig5, use_container_width=False)
+
+        # --- 3D Scatter plot ---
+        elif chart_type == "Scatter plot (3D)":
+            num_var1 = st.selectbox("Choose numerical variable for X-axis", numerical_cols, key="x_axis", index=0)
+            num_var2 = st.selectbox("Choose numerical variable for Y-axis", numerical_cols, key="y_axis", index=1)
+            num_var3 = st.selectbox("Choose numerical variable for Z-axis", numerical_cols, key="z_axis", index=2)
+
+            cat_var1 = st.selectbox("Choose a categorical variable for color", ["None"] + categorical_cols, key="color_axis", index=1)
+            color_arg = cat_var1 if cat_var1 != "None" else None
+
+            # Points drawn: a sample within the point budget, stratified by the color variable
+            positions = point_sample(df, edits.token([color_arg] if color_arg else []), budget, color_arg)
+            if caption := sample_caption(len(positions), len(df), color_arg):
+                st.caption(caption)
+            fig5 = px.scatter_3d(
+                df.iloc[positions],
+                x=num_var1,
+                y=num_var2,
+                z=num_var3,
+                color=color_arg,
+                category_orders=category_orders(df, categorical_cols),
+                width=700,
+                height=500
+            )
+            st.plotly_chart(fig5, use_container_width=False)
+
+    mixed_visualization(df, edits, categorical_cols, numerical_cols, budget)
 
 # Footer
 st.markdown("---")
 st.write("stat2vis: Collection of Applications for Visualizing Statistics")
-st.write("GitHub: https://github.com/TeddYenn/stat2vis")
\ No newline at end of file
+st.write("GitHub: https://github.com/TeddYenn/stat2vis")
+graph.view()
+profiler.finish()
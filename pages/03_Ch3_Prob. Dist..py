@@ -1,7 +1,19 @@
 import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import norm, binom, poisson
+from stat2vis.artifacts import shared_cache
+from stat2vis.distributions import (
+    beta_curve, binomial_pmf, chi_square_curve, exponential_curve, f_curve, gamma_curve, geometric_pmf,
+    hypergeometric_pmf, multinomial_sample, negative_binomial_pmf, normal_curve, poisson_pmf, t_curve, uniform_curve,
+)
+from stat2vis.profiling import page_profiler
+from stat2vis.render import show_figure
+
+# Curves depend only on their parameters, so each one is computed once for all sessions
+normal_curve, uniform_curve, exponential_curve, gamma_curve, chi_square_curve, t_curve, f_curve, beta_curve = map(
+    shared_cache, (normal_curve, uniform_curve, exponential_curve, gamma_curve, chi_square_curve, t_curve, f_curve, beta_curve)
+)
+binomial_pmf, hypergeometric_pmf, geometric_pmf, negative_binomial_pmf, poisson_pmf = map(
+    shared_cache, (binomial_pmf, hypergeometric_pmf, geometric_pmf, negative_binomial_pmf, poisson_pmf)
+)
 
 # Streamlit page configuration
 st.set_page_config(
@@ -14,6 +26,7 @@ st.set_page_config(
         'Get Help': 'https://github.com/TeddYenn/stat2vis',
         'Report a bug': "https://github.com/TeddYenn/stat2vis/issues"
     })
+profiler = page_profiler("Ch3 Probability Distributions")
 
 # App header and intro
 st.title("Ch. 3: Probability Distributions  |  機率分布")
@@ -25,6 +38,7 @@ st.write("透過探索式資料分析技術，我們已了解基礎的資料分
 # Section: Distribution Selector
 st.write("")
 st.write("")
+profiler.start("1 Select a Distribution")
 st.write("### 1️⃣ Select a Distribution  |  選擇分布")
 
 dist_category = st.radio("Distribution Type:", ["Discrete Distribution （離散分布)", "Continuous Distribution (連續分布)"])
@@ -79,6 +93,7 @@ if dist_type == "Normal Distribution (常態分布)":
                 """)
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for parameters ---
@@ -88,41 +103,25 @@ if dist_type == "Normal Distribution (常態分布)":
         std = st.slider("Standard Deviation（σ）", 0.1, 10.0, 1.0, 0.1)
         fix_xlim = st.checkbox("Fix X-axis to [-30, 30]", value=False)
 
-    # --- PDF calculation and plotting values ---
-    if fix_xlim:
-        x = np.linspace(-30, 30, 500)
-    else:
-        x = np.linspace(mean - 4*std, mean + 4*std, 500)
-    y = norm.pdf(x, mean, std)
-
-    # --- Simulate data points (samples) for visualization ---
-    data_points = np.random.normal(loc=mean, scale=std, size=100)
-    data_y = norm.pdf(data_points, mean, std)
-
-    # --- Plotting PDF and elements ---
-    fig, ax = plt.subplots(figsize=(7, 3))
-    ax.plot(x, y, label="PDF", color="blue")
-    ax.scatter(data_points, data_y, color='grey', zorder=5, label="Data Points", s=8)
-
-    # --- Mean and 95% interval ---
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean = {mean}")
-    z = 1.96
-    lower = mean - z * std
-    upper = mean + z * std
-    ax.axvline(lower, color="green", linestyle=":", label=f"Lower 95% ≈ {lower:.2f}")
-    ax.axvline(upper, color="green", linestyle=":", label=f"Upper 95% ≈ {upper:.2f}")
-
-    # --- Highlight 95% area ---
-    x_fill = np.linspace(lower, upper, 300)
-    y_fill = norm.pdf(x_fill, mean, std)
-    ax.fill_between(x_fill, y_fill, alpha=0.3, color='gray', label="~95% Area")
-
-    ax.set_title("Normal Distribution")
-    ax.legend(fontsize="small")
-    st.pyplot(fig, use_container_width=False)
-
-    if fix_xlim:
-        ax.set_xlim(-50, 50)
+    def draw_normal(fig, curve):
+        # --- Plotting PDF and simulated data points ---
+        ax = fig.subplots()
+        ax.plot(curve["x"], curve["y"], label="PDF", color="blue")
+        ax.scatter(curve["points"], curve["points_y"], color='grey', zorder=5, label="Data Points", s=8)
+
+        # --- Mean and 95% interval ---
+        ax.axvline(curve["mean"], color="red", linestyle="--", label=f"Mean = {curve['mean']}")
+        ax.axvline(curve["lower"], color="green", linestyle=":", label=f"Lower 95% ≈ {curve['lower']:.2f}")
+        ax.axvline(curve["upper"], color="green", linestyle=":", label=f"Upper 95% ≈ {curve['upper']:.2f}")
+
+        # --- Highlight 95% area ---
+        ax.fill_between(curve["x_fill"], curve["y_fill"], alpha=0.3, color='gray', label="~95% Area")
+
+        ax.set_title("Normal Distribution")
+        ax.legend(fontsize="small")
+
+    # Sample points are seeded so a repeated state reuses the cached image
+    show_figure(draw_normal, normal_curve(mean, std, fix_xlim), figsize=(7, 3), width="content")
 
 # ==========================================
 # Uniform Distribution
@@ -160,6 +159,7 @@ elif dist_type == "Uniform Distribution (均勻分布)":
              ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for interval [a, b] ---
@@ -168,29 +168,22 @@ elif dist_type == "Uniform Distribution (均勻分布)":
         a = st.slider("Lower Bound (a)", -100.0, 100.0, 0.0, 10.0)
         b = st.slider("Upper Bound (b)", a + 10.0, a + 200.0, a + 10.0, 10.0)  # Ensure b > a
 
-    # --- PDF data generation ---
-    x = np.linspace(a - (b - a) * 0.2, b + (b - a) * 0.2, 500)
-    y = np.where((x >= a) & (x <= b), 1 / (b - a), 0)
-
-    # --- Calculate mean and std ---
-    mean = (a + b) / 2
-    std = np.sqrt((b - a) ** 2 / 12)
-
-    # --- Plotting PDF ---
-    fig, ax = plt.subplots(figsize=(5, 3))
-    ax.hlines(1 / (b - a), xmin=a, xmax=b, colors='blue', label="PDF", linewidth=2)
+    def draw_uniform(fig, curve, a, b):
+        # --- Plotting PDF ---
+        ax = fig.subplots()
+        ax.hlines(curve["density"], xmin=a, xmax=b, colors='blue', label="PDF", linewidth=2)
 
-    # --- Vertical reference lines for a, b, and mean ---
-    ax.axvline(a, color="green", linestyle=":", label=f"a = {a}")
-    ax.axvline(b, color="green", linestyle=":", label=f"b = {b}")
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean = {mean:.2f}")
+        # --- Vertical reference lines for a, b, and mean ---
+        ax.axvline(a, color="green", linestyle=":", label=f"a = {a}")
+        ax.axvline(b, color="green", linestyle=":", label=f"b = {b}")
+        ax.axvline(curve["mean"], color="red", linestyle="--", label=f"Mean = {curve['mean']:.2f}")
 
-    # --- Plot adjustments ---
-    ax.set_ylim(0, (1 / (b - a)) * 1.2)
-    ax.set_title("Uniform Distribution")
-    ax.legend(fontsize="small")
+        # --- Plot adjustments ---
+        ax.set_ylim(0, curve["density"] * 1.2)
+        ax.set_title("Uniform Distribution")
+        ax.legend(fontsize="small")
 
-    st.pyplot(fig, use_container_width=False)
+    show_figure(draw_uniform, uniform_curve(a, b), a, b, figsize=(5, 3), width="content")
 
 
 # ==========================================
@@ -225,6 +218,7 @@ elif dist_type == "Exponential Distribution (指數分布)":
              ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- Parameter inputs ---
@@ -232,35 +226,20 @@ elif dist_type == "Exponential Distribution (指數分布)":
     with col1:
         lam = st.slider("Rate (λ)", 0.1, 10.0, 1.0, 0.1)  # λ > 0
 
-    # --- PDF calculation ---
-    x_max = 20
-    x = np.linspace(0, x_max, 500)
-    y = lam * np.exp(-lam * x)
+    def draw_exponential(fig, curve):
+        # --- Plotting PDF and elements ---
+        ax = fig.subplots()
+        ax.plot(curve["x"], curve["y"], label="PDF", color="blue")
 
-    mean = 1 / lam
-    std = 1 / lam
-    lower = 0
-    upper = mean + 2 * std  # Approximate range that covers ~95% for exponential
+        # --- Mean and ~95% range reference lines ---
+        ax.axvline(curve["mean"], color="red", linestyle="--", label=f"Mean = {curve['mean']:.2f}")
+        ax.axvline(curve["upper"], color="green", linestyle=":", label=f"Upper ≈ μ + 2σ ≈ {curve['upper']:.2f}")
+        ax.fill_between(curve["x_fill"], curve["y_fill"], alpha=0.3, color='gray', label="~95% Area")
 
-    # --- Plotting the PDF ---
-    fig, ax = plt.subplots(figsize=(7, 3))
+        ax.set_title("Exponential Distribution")
+        ax.legend(fontsize="small")
 
-    ax.plot(x, y, label="PDF", color="blue")  # Plot the exponential curve
-
-    # --- Reference lines for mean and ~95% range ---
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean = {mean:.2f}")
-    ax.axvline(upper, color="green", linestyle=":", label=f"Upper ≈ μ + 2σ ≈ {upper:.2f}")
-
-    # --- Fill between for ~95% area ---
-    x_fill = np.linspace(lower, upper, 300)
-    y_fill = lam * np.exp(-lam * x_fill)
-    ax.fill_between(x_fill, y_fill, alpha=0.3, color='gray', label="~95% Area")
-
-    # --- Final layout ---
-    ax.set_title("Exponential Distribution")
-    ax.legend(fontsize="small")
-
-    st.pyplot(fig, use_container_width=False)
+    show_figure(draw_exponential, exponential_curve(lam), figsize=(7, 3), width="content")
 
 # ==========================================
 # Gamma Distribution
@@ -290,6 +269,7 @@ elif dist_type == "Gamma Distribution (Gamma 分布)":
     st.latex(r"\mu = \frac{\alpha}{\beta}, \quad \sigma = \frac{\sqrt{\alpha}}{\beta}")
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # -- User Inputs for shape (α) and rate (β) parameters
@@ -298,34 +278,21 @@ elif dist_type == "Gamma Distribution (Gamma 分布)":
         alpha = st.slider("Shape (α)", 0.1, 20.0, 2.0, 1.0)
         beta = st.slider("Rate (β)", 0.1, 10.0, 1.0, 1.0)
 
-    # -- Generate x values and corresponding PDF values
-    x = np.linspace(0, 5 * alpha / beta, 500)
-    from scipy.stats import gamma
-    y = gamma.pdf(x, a=alpha, scale=1/beta)
-
-    # -- Compute mean and standard deviation
-    mean = alpha / beta
-    std = np.sqrt(alpha) / beta
-    lower = mean - 2 * std
-    upper = mean + 2 * std
+    def draw_gamma(fig, curve):
+        # --- Plotting PDF and elements ---
+        ax = fig.subplots()
+        ax.plot(curve["x"], curve["y"], label="PDF", color="blue")
 
-    # -- Plotting
-    fig, ax = plt.subplots(figsize=(7, 3))
+        # --- Mean and ~95% range reference lines ---
+        ax.axvline(curve["mean"], color="red", linestyle="--", label=f"Mean ≈ {curve['mean']:.2f}")
+        ax.axvline(curve["lower"], color="green", linestyle=":", label=f"μ - 2σ ≈ {curve['lower']:.2f}")
+        ax.axvline(curve["upper"], color="green", linestyle=":", label=f"μ + 2σ ≈ {curve['upper']:.2f}")
+        ax.fill_between(curve["x_fill"], curve["y_fill"], alpha=0.3, color='gray', label="~95% Area")
 
-    ax.plot(x, y, label="PDF", color="blue")
+        ax.set_title("Gamma Distribution")
+        ax.legend(fontsize="small")
 
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean ≈ {mean:.2f}")
-    ax.axvline(lower, color="green", linestyle=":", label=f"μ - 2σ ≈ {lower:.2f}")
-    ax.axvline(upper, color="green", linestyle=":", label=f"μ + 2σ ≈ {upper:.2f}")
-
-    x_fill = np.linspace(lower, upper, 300)
-    y_fill = gamma.pdf(x_fill, a=alpha, scale=1/beta)
-    ax.fill_between(x_fill, y_fill, alpha=0.3, color='gray', label="~95% Area")
-
-    ax.set_title("Gamma Distribution")
-    ax.legend(fontsize="small")
-
-    st.pyplot(fig, use_container_width=False)
+    show_figure(draw_gamma, gamma_curve(alpha, beta), figsize=(7, 3), width="content")
 
 # ==========================================
 # Chi-square Distribution
@@ -370,6 +337,7 @@ elif dist_type == "Chi-square Distribution (卡方分布)":
              ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for degrees of freedom ---
@@ -377,33 +345,21 @@ elif dist_type == "Chi-square Distribution (卡方分布)":
     with col1:
         df = st.slider("Degrees of Freedom (k)", 1, 50, 5, 1)
 
-    # --- PDF calculation and plotting values ---
-    x = np.linspace(0, df+50, 500)
-    from scipy.stats import chi2
-    y = chi2.pdf(x, df)
+    def draw_chi_square(fig, curve):
+        # --- Plotting PDF and elements ---
+        ax = fig.subplots()
+        ax.plot(curve["x"], curve["y"], label="PDF", color="blue")
 
-    mean = df
-    std = np.sqrt(2 * df)
-    lower = mean - 2 *std
-    upper = mean + 2 *std
+        # --- Mean and ~95% range reference lines ---
+        ax.axvline(curve["mean"], color="red", linestyle="--", label=f"Mean = {curve['mean']}")
+        ax.axvline(curve["lower"], color="green", linestyle=":", label=f"μ - 2σ ≈ {curve['lower']:.2f}")
+        ax.axvline(curve["upper"], color="green", linestyle=":", label=f"μ + 2σ ≈ {curve['upper']:.2f}")
+        ax.fill_between(curve["x_fill"], curve["y_fill"], alpha=0.3, color='gray', label="~95% Area")
 
-    # --- Plotting PDF and elements ---
-    fig, ax = plt.subplots(figsize=(7, 3))
-    ax.plot(x, y, label="PDF", color="blue")
+        ax.set_title("Chi-square Distribution")
+        ax.legend(fontsize="small")
 
-    # --- Mean and ±1σ interval ---
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean = {mean}")
-    ax.axvline(lower, color="green", linestyle=":", label=f"μ - 2σ ≈ {lower:.2f}")
-    ax.axvline(upper, color="green", linestyle=":", label=f"μ + 2σ ≈ {upper:.2f}")
-
-    # --- Highlight ~95% area around the mean ---
-    x_fill = np.linspace(lower, upper, 300)
-    y_fill = chi2.pdf(x_fill, df)
-    ax.fill_between(x_fill, y_fill, alpha=0.3, color='gray', label="~95% Area")
-
-    ax.set_title("Chi-square Distribution")
-    ax.legend(fontsize="small")
-    st.pyplot(fig, use_container_width=False)
+    show_figure(draw_chi_square, chi_square_curve(df), figsize=(7, 3), width="content")
 
 # ==========================================
 # Student's t-distribution
@@ -444,6 +400,7 @@ elif dist_type == "Student's t-distribution (t 分布)":
              ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for degrees of freedom ---
@@ -451,38 +408,25 @@ elif dist_type == "Student's t-distribution (t 分布)":
     with col1:
         df = st.slider("Degrees of Freedom (ν)", 1, 100, 5, 1)
 
-    # --- PDF calculation ---
-    from scipy.stats import t
-    x_range = 5
-    x = np.linspace(-x_range, x_range, 500)
-    y = t.pdf(x, df)
-
-    # --- Calculate mean and std (if df > 2) ---
-    mean = 0
-    std = np.sqrt(df / (df - 2)) if df > 2 else np.inf
-    lower = mean - 2 * std if df > 2 else -x_range / 2
-    upper = mean + 2 * std if df > 2 else x_range / 2
-
-    # --- Plotting PDF and elements ---
-    fig, ax = plt.subplots(figsize=(7, 3))
-    ax.plot(x, y, label="PDF", color="blue")
-
-    # --- Mean and standard deviation reference lines ---
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean = {mean}")
-    if df > 2:
-        ax.axvline(lower, color="green", linestyle=":", label=f"μ - 2σ ≈ {lower:.2f}")
-        ax.axvline(upper, color="green", linestyle=":", label=f"μ + 2σ ≈ {upper:.2f}")
-
-        # --- Highlight ~95% area ---
-        x_fill = np.linspace(lower, upper, 300)
-        y_fill = t.pdf(x_fill, df)
-        ax.fill_between(x_fill, y_fill, alpha=0.3, color='gray', label="~95% Area")
-    else:
-        st.warning("Standard deviation is undefined for ν ≤ 2")
+    def draw_t(fig, curve):
+        # --- Plotting PDF and elements ---
+        ax = fig.subplots()
+        ax.plot(curve["x"], curve["y"], label="PDF", color="blue")
 
-    ax.set_title("Student's t-distribution")
-    ax.legend(fontsize="small")
-    st.pyplot(fig, use_container_width=False)
+        # --- Mean and ~95% range reference lines ---
+        ax.axvline(curve["mean"], color="red", linestyle="--", label=f"Mean = {curve['mean']}")
+        if curve["std"] is not None:
+            ax.axvline(curve["lower"], color="green", linestyle=":", label=f"μ - 2σ ≈ {curve['lower']:.2f}")
+            ax.axvline(curve["upper"], color="green", linestyle=":", label=f"μ + 2σ ≈ {curve['upper']:.2f}")
+            ax.fill_between(curve["x_fill"], curve["y_fill"], alpha=0.3, color='gray', label="~95% Area")
+
+        ax.set_title("Student's t-distribution")
+        ax.legend(fontsize="small")
+
+    curve = t_curve(df)
+    if curve["std"] is None:
+        st.warning("Standard deviation is undefined for ν ≤ 2")
+    show_figure(draw_t, curve, figsize=(7, 3), width="content")
 
 # ==========================================
 # F-distribution
@@ -528,6 +472,7 @@ elif dist_type == "F Distribution (F 分布)":
              ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for degrees of freedom ---
@@ -536,40 +481,26 @@ elif dist_type == "F Distribution (F 分布)":
         d1 = st.slider("Numerator df (d₁)", 1, 100, 15, 1)
         d2 = st.slider("Denominator df (d₂)", 1, 100, 20, 1)
 
-    # --- PDF calculation ---
-    from scipy.stats import f
-    x_max = f.ppf(0.995, d1, d2) if d2 > 2 else 10
-    x = np.linspace(0.01, x_max, 500)
-    y = f.pdf(x, d1, d2)
-
-    # --- Mean and std computation (if defined) ---
-    mean = d2 / (d2 - 2) if d2 > 2 else None
-    std = np.sqrt(
-        (2 * d2**2 * (d1 + d2 - 2)) / (d1 * (d2 - 2)**2 * (d2 - 4))
-    ) if d2 > 4 else None
-
-    # --- Plotting PDF and elements ---
-    fig, ax = plt.subplots(figsize=(7, 3))
-    ax.plot(x, y, label="PDF", color="blue")
-
-    # --- Annotate mean and ~95% area (if std is defined) ---
-    if mean is not None:
-        ax.axvline(mean, color="red", linestyle="--", label=f"Mean ≈ {mean:.2f}")
-    if mean is not None and std is not None:
-        lower = mean - 2 * std
-        upper = mean + 2 * std
-        ax.axvline(lower, color="green", linestyle=":", label=f"μ - 2σ ≈ {lower:.2f}")
-        ax.axvline(upper, color="green", linestyle=":", label=f"μ + 2σ ≈ {upper:.2f}")
-
-        x_fill = np.linspace(lower, upper, 300)
-        y_fill = f.pdf(x_fill, d1, d2)
-        ax.fill_between(x_fill, y_fill, alpha=0.3, color='gray', label="~95% Area")
-    else:
-        st.warning("Standard deviation is undefined for d₂ ≤ 4")
+    def draw_f(fig, curve):
+        # --- Plotting PDF and elements ---
+        ax = fig.subplots()
+        ax.plot(curve["x"], curve["y"], label="PDF", color="blue")
+
+        # --- Mean and ~95% range reference lines ---
+        if curve["mean"] is not None:
+            ax.axvline(curve["mean"], color="red", linestyle="--", label=f"Mean ≈ {curve['mean']:.2f}")
+        if curve["lower"] is not None:
+            ax.axvline(curve["lower"], color="green", linestyle=":", label=f"μ - 2σ ≈ {curve['lower']:.2f}")
+            ax.axvline(curve["upper"], color="green", linestyle=":", label=f"μ + 2σ ≈ {curve['upper']:.2f}")
+            ax.fill_between(curve["x_fill"], curve["y_fill"], alpha=0.3, color='gray', label="~95% Area")
 
-    ax.set_title("F-distribution")
-    ax.legend(fontsize="small")
-    st.pyplot(fig, use_container_width=False)
+        ax.set_title("F-distribution")
+        ax.legend(fontsize="small")
+
+    curve = f_curve(d1, d2)
+    if curve["std"] is None:
+        st.warning("Standard deviation is undefined for d₂ ≤ 4")
+    show_figure(draw_f, curve, figsize=(7, 3), width="content")
 
 # ==========================================
 # Beta Distribution
@@ -606,6 +537,7 @@ elif dist_type == "Beta Distribution (Beta 分布)":
              ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for alpha and beta ---
@@ -614,36 +546,25 @@ elif dist_type == "Beta Distribution (Beta 分布)":
         alpha = st.slider("Alpha (α)", 0.1, 10.0, 5.0, 0.1)
         beta = st.slider("Beta (β)", 0.1, 10.0, 5.0, 0.1)
 
-    # --- PDF calculation ---
-    from scipy.stats import beta as beta_dist
-    x = np.linspace(0, 1, 500)
-    y = beta_dist.pdf(x, alpha, beta)
-
-    # --- Mean and std computation ---
-    mean = alpha / (alpha + beta)
-    std = np.sqrt((alpha * beta) / ((alpha + beta)**2 * (alpha + beta + 1)))
-    lower = mean - 2 * std
-    upper = mean + 2 * std
-
-    # --- Plotting PDF and elements ---
-    fig, ax = plt.subplots(figsize=(7, 3))
-    ax.plot(x, y, label="PDF", color="blue")
-
-    # --- Annotate mean and ~95% area ---
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean ≈ {mean:.2f}")
-    if lower > 0 and upper < 1:
-        ax.axvline(lower, color="green", linestyle=":", label=f"μ - 2σ ≈ {lower:.2f}")
-        ax.axvline(upper, color="green", linestyle=":", label=f"μ + 2σ ≈ {upper:.2f}")
-
-        x_fill = np.linspace(lower, upper, 300)
-        y_fill = beta_dist.pdf(x_fill, alpha, beta)
-        ax.fill_between(x_fill, y_fill, alpha=0.3, color='gray', label="~95% Area")
-    else:
-        st.warning("The 95% range exceeds the domain [0, 1], and cannot be shown fully.")
+    def draw_beta(fig, curve):
+        # --- Plotting PDF and elements ---
+        ax = fig.subplots()
+        ax.plot(curve["x"], curve["y"], label="PDF", color="blue")
 
-    ax.set_title("Beta Distribution")
-    ax.legend(fontsize="small")
-    st.pyplot(fig, use_container_width=False)
+        # --- Mean and ~95% range reference lines ---
+        ax.axvline(curve["mean"], color="red", linestyle="--", label=f"Mean ≈ {curve['mean']:.2f}")
+        if curve["lower"] is not None:
+            ax.axvline(curve["lower"], color="green", linestyle=":", label=f"μ - 2σ ≈ {curve['lower']:.2f}")
+            ax.axvline(curve["upper"], color="green", linestyle=":", label=f"μ + 2σ ≈ {curve['upper']:.2f}")
+            ax.fill_between(curve["x_fill"], curve["y_fill"], alpha=0.3, color='gray', label="~95% Area")
+
+        ax.set_title("Beta Distribution")
+        ax.legend(fontsize="small")
+
+    curve = beta_curve(alpha, beta)
+    if curve["lower"] is None:
+        st.warning("The 95% range exceeds the domain [0, 1], and cannot be shown fully.")
+    show_figure(draw_beta, curve, figsize=(7, 3), width="content")
 
 # ==========================================
 # Binomial Distribution
@@ -678,6 +599,7 @@ elif dist_type == "Binomial Distribution (二項分布)":
     ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for number of trials and probability ---
@@ -686,32 +608,23 @@ elif dist_type == "Binomial Distribution (二項分布)":
         n = st.slider("Number of trials (n)", 1, 30, 10, 1)
         p = st.slider("Probability of success (p)", 0.0, 1.0, 0.5, 0.01)
 
-    # --- PMF calculation ---
-    from scipy.stats import binom
-    x = np.arange(0, n + 1)
-    y = binom.pmf(x, n, p)
+    def draw_binomial(fig, pmf):
+        # --- Plotting PMF and elements ---
+        ax = fig.subplots()
+        ax.bar(pmf["x"], pmf["y"], label="PMF", color="skyblue", edgecolor="black")
 
-    # --- Mean and standard deviation ---
-    mean = n * p
-    std = np.sqrt(n * p * (1 - p))
-    lower = int(max(0, mean - 2 * std))
-    upper = int(min(n, mean + 2 * std))
-
-    # --- Plotting PMF and elements ---
-    fig, ax = plt.subplots(figsize=(7, 3))
-    ax.bar(x, y, label="PMF", color="skyblue", edgecolor="black")
-
-    # --- Annotate mean and ~95% area ---
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean = {mean:.2f}")
-    ax.axvline(lower, color="green", linestyle=":", label=f"μ - 2σ ≈ {lower}")
-    ax.axvline(upper, color="green", linestyle=":", label=f"μ + 2σ ≈ {upper}")
-
-    ax.set_xticks(x)
-    ax.set_xlabel("Number of Successes")
-    ax.set_ylabel("Probability")
-    ax.set_title("Binomial Distribution")
-    ax.legend(fontsize="small")
-    st.pyplot(fig, use_container_width=False)
+        # --- Annotate mean and ~95% area ---
+        ax.axvline(pmf["mean"], color="red", linestyle="--", label=f"Mean = {pmf['mean']:.2f}")
+        ax.axvline(pmf["lower"], color="green", linestyle=":", label=f"μ - 2σ ≈ {pmf['lower']}")
+        ax.axvline(pmf["upper"], color="green", linestyle=":", label=f"μ + 2σ ≈ {pmf['upper']}")
+
+        ax.set_xticks(pmf["x"])
+        ax.set_xlabel("Number of Successes")
+        ax.set_ylabel("Probability")
+        ax.set_title("Binomial Distribution")
+        ax.legend(fontsize="small")
+
+    show_figure(draw_binomial, binomial_pmf(n, p), figsize=(7, 3), width="content")
 
 # ==========================================
 # Hypergeometric Distribution
@@ -749,6 +662,7 @@ elif dist_type == "Hypergeometric Distribution (超幾何分布)":
     ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for population parameters ---
@@ -758,34 +672,23 @@ elif dist_type == "Hypergeometric Distribution (超幾何分布)":
         K = st.slider("Number of success items (K)", 1, N, int(N / 2), 1)
         n = st.slider("Sample size (n)", 1, N, min(10, N), 1)
 
-    # --- PMF calculation ---
-    from scipy.stats import hypergeom
-    x_min = max(0, n - (N - K))
-    x_max = min(n, K)
-    x = np.arange(x_min, x_max + 1)
-    y = hypergeom.pmf(x, N, K, n)
+    def draw_hypergeometric(fig, pmf):
+        # --- Plotting PMF and elements ---
+        ax = fig.subplots()
+        ax.bar(pmf["x"], pmf["y"], label="PMF", color="salmon", edgecolor="black")
 
-    # --- Mean and standard deviation ---
-    mean = n * (K / N)
-    std = np.sqrt(n * (K / N) * ((N - K) / N) * ((N - n) / (N - 1)))
-    lower = int(max(x_min, mean - 2 * std))
-    upper = int(min(x_max, mean + 2 * std))
-
-    # --- Plotting PMF and elements ---
-    fig, ax = plt.subplots(figsize=(7, 3))
-    ax.bar(x, y, label="PMF", color="salmon", edgecolor="black")
-
-    # --- Annotate mean and ~95% area ---
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean = {mean:.2f}")
-    ax.axvline(lower, color="green", linestyle=":", label=f"μ - 2σ ≈ {lower}")
-    ax.axvline(upper, color="green", linestyle=":", label=f"μ + 2σ ≈ {upper}")
-
-    ax.set_xticks(x)
-    ax.set_xlabel("Number of Successes")
-    ax.set_ylabel("Probability")
-    ax.set_title("Hypergeometric Distribution")
-    ax.legend(fontsize="small")
-    st.pyplot(fig, use_container_width=False)
+        # --- Annotate mean and ~95% area ---
+        ax.axvline(pmf["mean"], color="red", linestyle="--", label=f"Mean = {pmf['mean']:.2f}")
+        ax.axvline(pmf["lower"], color="green", linestyle=":", label=f"μ - 2σ ≈ {pmf['lower']}")
+        ax.axvline(pmf["upper"], color="green", linestyle=":", label=f"μ + 2σ ≈ {pmf['upper']}")
+
+        ax.set_xticks(pmf["x"])
+        ax.set_xlabel("Number of Successes")
+        ax.set_ylabel("Probability")
+        ax.set_title("Hypergeometric Distribution")
+        ax.legend(fontsize="small")
+
+    show_figure(draw_hypergeometric, hypergeometric_pmf(N, K, n), figsize=(7, 3), width="content")
 
 # ==========================================
 # Geometric Distribution
@@ -819,6 +722,7 @@ elif dist_type == "Geometric Distribution (幾何分布)":
     ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for probability of success ---
@@ -826,33 +730,23 @@ elif dist_type == "Geometric Distribution (幾何分布)":
     with col1:
         p = st.slider("Probability of success (p)", 0.01, 1.0, 0.3, 0.01)
 
-    # --- PMF calculation ---
-    from scipy.stats import geom
-    x_max = int(geom.ppf(0.995, p))
-    x = np.arange(1, x_max + 1)
-    y = geom.pmf(x, p)
+    def draw_geometric(fig, pmf):
+        # --- Plotting PMF and elements ---
+        ax = fig.subplots()
+        ax.bar(pmf["x"], pmf["y"], label="PMF", color="mediumorchid", edgecolor="black")
 
-    # --- Mean and standard deviation ---
-    mean = 1 / p
-    std = np.sqrt((1 - p) / (p ** 2))
-    lower = int(max(1, mean - 2 * std))
-    upper = int(mean + 2 * std)
-
-    # --- Plotting PMF and elements ---
-    fig, ax = plt.subplots(figsize=(7, 3))
-    ax.bar(x, y, label="PMF", color="mediumorchid", edgecolor="black")
-
-    # --- Annotate mean and ~95% area ---
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean ≈ {mean:.2f}")
-    ax.axvline(lower, color="green", linestyle=":", label=f"μ - 2σ ≈ {lower}")
-    ax.axvline(upper, color="green", linestyle=":", label=f"μ + 2σ ≈ {upper}")
-
-    ax.set_xticks(x)
-    ax.set_xlabel("Trial Number Until First Success")
-    ax.set_ylabel("Probability")
-    ax.set_title("Geometric Distribution")
-    ax.legend(fontsize="small")
-    st.pyplot(fig, use_container_width=False)
+        # --- Annotate mean and ~95% area ---
+        ax.axvline(pmf["mean"], color="red", linestyle="--", label=f"Mean ≈ {pmf['mean']:.2f}")
+        ax.axvline(pmf["lower"], color="green", linestyle=":", label=f"μ - 2σ ≈ {pmf['lower']}")
+        ax.axvline(pmf["upper"], color="green", linestyle=":", label=f"μ + 2σ ≈ {pmf['upper']}")
+
+        ax.set_xticks(pmf["x"])
+        ax.set_xlabel("Trial Number Until First Success")
+        ax.set_ylabel("Probability")
+        ax.set_title("Geometric Distribution")
+        ax.legend(fontsize="small")
+
+    show_figure(draw_geometric, geometric_pmf(p), figsize=(7, 3), width="content")
 
 # ==========================================
 # Negative Binomial Distribution
@@ -889,6 +783,7 @@ elif dist_type == "Negative Binomial Distribution (負二項分布)":
     ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for r and p ---
@@ -897,33 +792,23 @@ elif dist_type == "Negative Binomial Distribution (負二項分布)":
         r = st.slider("Target number of successes (r)", 1, 30, 5, 1)
         p = st.slider("Probability of success (p)", 0.01, 1.0, 0.4, 0.01)
 
-    # --- PMF calculation ---
-    from scipy.stats import nbinom
-    x_max = int(nbinom.ppf(0.995, r, p))
-    x = np.arange(0, x_max + 1)
-    y = nbinom.pmf(x, r, p)
+    def draw_negative_binomial(fig, pmf):
+        # --- Plotting PMF and elements ---
+        ax = fig.subplots()
+        ax.bar(pmf["x"], pmf["y"], label="PMF", color="coral", edgecolor="black")
 
-    # --- Mean and standard deviation ---
-    mean = r * (1 - p) / p
-    std = np.sqrt(r * (1 - p) / p**2)
-    lower = int(max(0, mean - 2 * std))
-    upper = int(mean + 2 * std)
-
-    # --- Plotting PMF and elements ---
-    fig, ax = plt.subplots(figsize=(7, 3))
-    ax.bar(x, y, label="PMF", color="coral", edgecolor="black")
-
-    # --- Annotate mean and ~95% area ---
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean ≈ {mean:.2f}")
-    ax.axvline(lower, color="green", linestyle=":", label=f"μ - 2σ ≈ {lower}")
-    ax.axvline(upper, color="green", linestyle=":", label=f"μ + 2σ ≈ {upper}")
-
-    ax.set_xticks(x)
-    ax.set_xlabel("Number of Failures")
-    ax.set_ylabel("Probability")
-    ax.set_title("Negative Binomial Distribution")
-    ax.legend(fontsize="small")
-    st.pyplot(fig, use_container_width=False)
+        # --- Annotate mean and ~95% area ---
+        ax.axvline(pmf["mean"], color="red", linestyle="--", label=f"Mean ≈ {pmf['mean']:.2f}")
+        ax.axvline(pmf["lower"], color="green", linestyle=":", label=f"μ - 2σ ≈ {pmf['lower']}")
+        ax.axvline(pmf["upper"], color="green", linestyle=":", label=f"μ + 2σ ≈ {pmf['upper']}")
+
+        ax.set_xticks(pmf["x"])
+        ax.set_xlabel("Number of Failures")
+        ax.set_ylabel("Probability")
+        ax.set_title("Negative Binomial Distribution")
+        ax.legend(fontsize="small")
+
+    show_figure(draw_negative_binomial, negative_binomial_pmf(r, p), figsize=(7, 3), width="content")
 
 # ==========================================
 # Poisson Distribution
@@ -957,6 +842,7 @@ elif dist_type == "Poisson Distribution (卜瓦松分布)":
     ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for λ ---
@@ -964,33 +850,23 @@ elif dist_type == "Poisson Distribution (卜瓦松分布)":
     with col1:
         lam = st.slider("Rate (λ)", 0.5, 50.0, 10.0, 0.5)
 
-    # --- PMF calculation ---
-    from scipy.stats import poisson
-    x_max = int(poisson.ppf(0.995, lam))
-    x = np.arange(0, x_max + 1)
-    y = poisson.pmf(x, lam)
+    def draw_poisson(fig, pmf):
+        # --- Plotting PMF and elements ---
+        ax = fig.subplots()
+        ax.bar(pmf["x"], pmf["y"], label="PMF", color="goldenrod", edgecolor="black")
 
-    # --- Mean and standard deviation ---
-    mean = lam
-    std = np.sqrt(lam)
-    lower = int(max(0, mean - 2 * std))
-    upper = int(mean + 2 * std)
-
-    # --- Plotting PMF and elements ---
-    fig, ax = plt.subplots(figsize=(7, 3))
-    ax.bar(x, y, label="PMF", color="goldenrod", edgecolor="black")
-
-    # --- Annotate mean and ~95% area ---
-    ax.axvline(mean, color="red", linestyle="--", label=f"Mean = {mean:.2f}")
-    ax.axvline(lower, color="green", linestyle=":", label=f"μ - 2σ ≈ {lower}")
-    ax.axvline(upper, color="green", linestyle=":", label=f"μ + 2σ ≈ {upper}")
-
-    ax.set_xticks(x)
-    ax.set_xlabel("Number of Events")
-    ax.set_ylabel("Probability")
-    ax.set_title("Poisson Distribution")
-    ax.legend(fontsize="small")
-    st.pyplot(fig, use_container_width=False)
+        # --- Annotate mean and ~95% area ---
+        ax.axvline(pmf["mean"], color="red", linestyle="--", label=f"Mean = {pmf['mean']:.2f}")
+        ax.axvline(pmf["lower"], color="green", linestyle=":", label=f"μ - 2σ ≈ {pmf['lower']}")
+        ax.axvline(pmf["upper"], color="green", linestyle=":", label=f"μ + 2σ ≈ {pmf['upper']}")
+
+        ax.set_xticks(pmf["x"])
+        ax.set_xlabel("Number of Events")
+        ax.set_ylabel("Probability")
+        ax.set_title("Poisson Distribution")
+        ax.legend(fontsize="small")
+
+    show_figure(draw_poisson, poisson_pmf(lam), figsize=(7, 3), width="content")
 
 # ==========================================
 # Multinomial Distribution
@@ -1028,6 +904,7 @@ elif dist_type == "Multinomial Distribution (多項分布)":
     ''')
 
     st.markdown("---")
+    profiler.start("2 Make a Plot")
     st.write("### 2️⃣ Make a Plot  |  作圖")
 
     # --- User input for number of trials and probabilities ---
@@ -1048,29 +925,27 @@ elif dist_type == "Multinomial Distribution (多項分布)":
     probs.append(1.0 - total)
 
     # --- Sampling from Multinomial ---
-    import numpy as np
-    from scipy.stats import multinomial
-
-    sample_counts = multinomial.rvs(n=n, p=probs, size=1)[0]
+    sample_counts, means = multinomial_sample(n, probs)
     categories = [f"Cat {i+1}" for i in range(k)]
 
-    # --- Plotting observed counts ---
-    fig, ax = plt.subplots(figsize=(7, 3))
-    bars = ax.bar(categories, sample_counts, color="plum", edgecolor="black")
+    def draw_multinomial(fig, categories, sample_counts):
+        # --- Plotting observed counts ---
+        ax = fig.subplots()
+        bars = ax.bar(categories, sample_counts, color="plum", edgecolor="black")
 
-    for bar, count in zip(bars, sample_counts):
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width() / 2.0, height + 0.5, str(count), ha='center', va='bottom')
+        for bar, count in zip(bars, sample_counts):
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width() / 2.0, height + 0.5, str(count), ha='center', va='bottom')
 
-    ax.set_ylim(0, max(sample_counts) + 5)
-    ax.set_xlabel("Categories")
-    ax.set_ylabel("Counts")
-    ax.set_title("Sample from Multinomial Distribution")
+        ax.set_ylim(0, max(sample_counts) + 5)
+        ax.set_xlabel("Categories")
+        ax.set_ylabel("Counts")
+        ax.set_title("Sample from Multinomial Distribution")
 
-    st.pyplot(fig, use_container_width=False)
+    # A fresh unseeded draw on every rerun, so the image is not kept in the figure cache
+    show_figure(draw_multinomial, categories, sample_counts, figsize=(7, 3), width="content", cache=False)
 
     # --- Mean and Variance (displayed in markdown) ---
-    means = [n * p for p in probs]
     st.markdown("#### 📌 Expected Values")
     for i, m in enumerate(means):
         st.markdown(f"- $\\mu_{{{i+1}}} = {m:.2f}$")
@@ -1081,4 +956,5 @@ elif dist_type == "Multinomial Distribution (多項分布)":
 # Footer
 st.markdown("---")
 st.write("stat2vis: Collection of Applications for Visualizing Statistics")
-st.write("GitHub: https://github.com/TeddYenn/stat2vis")
\ No newline at end of file
+st.write("GitHub: https://github.com/TeddYenn/stat2vis")
+profiler.finish()
@@ -1,9 +1,12 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import norm, t
 import time
+from stat2vis.clt import POPULATIONS, binned_kde, generate_population, iter_sample_means, normal_curve
+from stat2vis.graph import page_graph
+from stat2vis.jobs import start_job, wait_for
+from stat2vis.profiling import page_profiler
+from stat2vis.render import show_figure
+from stat2vis.sections import debounce, page_section
 
 # --- Set up the Streamlit page layout and metadata ---
 st.set_page_config(
@@ -16,6 +19,8 @@ st.set_page_config(
         'Get Help': 'https://github.com/TeddYenn/stat2vis',
         'Report a bug': "https://github.com/TeddYenn/stat2vis/issues"
     })
+profiler = page_profiler("Ch4 CLT")
+graph = page_graph()
 
 # --- App header and introduction ---
 st.title("Ch. 4: Central Limit Theorem (CLT)  |  中央極限定理")
@@ -34,6 +39,7 @@ distribution_options = {
 
 st.write("")
 st.write("")
+profiler.start("1 Parameters")
 st.write("### 1️⃣ Parameters  |  參數設定")
 col1, col2 = st.columns(2)
 with col1:
@@ -41,122 +47,133 @@ with col1:
     dist_type = distribution_options[dist_label]
     sample_size = st.slider("Sample size (n) (樣本大小)", 2, 200, 30, 1)
     num_samples = st.slider("Number of samples (抽樣次數)", 10, 1000, 500, 10)
+    debounce("clt_parameters", sample_size, num_samples)
 
 st.markdown("---")
 
-# --- Generate Population Function ---
-def generate_population(dist_type, size=100000):
-    np.random.seed(42)
-    if dist_type == "Normal Dist.":
-        return np.random.normal(loc=0, scale=1, size=size)
-    elif dist_type == "Exponential Dist.":
-        return np.random.exponential(scale=1, size=size)
-    elif dist_type == "Uniform Dist.":
-        return np.random.uniform(low=-2, high=2, size=size)
-    
 # --- Generate Population ---
-population = generate_population(dist_type)
-
-st.write("### 2️⃣ Distributions  |  分布")
-
-col1, col2 = st.columns(2)
-with col1:
-    st.subheader("Population Distribution | 母體分布")
-with col2:
-    st.subheader("Distribution of Sample Means | 樣本平均值分布")
-    run_animation = st.button("▶️ Animate Sampling")
-    show_final = st.button("⏩ Show Final Distribution")
-
-col1, col2 = st.columns(2)
-
-# --- Plot 1: Population Distribution ---
-with col1:
-    fig_pop, ax_pop = plt.subplots()
-    sns.histplot(population, bins=50, kde=True, ax=ax_pop)
-    ax_pop.set_title("Population Distribution")
-    ax_pop.set_xlabel("Mean")
-    ax_pop.set_ylabel("Count")
-    st.pyplot(fig_pop)
-
-    if dist_type == "Normal Dist.":
-        pop_mean = 0
-        pop_std = 1
-    elif dist_type == "Exponential Dist.":
-        pop_mean = 1
-        pop_std = 1
-    elif dist_type == "Uniform Dist.":
-        pop_mean = 0
-        pop_std = np.sqrt((2 - (-2))**2 / 12)
-
-    st.markdown(f"""
-    **Summary of Population Dist.**  
-    - Mean (μ): `{pop_mean:.4f}`  
-    - Standard Deviation (σ): `{pop_std:.4f}`  
-    """)
-
-# --- Plot 2: Sampling Distribution ---
-
-with col2:
-
-    sample_means = []
-    placeholder = st.empty()
-
-    mu = np.mean(population)
-    sigma = np.std(population)
-    theoretical_std = sigma / np.sqrt(sample_size)
-
-    if run_animation:
-        for i in range(num_samples):
-            sample = np.random.choice(population, size=sample_size, replace=False)
-            sample_means.append(np.mean(sample))
-
-            x = np.linspace(min(sample_means), max(sample_means), 200)
-            y = norm.pdf(x, loc=mu, scale=theoretical_std)
-
-            with placeholder.container():
-                fig2, ax2 = plt.subplots()
-                sns.histplot(sample_means, bins=30, kde=False, color='orange', stat='density', ax=ax2)
-                ax2.plot(x, y, color='blue', linestyle='--', label=f"Theoretical Normal (μ={mu:.2f}, σ/√n={theoretical_std:.2f})")
-                ax2.legend()
-                ax2.set_title(f"Sampling Distribution (1~{i+1} samples)")
-                ax2.set_xlabel("Sample Mean")
-                ax2.set_ylabel("Density")
-                st.pyplot(fig2)
-
-            time.sleep(0.01)
-
-    elif show_final:
-        for i in range(num_samples):
-            sample = np.random.choice(population, size=sample_size, replace=False)
-            sample_means.append(np.mean(sample))
-
-        x = np.linspace(min(sample_means), max(sample_means), 200)
-        y = norm.pdf(x, loc=mu, scale=theoretical_std)
-
-        with placeholder.container():
-            fig2, ax2 = plt.subplots()
-            sns.histplot(sample_means, bins=30, kde=False, color='orange', stat='density', ax=ax2)
-            ax2.plot(x, y, color='blue', linestyle='--', label=f"Theoretical Normal Dist.")
-            ax2.legend()
-            ax2.set_title(f"Sampling Distribution ({num_samples} samples)")
-            ax2.set_xlabel("Sample Mean")
-            ax2.set_ylabel("Density")
-            st.pyplot(fig2)
-
-    mean_of_sample_means = np.mean(sample_means)
-    std_of_sample_means = np.std(sample_means)
-
-    st.markdown(f"""
-    **Summary of Sample Means Dist.**  
-    - Mean: `{mean_of_sample_means:.4f}`  
-    - Standard deviation: `{std_of_sample_means:.4f}`  
-    ---
-    **Summary of Theoretical Normal Dist.**
-    - Mean(μ): `{pop_mean:.4f}`  
-    - Standard deviation (σ/√n): `{theoretical_std:.4f}`  
-    """)
+# Populations and sample means use fixed seeds, so they are computed once for all sessions
+def population_moments(population):
+    return np.mean(population), np.std(population)
+
+def sample_means_job(dist_type, sample_size, num_samples):
+    # Drawn in the background; changing a parameter cancels the draw for the old one
+    return start_job("clt_sample_means", (dist_type, sample_size, num_samples), iter_sample_means, dist_type, sample_size, num_samples)
+
+graph.source("ch4/distribution", dist_type)
+population = graph.node("ch4/population", generate_population, "ch4/distribution", shared=True)
+# The moments are a node too, so the section's button reruns do not scan the population again
+graph.define("ch4/moments", population_moments, "ch4/population")
+
+# The buttons rerun only this section, with the parameters above
+@page_section(profiler, "2 Distributions")
+def distributions(dist_type, sample_size, num_samples, population):
+    st.write("### 2️⃣ Distributions  |  分布")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Population Distribution | 母體分布")
+    with col2:
+        st.subheader("Distribution of Sample Means | 樣本平均值分布")
+        run_animation = st.button("▶️ Animate Sampling")
+        show_final = st.button("⏩ Show Final Distribution")
+
+    col1, col2 = st.columns(2)
+
+    # --- Plot functions ---
+    def draw_population(fig, population):
+        ax_pop = fig.subplots()
+        counts, edges, _ = ax_pop.hist(population, bins=50, color='#1f77b4', alpha=0.6, edgecolor='white')
+        # KDE on the count scale (same as a histogram with kde=True)
+        x, density = binned_kde(population)
+        ax_pop.plot(x, density * len(population) * (edges[1] - edges[0]), color='#1f77b4')
+        ax_pop.set_title("Population Distribution")
+        ax_pop.set_xlabel("Mean")
+        ax_pop.set_ylabel("Count")
+
+    def draw_sample_means(fig, sample_means, mu, theoretical_std, title, label):
+        x, y = normal_curve(min(sample_means), max(sample_means), mu, theoretical_std)
+
+        ax2 = fig.subplots()
+        ax2.hist(sample_means, bins=30, density=True, color='orange', alpha=0.6, edgecolor='white')
+        ax2.plot(x, y, color='blue', linestyle='--', label=label)
+        ax2.legend()
+        ax2.set_title(title)
+        ax2.set_xlabel("Sample Mean")
+        ax2.set_ylabel("Density")
+
+    # --- Plot 1: Population Distribution ---
+    with col1:
+        show_figure(draw_population, population, figsize=(6.4, 4.8))
+
+        pop_mean, pop_std = POPULATIONS[dist_type]
+
+        st.markdown(f"""
+        **Summary of Population Dist.**  
+        - Mean (μ): `{pop_mean:.4f}`  
+        - Standard Deviation (σ): `{pop_std:.4f}`  
+        """)
+
+    # --- Plot 2: Sampling Distribution ---
+
+    with col2:
+
+        sample_means = []
+        placeholder = st.empty()
+
+        mu, sigma = graph["ch4/moments"]
+        theoretical_std = sigma / np.sqrt(sample_size)
+
+        if run_animation:
+            sample_means = wait_for(sample_means_job(dist_type, sample_size, num_samples))
+            for i in range(num_samples):
+                # Animation frames are never repeated, so they are rendered on pooled figures without caching
+                show_figure(
+                    draw_sample_means, sample_means[:i + 1], mu, theoretical_std,
+                    f"Sampling Distribution (1~{i+1} samples)",
+                    f"Theoretical Normal (μ={mu:.2f}, σ/√n={theoretical_std:.2f})",
+                    figsize=(6.4, 4.8), cache=False, container=placeholder
+                )
+
+                time.sleep(0.01)
+
+        elif show_final:
+            # The histogram fills in while the samples are drawn
+            sample_means = wait_for(
+                sample_means_job(dist_type, sample_size, num_samples),
+                lambda partial: show_figure(
+                    draw_sample_means, partial, mu, theoretical_std,
+                    f"Sampling Distribution (1~{len(partial)} samples)",
+                    "Theoretical Normal Dist.",
+                    figsize=(6.4, 4.8), cache=False
+                ),
+                placeholder=placeholder,
+            )
+            show_figure(
+                draw_sample_means, sample_means, mu, theoretical_std,
+                f"Sampling Distribution ({num_samples} samples)",
+                "Theoretical Normal Dist.",
+                figsize=(6.4, 4.8), container=placeholder
+            )
+
+        mean_of_sample_means = np.mean(sample_means)
+        std_of_sample_means = np.std(sample_means)
+
+        st.markdown(f"""
+        **Summary of Sample Means Dist.**  
+        - Mean: `{mean_of_sample_means:.4f}`  
+        - Standard deviation: `{std_of_sample_means:.4f}`  
+        ---
+        **Summary of Theoretical Normal Dist.**
+        - Mean(μ): `{pop_mean:.4f}`  
+        - Standard deviation (σ/√n): `{theoretical_std:.4f}`  
+        """)
+
+distributions(dist_type, sample_size, num_samples, population)
 
 # Footer
 st.markdown("---")
 st.write("stat2vis: Collection of Applications for Visualizing Statistics")
-st.write("GitHub: https://github.com/TeddYenn/stat2vis")
\ No newline at end of file
+st.write("GitHub: https://github.com/TeddYenn/stat2vis")
+graph.view()
+profiler.finish()
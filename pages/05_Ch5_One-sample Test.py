@@ -1,7 +1,16 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import norm, t
+from stat2vis.coverage import coverage_intervals, shade_intervals, simulate_sample_stats
+from stat2vis.figures import compact, vline
+from stat2vis.graph import page_graph
+from stat2vis.inference import one_sample_curves, one_sample_test
+from stat2vis.lazy import lazy_import
+from stat2vis.profiling import page_profiler
+from stat2vis.render import show_figure
+from stat2vis.sections import debounce, page_section
+
+# Plotly is imported on first use, when the sampling-distribution chart is drawn
+go = lazy_import("plotly.graph_objects")
 
 # --- Set up the Streamlit page layout and metadata ---
 st.set_page_config(
@@ -14,6 +23,8 @@ st.set_page_config(
         'Get Help': 'https://github.com/TeddYenn/stat2vis',
         'Report a bug': "https://github.com/TeddYenn/stat2vis/issues"
     })
+profiler = page_profiler("Ch5 One-sample Test")
+graph = page_graph()
 
 # --- App header and introduction ---
 st.title("Ch. 5: One-sample Test  |  單一樣本檢定")
@@ -25,6 +36,7 @@ st.write("This chapter illustrates the connection between confidence intervals a
 st.write("本章節展示在母體標準差已知或未知下，如何透過 Z 或 t 分布進行信賴區間推論與假設檢定，並視覺化其關聯性。")
 
 # --- Parameters input ---
+profiler.start("1 Parameter Settings")
 st.write("### 1️⃣ Parameter Settings | 參數設定")
 
 col1, col2, col3 = st.columns(3)
@@ -61,26 +73,29 @@ with col3:
     mu_0 = st.number_input("Null Hypothesis Mean (μ₀)", value=100.0, step=0.1, format="%0.1f")
     alpha = st.select_slider("Significance Level (α)", options=[0.10, 0.05, 0.01], value=0.05)
 
+# A burst of clicks on the number inputs' +/- only redraws for the last value
+debounce("ch5_parameters", sample_mean, sigma, sample_size, mu_0)
+
 # --- Calculations ---
-se = sigma / np.sqrt(sample_size)
-df = sample_size - 1
+# Nodes of the session's computation graph: the curves follow the sample and the CI bounds, the test also α
+def test_node(sample, alpha):
+    sample_mean, sigma, sample_size, mu_0, use_z = sample
+    return one_sample_test(sample_mean, sigma, sample_size, mu_0, alpha, sigma_known=use_z)
+
+def curves_node(sample, test):
+    return one_sample_curves(sample[0], test["se"], test["ci_low"], test["ci_high"])
+
+graph.source("ch5/sample", (sample_mean, sigma, sample_size, mu_0, use_z))
+graph.source("ch5/alpha", alpha)
+test = graph.node("ch5/test", test_node, "ch5/sample", "ch5/alpha")
+se, df = test["se"], test["df"]
+test_stat, p_value = test["statistic"], test["p_value"]
+ci_low, ci_high = test["ci_low"], test["ci_high"]
+reject_null = test["reject"]
 confidence = 1 - alpha
-tail_type = "Two-tailed"
-
-if use_z == True:
-    critical = norm.ppf(1 - alpha/2)
-    test_stat = (sample_mean - mu_0) / se
-    p_value = 2 * (1 - norm.cdf(abs(test_stat)))
-else:
-    critical = t.ppf(1 - alpha/2, df=df)
-    test_stat = (sample_mean - mu_0) / se
-    p_value = 2 * (1 - t.cdf(abs(test_stat), df=df))
-
-ci_low = sample_mean - critical * se
-ci_high = sample_mean + critical * se
-reject_null = (mu_0 < ci_low) or (mu_0 > ci_high)
 
 # --- CI plot ---
+profiler.start("2 Sampling Distribution")
 st.write("### 2️⃣ Sampling Distribution | 取樣分布")
 st.markdown(f"""
 - **Null Hypothesis (H₀)**: μ = μ₀ = {mu_0}  
@@ -90,22 +105,25 @@ st.markdown(f"""
   **對立假設**：母體平均數不等於 {mu_0}（雙尾檢定）
 """)
 
-fig, ax = plt.subplots(figsize=(10, 2.5))
-x = np.linspace(sample_mean - 4 * se, sample_mean + 4 * se, 500)
-y = norm.pdf(x, loc=sample_mean, scale=se)
-
-ax.plot(x, y, label='Sampling distribution of x̄')
-ax.axvline(ci_low, color='green', linestyle=':', label='Lower CI bound')
-ax.axvline(ci_high, color='green', linestyle=':', label='Upper CI bound')
-ax.axvline(sample_mean, color='black', linestyle='-', label='Sample Mean')
-ax.axvline(mu_0, color='red', linestyle='--', label='Null Mean (μ₀)')
-
-ax.fill_between(x, 0, y, where=(x < ci_low) | (x > ci_high), color='orange', alpha=0.3, label='Rejection Region')
-ax.legend()
-st.pyplot(fig)
+curves = graph.node("ch5/curves", curves_node, "ch5/sample", "ch5/test")
+
+# --- Sampling distribution with the rejection regions, CI bounds and markers ---
+fig = go.Figure()
+fig.add_trace(go.Scatter(x=compact(curves["x"]), y=compact(curves["y"]), name="Sampling distribution of x̄",
+                         mode="lines", line=dict(color="#1f77b4")))
+fig.add_trace(go.Scatter(x=compact(curves["x_left"]), y=compact(curves["y_left"]), name="Rejection Region", legendgroup="reject",
+                         mode="lines", fill="tozeroy", fillcolor="rgba(255, 165, 0, 0.3)", line=dict(width=0)))
+fig.add_trace(go.Scatter(x=compact(curves["x_right"]), y=compact(curves["y_right"]), name="Rejection Region", legendgroup="reject",
+                         showlegend=False, mode="lines", fill="tozeroy", fillcolor="rgba(255, 165, 0, 0.3)", line=dict(width=0)))
+for x, name, color, dash in [(ci_low, "Lower CI bound", "green", "dot"), (ci_high, "Upper CI bound", "green", "dot"),
+                             (sample_mean, "Sample Mean", "black", "solid"), (mu_0, "Null Mean (μ₀)", "red", "dash")]:
+    vline(fig, x, name=name, showlegend=True, line=dict(color=color, dash=dash, width=1.5))
+fig.update_layout(height=300, margin=dict(l=20, r=20, t=20, b=20), yaxis=dict(rangemode="tozero"))
+st.plotly_chart(fig, key="ch5_sampling")
 
 # --- Output Summary ---
 st.write("")
+profiler.start("3 Conclusion Summary")
 st.write("### 3️⃣ Conclusion Summary | 結論摘要")
 
 st.markdown("#### 🔸 Confidence Interval")
@@ -151,13 +169,86 @@ There is **not enough statistical evidence** to support the alternative hypothes
 目前沒有足夠的統計證據支持 H₁。
 """)
 
+# ==========================================
+# 4️⃣ Coverage Simulation
+# ==========================================
+st.write("")
 
-
-
-
-
+# Reruns on its own when its widgets change, with the parameters of section 1
+@page_section(profiler, "4 Coverage Simulation")
+def coverage_simulation(mu_0, sigma, sample_size, alpha, confidence, use_z):
+    st.write("### 4️⃣ Coverage Simulation | 信賴區間涵蓋率模擬")
+    st.write("A 95% confidence level does not mean a single interval contains μ with probability 0.95. It means that if we repeated the sampling many times, about 95% of the intervals built this way would contain the true mean μ. Here we draw many samples at once from a population whose mean is μ₀ and compute every interval.")
+    st.write("95% 信心水準並非指單一區間有 95% 的機率包含 μ，而是指重複抽樣很多次時，約有 95% 的區間會包含真實平均數 μ。以下從平均數為 μ₀ 的母體一次抽取大量樣本，並計算每一個信賴區間。")
+
+    population_options = {
+        "Normal Dist. (常態分布)": "Normal",
+        "Exponential Dist. (指數分布; right-skewed)": "Exponential",
+        "Uniform Dist. (均勻分布)": "Uniform"
+    }
+
+    col1, col2 = st.columns(2)
+    with col1:
+        population_label = st.selectbox("Population (母體分布; mean = μ₀, SD = σ)", list(population_options.keys()))
+        population = population_options[population_label]
+        num_intervals = st.select_slider("Number of intervals (模擬次數)", options=[100, 200, 500, 1000, 2000, 5000, 10000], value=200)
+    with col2:
+        sim_size = st.slider("Sample size of each draw (n) (每次樣本大小)", 2, 300, sample_size, key="coverage_sample_size")
+        sim_seed = st.number_input("Random seed (隨機種子)", value=42, step=1)
+        debounce("coverage_parameters", sim_size, sim_seed)
+
+    # --- Draw all samples in one vectorized step (shared by all sessions, independent of α); α only recomputes the intervals ---
+    def intervals_node(sample_stats, draw, alpha):
+        population, mu, sigma, n, num_samples, seed = draw
+        return coverage_intervals(*sample_stats, mu, sigma, n, alpha)
+
+    graph.source("ch5/coverage_draw", (population, mu_0, sigma, sim_size, num_intervals, int(sim_seed)))
+    graph.define("ch5/sample_stats", lambda draw: simulate_sample_stats(*draw), "ch5/coverage_draw", shared=True)
+    intervals = graph.node("ch5/intervals", intervals_node, "ch5/sample_stats", "ch5/coverage_draw", "ch5/alpha")
+    variant = "Z" if use_z else "t"
+    sim_low, sim_high, sim_covered = intervals[variant]
+
+    def draw_coverage(fig, sim_low, sim_high, sim_covered, mu_0, title):
+        ax_cov = fig.subplots()
+        num_intervals = len(sim_low)
+        x_min, x_max = sim_low.min(), sim_high.max()
+        if num_intervals <= 1000:
+            idx = np.arange(num_intervals)
+            ax_cov.hlines(idx[sim_covered], sim_low[sim_covered], sim_high[sim_covered], color='green', alpha=0.6, linewidth=1, label='Contains μ')
+            ax_cov.hlines(idx[~sim_covered], sim_low[~sim_covered], sim_high[~sim_covered], color='red', linewidth=1.5, label='Misses μ')
+            ax_cov.set_ylim(-1, num_intervals)
+        else:
+            image = shade_intervals(sim_low, sim_high, sim_covered, x_min, x_max)
+            ax_cov.imshow(image, aspect='auto', origin='lower', interpolation='nearest', extent=(x_min, x_max, 0, num_intervals))
+            ax_cov.plot([], [], color='green', label='Contains μ')
+            ax_cov.plot([], [], color='red', label='Misses μ')
+        ax_cov.axvline(mu_0, color='black', linestyle='--', label='True Mean (μ = μ₀)')
+        ax_cov.set_xlabel("Interval")
+        ax_cov.set_ylabel("Simulation")
+        ax_cov.set_title(title)
+        ax_cov.legend(loc='upper right', fontsize="small")
+
+    show_figure(
+        draw_coverage, sim_low, sim_high, sim_covered, mu_0,
+        f"{num_intervals} {int(confidence*100)}% confidence intervals ({variant})",
+        figsize=(10, 4)
+    )
+
+    z_coverage = intervals["Z"][2].mean()
+    t_coverage = intervals["t"][2].mean()
+    st.markdown(f"""
+    **Empirical Coverage (實際涵蓋率)** — nominal level: `{confidence:.0%}`
+    - Z interval (σ known): `{z_coverage:.2%}` ({intervals["Z"][2].sum()} / {num_intervals})
+    - t interval (σ unknown): `{t_coverage:.2%}` ({intervals["t"][2].sum()} / {num_intervals})
+    - **Interpretation**: Each interval either contains μ or not; the long-run share that does is close to the confidence level. With a skewed population and small n, coverage can fall below the nominal level.  
+    - **解釋**：每個區間只有包含或不包含 μ 兩種結果；長期下包含 μ 的比例接近信心水準。若母體偏態且 n 較小，實際涵蓋率可能低於名目水準。
+    """)
+
+coverage_simulation(mu_0, sigma, sample_size, alpha, confidence, use_z)
 
 # Footer
 st.markdown("---")
 st.write("stat2vis: Collection of Applications for Visualizing Statistics")
-st.write("GitHub: https://github.com/TeddYenn/stat2vis")
\ No newline at end of file
+st.write("GitHub: https://github.com/TeddYenn/stat2vis")
+graph.view()
+profiler.finish()
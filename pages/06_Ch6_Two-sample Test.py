@@ -1,7 +1,18 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import t, norm
+from stat2vis.figures import compact, vline
+from stat2vis.graph import page_graph
+from stat2vis.inference import two_sample_curves, two_sample_test
+from stat2vis.lazy import lazy_import
+from stat2vis.profiling import page_profiler
+from stat2vis.render import show_figure
+from stat2vis.sections import debounce, page_section
+from stat2vis.sequential import (
+    STREAM_DIR, empty_group_stats, file_batch, first_rejection, sequential_step, simulated_batch, spending_boundaries, update_group_stats,
+)
+
+# Plotly is imported on first use, when the sampling-distribution chart is drawn
+go = lazy_import("plotly.graph_objects")
 
 # --- Set up the Streamlit page layout and metadata ---
 st.set_page_config(
@@ -14,6 +25,8 @@ st.set_page_config(
         'Get Help': 'https://github.com/TeddYenn/stat2vis',
         'Report a bug': "https://github.com/TeddYenn/stat2vis/issues"
     })
+profiler = page_profiler("Ch6 Two-sample Test")
+graph = page_graph()
 
 # --- App header and introduction ---
 st.title("Ch. 6: Two-sample Test  |  雙樣本檢定")
@@ -24,6 +37,7 @@ st.write("This chapter explains how to conduct statistical inference for compari
 st.write("本章節說明如何針對兩組母體平均數進行統計推論，並依據樣本的獨立性與變異數假設，選用合適的 t 檢定，展示信賴區間與假設檢定結果。")
 
 # --- Test type selection ---
+profiler.start("1 Select Test Type")
 st.write("### 1️⃣ Select Test Type | 檢定類型")
 
 col1, col2, col3 = st.columns(3)
@@ -73,6 +87,7 @@ with col3:
         """)
 
 # --- Parameter input ---
+profiler.start("2 Parameter Settings")
 st.write("### 2️⃣ Parameter Settings | 參數設定")
 
 col1, col2 = st.columns(2)
@@ -87,36 +102,37 @@ with col2:
     sd2 = st.number_input("Group 2 Std. Dev. (s₂)", value=15.0, step=0.1, format="%0.1f")
     n2 = st.slider("Group 2 Sample Size (n₂)", 5, 300, 30)
 
-# --- Mean difference and standard error ---
-mean_diff = mu1 - mu2
-
-if test_type == "Pooled t-test (equal variance)":
-    # Pooled standard deviation
-    sp_squared = ((n1 - 1) * sd1**2 + (n2 - 1) * sd2**2) / (n1 + n2 - 2)
-    se_diff = np.sqrt(sp_squared * (1/n1 + 1/n2))
-    df = n1 + n2 - 2
-elif test_type == "Welch's t-test (unequal variance)":
-    se_diff = np.sqrt((sd1**2 / n1) + (sd2**2 / n2))
-    df_num = (sd1**2 / n1 + sd2**2 / n2)**2
-    df_den = ((sd1**2 / n1)**2 / (n1 - 1)) + ((sd2**2 / n2)**2 / (n2 - 1))
-    df = df_num / df_den
-elif test_type == "Paired t-test":
+# --- Two-sample t test ---
+test_methods = {
+    "Pooled t-test (equal variance)": "pooled",
+    "Welch's t-test (unequal variance)": "welch",
+    "Paired t-test": "paired"
+}
+sd_diff = None
+if test_type == "Paired t-test":
     # Assume each group has the same sample size and std dev of differences is known
     sd_diff = st.number_input("Std Dev of Differences (σ_d)", value=10.0)
-    se_diff = sd_diff / np.sqrt(n1)
-    df = n1 - 1
 
-# --- t test ---
-test_stat = mean_diff / se_diff
-p_value = 2 * (1 - t.cdf(abs(test_stat), df))
-reject_null = p_value < alpha
+# A burst of clicks on the number inputs' +/- only redraws for the last value
+debounce("ch6_parameters", mu1, sd1, n1, mu2, sd2, n2, sd_diff)
 
-# --- Critical values ---
-t_crit = t.ppf(1 - alpha / 2, df)
-crit_left = 0 - t_crit * se_diff
-crit_right = 0 + t_crit * se_diff
+# Nodes of the session's computation graph: the test follows the groups and α, the curves only the test
+def test_node(groups, alpha):
+    mu1, sd1, n1, mu2, sd2, n2, method, sd_diff = groups
+    return two_sample_test(mu1, sd1, n1, mu2, sd2, n2, alpha, method, sd_diff)
+
+def curves_node(test):
+    return two_sample_curves(test["diff"], test["se"], test["crit_left"], test["crit_right"])
+
+graph.source("ch6/groups", (mu1, sd1, n1, mu2, sd2, n2, test_methods[test_type], sd_diff))
+graph.source("ch6/alpha", alpha)
+test = graph.node("ch6/test", test_node, "ch6/groups", "ch6/alpha")
+mean_diff, se_diff, df = test["diff"], test["se"], test["df"]
+test_stat, p_value, reject_null = test["statistic"], test["p_value"], test["reject"]
+t_crit, crit_left, crit_right = test["critical"], test["crit_left"], test["crit_right"]
 
 # --- Plot distributions ---
+profiler.start("3 Sampling Distribution")
 st.write("### 3️⃣ Sampling Distribution | 取樣分布")
 st.markdown(f"""
 - **Null Hypothesis (H₀)**: μ₁ = μ₂  
@@ -126,50 +142,36 @@ st.markdown(f"""
   **對立假設**：兩群母體平均數不相等
 """)
 
-# Create x and y values
-x = np.linspace(mean_diff - 8 * se_diff, mean_diff + 8 * se_diff, 500)
-y_h0 = norm.pdf(x, loc=0, scale=se_diff)
-y_h1 = norm.pdf(x, loc=mean_diff, scale=se_diff)
-
-# Calculate Type II Error (β)
-beta = norm.cdf(crit_right, loc=mean_diff, scale=se_diff) - norm.cdf(crit_left, loc=mean_diff, scale=se_diff)
-power = 1 - beta
-
-# Create figure
-fig, ax = plt.subplots(figsize=(10, 2.5))
-ax.plot(x, y_h0, label="H₀ Distribution (mean diff = 0)", color="blue")
-ax.plot(x, y_h1, label=f"H₁ Distribution (mean diff = {mean_diff:.2f})", color="orange")
-
-# Critical regions
-ax.axvline(crit_left, linestyle='-', color="black", label=f"Critical t = ±{t_crit:.2f}")
-ax.axvline(crit_right, linestyle='-', color="black")
-
-# Fill α regions under H0
-x_alpha_left = x[x <= crit_left]
-x_alpha_right = x[x >= crit_right]
-ax.fill_between(x_alpha_left, norm.pdf(x_alpha_left, 0, se_diff), color='red', alpha=0.3, label=f"Type I Error (α = {alpha:.2f})")
-ax.fill_between(x_alpha_right, norm.pdf(x_alpha_right, 0, se_diff), color='red', alpha=0.3)
-
-# β region
-x_beta = x[(x > crit_left) & (x < crit_right)]
-ax.fill_between(x_beta, norm.pdf(x_beta, mean_diff, se_diff), color='skyblue', alpha=0.4, label=f"Type II Error (β ≈ {beta:.2f})")
-
-# CI boundaries
-ci_lower = mean_diff - t_crit * se_diff
-ci_upper = mean_diff + t_crit * se_diff
-ax.axvline(ci_lower, color='green', linestyle=':', label=f"CI Lower ≈ {ci_lower:.2f}")
-ax.axvline(ci_upper, color='green', linestyle=':', label=f"CI Upper ≈ {ci_upper:.2f}")
-
-# Sample observed t (converted back to value)
-sample_t = (mean_diff - 0) / se_diff  # observed t from sample
-sample_x = sample_t * se_diff         # transform back to raw score (same as mean_diff)
-ax.axvline(sample_x, color='red', linestyle='--', label=f"Sample Mean Diff = {sample_x:.2f}")
-
-ax.legend(fontsize="small")
-st.pyplot(fig)
+# Type II Error (β) and CI boundaries
+beta, power = test["beta"], test["power"]
+ci_lower, ci_upper = test["ci_low"], test["ci_high"]
+
+# H₀/H₁ curves with the α regions under H₀ and the β region under H₁
+curves = graph.node("ch6/curves", curves_node, "ch6/test")
+
+fig = go.Figure()
+fig.add_trace(go.Scatter(x=compact(curves["x"]), y=compact(curves["y_h0"]), name="H₀ Distribution (mean diff = 0)",
+                         mode="lines", line=dict(color="blue")))
+fig.add_trace(go.Scatter(x=compact(curves["x"]), y=compact(curves["y_h1"]), name=f"H₁ Distribution (mean diff = {mean_diff:.2f})",
+                         mode="lines", line=dict(color="orange")))
+fig.add_trace(go.Scatter(x=compact(curves["x_alpha_left"]), y=compact(curves["y_alpha_left"]), name=f"Type I Error (α = {alpha:.2f})",
+                         legendgroup="alpha", mode="lines", fill="tozeroy", fillcolor="rgba(255, 0, 0, 0.3)", line=dict(width=0)))
+fig.add_trace(go.Scatter(x=compact(curves["x_alpha_right"]), y=compact(curves["y_alpha_right"]), legendgroup="alpha", showlegend=False,
+                         mode="lines", fill="tozeroy", fillcolor="rgba(255, 0, 0, 0.3)", line=dict(width=0)))
+fig.add_trace(go.Scatter(x=compact(curves["x_beta"]), y=compact(curves["y_beta"]), name=f"Type II Error (β ≈ {beta:.2f})",
+                         mode="lines", fill="tozeroy", fillcolor="rgba(135, 206, 235, 0.4)", line=dict(width=0)))
+for x, name, group, color, dash in [(crit_left, f"Critical t = ±{t_crit:.2f}", "crit", "black", "solid"),
+                                    (crit_right, None, "crit", "black", "solid"),
+                                    (ci_lower, f"CI Lower ≈ {ci_lower:.2f}", "ci", "green", "dot"),
+                                    (ci_upper, f"CI Upper ≈ {ci_upper:.2f}", "ci", "green", "dot"),
+                                    (mean_diff, f"Sample Mean Diff = {mean_diff:.2f}", "sample", "red", "dash")]:
+    vline(fig, x, name=name, showlegend=name is not None, legendgroup=group, line=dict(color=color, dash=dash, width=1.5))
+fig.update_layout(height=300, margin=dict(l=20, r=20, t=20, b=20), yaxis=dict(rangemode="tozero"), legend=dict(font=dict(size=10)))
+st.plotly_chart(fig, key="ch6_sampling")
 
 # --- Output summary ---
 st.write("")
+profiler.start("3 Conclusion Summary")
 st.write("### 3️⃣ Conclusion Summary | 結論摘要")
 
 confidence = 1 - alpha
@@ -217,7 +219,150 @@ There is **not enough statistical evidence** to support the alternative hypothes
 目前沒有足夠的統計證據支持 H₁。
 """)
 
+# ==========================================
+# 4️⃣ Sequential A/B Testing
+# ==========================================
+st.write("")
+
+# Reruns on its own when its widgets change (batches, stream settings), with the parameters above
+@page_section(profiler, "4 Sequential A/B Testing")
+def sequential_testing(mu1, sd1, mu2, sd2, test_type, alpha):
+    st.write("### 4️⃣ Sequential A/B Testing | 序列 A/B 檢定")
+    st.write("In A/B testing, data keep arriving and we are tempted to look at the p-value after every batch. Repeatedly checking an ordinary p-value inflates the Type I error. Here each batch only updates the per-group sufficient statistics (n, mean, sum of squared deviations), and the test above is recomputed. Two sequential procedures keep the Type I error at α although the data are checked after every batch; choose one of them as the stopping rule, since stopping when *either* one rejects inflates the error again. The group-sequential boundary spends α over the planned maximum sample size (Lan-DeMets O'Brien-Fleming spending function), and the test ends at that size. The always-valid p-value (mixture SPRT) does not depend on a planned end, at the cost of power.")
+    st.write("在 A/B 測試中，資料會持續進入，我們常在每一批資料後查看 p 值；但重複查看一般的 p 值會使型一錯誤膨脹。此處每一批資料只更新各組的充分統計量（樣本數、平均數、離均差平方和），並重新計算上方選擇的檢定。以下兩種序列程序在每批資料後查看仍能將型一錯誤控制在 α；請選擇其中一種作為停止規則，若任一種拒絕就停止，型一錯誤會再度膨脹。群組序列邊界依預計最大樣本數花費 α（Lan-DeMets O'Brien-Fleming 花費函數），並在達到該樣本數時結束；隨時有效的 p 值（mixture SPRT）不依賴預定結束點，但檢定力較低。")
+
+    stream_sources = ["Simulated stream (模擬資料流)", "Local file tail (本機檔案)"]
+    stopping_rules = {
+        "Group-sequential boundary (O'Brien-Fleming α spending)": "boundary",
+        "Always-valid p-value (mSPRT)": "msprt",
+    }
+
+    stream_path = None
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        stream_source = st.radio("Data source:", stream_sources, key="ab_source")
+        if stream_source == stream_sources[0]:
+            st.caption("Batches are drawn from N(x̄₁, s₁) and N(x̄₂, s₂) using the parameters above.")
+        else:
+            # Only files in the stream directory can be read, never an arbitrary server path
+            stream_files = sorted(path.name for path in STREAM_DIR.glob("*.csv")) if STREAM_DIR.is_dir() else []
+            stream_path = st.selectbox("CSV file with `group,value` rows (group: 1/2 or A/B)", stream_files, key="ab_path")
+            st.caption(f"Files appended to in `{STREAM_DIR}` (資料流目錄).")
+    with col2:
+        batch_size = st.slider("Batch size per group (每批樣本數)", 1, 200, 20, key="ab_batch_size")
+        max_n = st.number_input("Planned max. sample size per group (預計最大樣本數)", value=1000, min_value=10, step=10, key="ab_max_n")
+    with col3:
+        tau = st.number_input("Mixture scale τ (mSPRT 混合尺度)", value=5.0, min_value=0.1, step=0.1, format="%0.1f", key="ab_tau")
+        stream_seed = st.number_input("Random seed (隨機種子)", value=42, step=1, key="ab_seed")
+        debounce("ab_parameters", batch_size, max_n, tau, stream_seed)
+    rule = stopping_rules[st.radio("Stopping rule (停止規則):", list(stopping_rules), horizontal=True, key="ab_rule")]
+
+    # --- Session state for the stream ---
+    def reset_stream():
+        st.session_state.ab_stats = [empty_group_stats(), empty_group_stats()]
+        st.session_state.ab_history = []
+        st.session_state.ab_offset = 0
+        st.session_state.ab_rng = np.random.default_rng(int(st.session_state.get("ab_seed", 42)))
+
+    # Looks taken under other settings belong to another test: the history restarts whenever one changes
+    simulated = stream_source == stream_sources[0]
+    config = (stream_source, stream_path, test_type, alpha, rule, max_n, tau,
+              (stream_seed, mu1, sd1, mu2, sd2) if simulated else None)
+    if "ab_stats" not in st.session_state or st.session_state.get("ab_config") != config:
+        if st.session_state.get("ab_history"):
+            st.caption("The test settings changed, so the stream was restarted. (檢定設定已變更，資料流已重設)")
+        reset_stream()
+        st.session_state.ab_config = config
+
+    def ingest_batches(num_batches):
+        g1, g2 = st.session_state.ab_stats
+        history = st.session_state.ab_history
+        for _ in range(num_batches):
+            if stopped(history):
+                break
+            if simulated:
+                values1, values2 = simulated_batch(st.session_state.ab_rng, mu1, sd1, mu2, sd2, batch_size)
+            elif stream_path is None:
+                break
+            else:
+                values1, values2, st.session_state.ab_offset = file_batch(stream_path, st.session_state.ab_offset)
+            if len(values1) == 0 and len(values2) == 0:
+                break
+            g1 = update_group_stats(g1, values1)
+            g2 = update_group_stats(g2, values2)
+            if g1["n"] < 2 or g2["n"] < 2:
+                continue
+            prev_p = history[-1]["p_always"] if history else 1.0
+            history.append(sequential_step(g1, g2, test_methods[test_type] == "pooled", tau, max_n, prev_p))
+        st.session_state.ab_stats = [g1, g2]
+
+    def stopped(history):
+        # The test ends at its first rejection, or at the planned maximum sample size
+        return bool(history) and (first_rejection(history, alpha, rule) is not None or history[-1]["info"] >= 1)
+
+    def draw_sequential(fig, steps, stats, boundaries, p_fixed, p_always, alpha):
+        ax_stat, ax_p = fig.subplots(1, 2)
+        ax_stat.plot(steps, stats, marker='.', color='blue', label="Test statistic (T)")
+        shown = np.isfinite(boundaries) & (boundaries < 10)  # the earliest looks spend almost nothing
+        ax_stat.plot(steps[shown], boundaries[shown], color='red', linestyle='--', marker='.', label="O'Brien-Fleming boundary")
+        ax_stat.plot(steps[shown], -boundaries[shown], color='red', linestyle='--', marker='.')
+        ax_stat.set_ylim(-max(6, np.abs(stats).max() * 1.1), max(6, np.abs(stats).max() * 1.1))
+        ax_stat.set_xlabel("Batch")
+        ax_stat.set_title("Test Statistic over Time")
+        ax_stat.legend(fontsize="small")
+
+        ax_p.plot(steps, p_fixed, color='grey', label="Fixed-n p-value")
+        ax_p.plot(steps, p_always, color='orange', label="Always-valid p-value (mSPRT)")
+        ax_p.axhline(alpha, color='red', linestyle=':', label=f"α = {alpha:.2f}")
+        ax_p.set_yscale('log')
+        ax_p.set_xlabel("Batch")
+        ax_p.set_title("p-value over Time")
+        ax_p.legend(fontsize="small")
+
+    finished = stopped(st.session_state.ab_history)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("➕ Ingest next batch (讀入下一批)", disabled=finished):
+            ingest_batches(1)
+    with col2:
+        if st.button("⏩ Ingest 10 batches (讀入 10 批)", disabled=finished):
+            ingest_batches(10)
+    with col3:
+        st.button("🔄 Reset stream (重設)", on_click=reset_stream)
+
+    history = st.session_state.ab_history
+    if not history:
+        st.info("No batch has been ingested yet. (尚未讀入資料)")
+    else:
+        steps = np.arange(1, len(history) + 1)
+        stats = np.array([h["stat"] for h in history])
+        boundaries = spending_boundaries(tuple(h["info"] for h in history), alpha)
+        p_fixed = np.array([h["p_fixed"] for h in history])
+        p_always = np.array([h["p_always"] for h in history])
+
+        show_figure(draw_sequential, steps, stats, boundaries, p_fixed, p_always, alpha, figsize=(12, 3))
+
+        last = history[-1]
+        rejected_at = first_rejection(history, alpha, rule)
+        st.markdown(f"""
+    - **Sample sizes**: n₁ = {last["n1"]}, n₂ = {last["n2"]} (information fraction {last["info"]:.0%} of n = {max_n})  
+    - **Mean Difference**: {last["diff"]:.2f}  
+    - **Test Statistic**: {last["stat"]:.2f} (df = {last["df"]:.1f}); boundary = ±{boundaries[-1]:.2f}  
+    - **Fixed-n p-value**: {last["p_fixed"]:.4f}  
+    - **Always-valid p-value**: {last["p_always"]:.4f}  
+    """)
+        if rejected_at is not None:
+            st.success(f"🔴 The sequential test rejected H₀ at batch {rejected_at + 1}: stop. (序列檢定已拒絕 H₀，停止收集資料)")
+        elif last["info"] >= 1:
+            st.info("⚪ The planned maximum sample size is reached without rejecting H₀: stop. (已達預計最大樣本數，未拒絕 H₀)")
+        else:
+            st.info("🟢 Keep collecting data. (繼續收集資料)")
+
+sequential_testing(mu1, sd1, mu2, sd2, test_type, alpha)
+
 # Footer
 st.markdown("---")
 st.write("stat2vis: Collection of Applications for Visualizing Statistics")
-st.write("GitHub: https://github.com/TeddYenn/stat2vis")
\ No newline at end of file
+st.write("GitHub: https://github.com/TeddYenn/stat2vis")
+graph.view()
+profiler.finish()
@@ -0,0 +1 @@
+"""Shared helpers for the stat2vis Streamlit pages."""
@@ -0,0 +1,395 @@
+"""Process-wide cache of computed artifacts, shared by every session.
+
+Most users of a class deployment look at the same demo data with the same
+default parameters, so populations, curves, simulations and rendered images
+are the same for all of them. ``ArtifactCache`` keeps such results once per
+process under a global memory budget (``STAT2VIS_CACHE_MB``, default 256):
+entries are evicted least recently used first when the budget is exceeded,
+and hits, misses and evictions are counted. When ``STAT2VIS_CACHE_DIR``
+names a directory, every entry is also pickled there and entries evicted
+from memory or computed by an earlier process are read back from disk. The
+directory is not pruned.
+
+``shared_cache`` memoizes a function in the process-wide cache, keyed by a
+fingerprint of the function's code and its arguments. Concurrent calls with
+the same arguments compute the result once. The fingerprint covers a
+function's code, the global names it uses, its defaults and the contents of
+its closure, and pandas objects by the hash of their values, index, columns
+and dtypes. Cached NumPy arrays are made read-only, since every session
+receives the same objects; pandas objects, Plotly figures and the lists,
+tuples and dicts holding them are copied on the way out instead. Objects
+other than arrays, frames, strings and containers count towards the budget
+by the length of their pickle. Disk entries are keyed with
+``bundle_version()`` too, so a changed source or library does not read
+stale pickles.
+
+A warm-start bundle built by ``python -m stat2vis.warmstart`` holds the
+entries of every page's default view. It is read when this module is
+imported, if one exists for the current ``bundle_version()``, and its
+entries are unpickled on first use.
+"""
+import functools
+import hashlib
+import importlib.metadata
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from types import CodeType
+
+import numpy as np
+import pandas as pd
+
+BUDGET_ENV = "STAT2VIS_CACHE_MB"
+DISK_ENV = "STAT2VIS_CACHE_DIR"
+DEFAULT_BUDGET_MB = 256
+WARM_START_ENV = "STAT2VIS_WARM_START"
+
+ROOT = Path(__file__).resolve().parent.parent
+WARM_START_DIR = ROOT / "warm_start"
+# Anything that changes a cached value or its key invalidates a bundle
+VERSION_SOURCES = ["Home.py", "demo_data.csv", "pages/*.py", "stat2vis/*.py"]
+VERSION_PACKAGES = ["numpy", "pandas", "scipy", "matplotlib", "plotly", "streamlit"]
+
+_MISSING = object()
+
+
+# --- Input fingerprinting ---
+_SCALARS = (str, bytes, int, float, complex, bool, type(None), np.generic)
+
+
+def _update_pandas(h, obj):
+    h.update(type(obj).__name__.encode())
+    h.update(repr(obj.shape).encode())
+    if isinstance(obj, pd.DataFrame):
+        _update(h, [str(dtype) for dtype in obj.dtypes])
+        _update(h, obj.columns)
+    elif isinstance(obj, pd.Series):
+        _update(h, [str(obj.dtype), obj.name])
+    if not isinstance(obj, pd.Index):
+        _update(h, obj.index)
+        obj = pd.Series(obj.values) if isinstance(obj, pd.Series) else obj
+    else:
+        h.update(str(obj.dtype).encode())
+        obj = obj.to_series(index=pd.RangeIndex(len(obj)))
+    try:
+        h.update(pd.util.hash_pandas_object(obj, index=False).to_numpy().tobytes())
+    except TypeError:  # unhashable cells (lists, dicts)
+        h.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _update(h, obj, seen=None):
+    if isinstance(obj, _SCALARS):
+        h.update(type(obj).__name__.encode())
+        h.update(repr(obj).encode())
+    elif isinstance(obj, np.ndarray):
+        h.update(b"nd")
+        h.update(str(obj.dtype).encode())
+        h.update(str(obj.shape).encode())
+        if obj.dtype.hasobject:
+            _update(h, obj.tolist(), seen)
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        _update_pandas(h, obj)
+    elif isinstance(obj, CodeType):
+        # Code objects are recreated on every script rerun; hash their content, not their identity
+        h.update(b"code")
+        h.update(obj.co_qualname.encode() if hasattr(obj, "co_qualname") else obj.co_name.encode())
+        h.update(obj.co_code)
+        _update(h, obj.co_names, seen)  # the globals and attributes it uses (np.mean vs np.median)
+        for const in obj.co_consts:
+            _update(h, const, seen)
+    elif callable(obj) and hasattr(obj, "__code__"):
+        seen = set() if seen is None else seen
+        if id(obj) in seen:  # a closure referring to itself
+            h.update(b"fn-again")
+            return
+        seen.add(id(obj))
+        h.update(b"fn")
+        h.update(obj.__module__.encode() if obj.__module__ else b"")
+        _update(h, obj.__code__, seen)
+        _update(h, obj.__defaults__, seen)
+        _update(h, obj.__kwdefaults__, seen)
+        for cell in obj.__closure__ or ():
+            try:
+                _update(h, cell.cell_contents, seen)
+            except ValueError:  # an empty cell
+                h.update(b"empty-cell")
+    elif isinstance(obj, dict):
+        h.update(b"dict")
+        for key in sorted(obj, key=repr):
+            _update(h, key, seen)
+            _update(h, obj[key], seen)
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"seq%d" % len(obj))
+        for item in obj:
+            _update(h, item, seen)
+    elif isinstance(obj, (set, frozenset)):
+        h.update(b"set")
+        for digest in sorted(fingerprint(item) for item in obj):
+            h.update(digest.encode())
+    else:
+        h.update(type(obj).__name__.encode())
+        try:
+            h.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            h.update(repr(obj).encode())
+
+
+def fingerprint(*parts):
+    """Return a stable hex digest of arbitrary inputs (arrays and functions included)."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update(h, part)
+    return h.hexdigest()
+
+
+# --- Sizes and sharing ---
+def nbytes(value):
+    """Approximate memory held by ``value``: arrays, frames, bytes and containers of them; other objects by their pickle."""
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, "memory_usage"):  # pandas objects
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(nbytes(k) + nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(nbytes(item) for item in value)
+    if isinstance(value, _SCALARS):
+        return sys.getsizeof(value)
+    # Other objects (e.g. a Plotly figure) hold most of their data out of getsizeof's sight
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def _freeze(value):
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+def _private(value):
+    """``value`` as handed to a caller: pandas objects, Plotly figures and the containers holding them are copies."""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        return value.copy()
+    if hasattr(value, "to_plotly_json"):
+        return type(value)(value)
+    if isinstance(value, dict):
+        return {key: _private(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_private(item) for item in value]
+    if isinstance(value, tuple) and not hasattr(value, "_fields"):
+        return tuple(_private(item) for item in value)
+    return value
+
+
+class ArtifactCache:
+    """Thread-safe LRU of computed values bounded by their total size, with an optional pickle directory."""
+
+    def __init__(self, max_bytes, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._items = OrderedDict()   # key -> (value, size)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._building = {}           # key -> lock held while the value is computed
+        self._bundle = {}             # key -> pickled value from the warm-start bundle
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    # --- Disk tier ---
+    def _path(self, key):
+        # Keyed by the code and library versions too: a pickle from other code is never read back
+        return self.disk_dir / f"{fingerprint(_disk_tag(), key)}.pkl"
+
+    def _load(self, key):
+        with self._lock:
+            pickled = self._bundle.pop(key, None)
+        if pickled is not None:
+            return pickle.loads(pickled)
+        if self.disk_dir is None:
+            return _MISSING
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return _MISSING
+
+    def _dump(self, key, value):
+        path = self._path(key)
+        if path.exists():
+            return
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)  # readers never see a partly written file
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            tmp.unlink(missing_ok=True)
+
+    # --- Memory tier ---
+    def _store(self, key, value):
+        size = nbytes(value)
+        with self._lock:
+            if key in self._items:
+                self._size -= self._items.pop(key)[1]
+            self._items[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes and len(self._items) > 1:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._size -= evicted
+                self.evictions += 1
+
+    def get(self, key, default=None):
+        """The value stored under ``key`` (from memory, else from disk), or ``default``."""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return _private(entry[0])
+        value = self._load(key)
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.disk_hits += 1
+        self._store(key, _freeze(value))
+        return _private(value)
+
+    def put(self, key, value):
+        self._store(key, _freeze(value))
+        if self.disk_dir is not None:
+            self._dump(key, value)
+
+    def get_or_compute(self, key, build):
+        """The value under ``key``, calling ``build()`` once for concurrent callers when it is missing."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            lock = self._building.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                with self._lock:  # computed by another caller while this one waited
+                    entry = self._items.get(key)
+                if entry is not None:
+                    return _private(entry[0])
+                value = build()
+                self.put(key, value)
+                return _private(value)
+        finally:
+            with self._lock:
+                self._building.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bundle.clear()
+            self._size = 0
+
+    # --- Warm-start bundle ---
+    def entries(self):
+        with self._lock:
+            return [(key, value) for key, (value, _) in self._items.items()]
+
+    def load_bundle(self, path):
+        """Add the entries of the bundle at ``path``; each is unpickled when first requested."""
+        with open(path, "rb") as f:
+            bundle = pickle.load(f)
+        with self._lock:
+            self._bundle.update(bundle["entries"])
+        return len(bundle["entries"])
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._items), "bytes": self._size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+cache = ArtifactCache(
+    max_bytes=int(float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MB)) * 2 ** 20),
+    disk_dir=os.environ.get(DISK_ENV) or None,
+)
+
+
+def bundle_version():
+    """Digest of the sources, demo data and library versions the cached values depend on."""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(sys.version.encode())
+    for package in VERSION_PACKAGES:
+        try:
+            h.update(f"{package}={importlib.metadata.version(package)}".encode())
+        except importlib.metadata.PackageNotFoundError:
+            h.update(f"{package}=none".encode())
+    for pattern in VERSION_SOURCES:
+        for path in sorted(ROOT.glob(pattern)):
+            h.update(str(path.relative_to(ROOT)).encode())
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _disk_tag():
+    return bundle_version()
+
+
+def bundle_path(directory=None, version=None):
+    directory = Path(directory or os.environ.get(WARM_START_ENV) or WARM_START_DIR)
+    return directory / f"bundle-{version or bundle_version()}.pkl"
+
+
+def _load_warm_start():
+    directory = Path(os.environ.get(WARM_START_ENV) or WARM_START_DIR)
+    if not any(directory.glob("bundle-*.pkl")):  # skip hashing the sources when no bundle was built
+        return
+    path = bundle_path(directory)
+    if path.exists():
+        try:
+            cache.load_bundle(path)
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+            pass  # an unreadable bundle only means a cold start
+
+
+_load_warm_start()
+
+
+def shared_cache(fn):
+    """Memoize ``fn`` in the process-wide cache; its arguments must determine its result."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return cache.get_or_compute(("fn", fingerprint(fn, args, kwargs)), lambda: fn(*args, **kwargs))
+
+    return wrapper
+
+
+def cache_summary():
+    """One line with the cache's size, budget, hit rate and evictions."""
+    s = cache.stats()
+    return (
+        f"{s['entries']} entries, {s['bytes'] / 2 ** 20:,.1f} of {s['max_bytes'] / 2 ** 20:,.0f} MB; "
+        f"hit rate {s['hit_rate']:.0%} ({s['hits']} memory + {s['disk_hits']} disk hits, {s['misses']} misses); "
+        f"{s['evictions']} evicted"
+    )
@@ -0,0 +1,113 @@
+"""Level columns derived from numeric columns by binning.
+
+A numeric column is cut into levels by one of three schemes: ``equal-width``
+(``bins`` bins of the same width between the minimum and the maximum),
+``quantile`` (``bins`` bins holding about as many rows each) or ``custom``
+(the given cut points). ``level_column`` finds the bin of every value with a
+single ``np.searchsorted`` over the sorted cut points and returns an ordered
+categorical labelled like the demo data's ``Price_Level`` (``< 5000``,
+``5000-10000``, ``> 10000``), so the levels keep their order everywhere.
+
+The definitions of the derived columns are kept on the session's
+``EditOverlay``, next to the cell edits, so every EDA page sees the same
+level columns and their cache keys follow edits of the source column;
+``binned_level`` computes them once for all the EDA pages.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+SCHEMES = {"equal-width": "Equal width (等寬)", "quantile": "Quantile (分位數)", "custom": "Custom edges (自訂切點)"}
+EDGE_DIGITS = 4   # significant digits of computed cut points, relative to the column's range
+
+
+def _round_edges(cuts, span):
+    if span <= 0:
+        return cuts
+    return np.round(cuts, int(EDGE_DIGITS - 1 - np.floor(np.log10(span))))
+
+
+def _number(value):
+    return np.format_float_positional(value, trim="-")
+
+
+def parse_edges(text):
+    """Cut points typed as ``"5000, 10000"``; raises ``ValueError`` for anything that is not a number."""
+    return tuple(sorted({float(part) for part in text.replace(";", ",").split(",") if part.strip()}))
+
+
+def cut_points(values, scheme, bins=4, edges=()):
+    """Sorted inner cut points of ``values`` (float array) for ``scheme``; the outer bins are open-ended."""
+    if scheme == "custom":
+        cuts = np.asarray(edges, dtype=float)
+    else:
+        finite = values[np.isfinite(values)]
+        if not finite.size:
+            return np.empty(0)
+        if scheme == "equal-width":
+            cuts = np.linspace(finite.min(), finite.max(), bins + 1)[1:-1]
+        elif scheme == "quantile":
+            cuts = np.quantile(finite, np.linspace(0, 1, bins + 1)[1:-1])
+        else:
+            raise ValueError(f"Unknown binning scheme {scheme!r}")
+        cuts = _round_edges(cuts, finite.max() - finite.min())
+    return np.unique(cuts[np.isfinite(cuts)])
+
+
+def bin_labels(cuts):
+    """Labels of the bins around ``cuts``: ``< a``, ``a-b``, ..., ``> z``."""
+    if not len(cuts):
+        return ["All"]
+    text = [_number(c) for c in cuts]
+    return [f"< {text[0]}"] + [f"{lo}-{hi}" for lo, hi in zip(text, text[1:])] + [f"> {text[-1]}"]
+
+
+def level_column(series, scheme, bins=4, edges=()):
+    """``series`` binned into an ordered categorical; a value on a cut point goes to the bin above it."""
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    cuts = cut_points(values, scheme, bins, edges)
+    codes = np.searchsorted(cuts, values, side="right")
+    codes[np.isnan(values)] = -1
+    return pd.Series(pd.Categorical.from_codes(codes, bin_labels(cuts), ordered=True), index=series.index, name=series.name)
+
+
+@st.cache_data(max_entries=20, show_spinner=False)
+def binned_level(_df, token, column, scheme, bins, edges):
+    """``level_column`` of ``_df[column]``, cached per column, binning and edits of that column (``token``)."""
+    return level_column(_df[column], scheme, bins, edges)
+
+
+def binning_panel(overlay, df, key="level_bins"):
+    """Controls to add level columns binned from the numeric columns of ``df`` to ``overlay``, or remove them."""
+    numeric = df.select_dtypes(include="number").columns.tolist()
+    with st.expander("➕ Derive level columns (衍生等級欄位)"):
+        with st.form(f"{key}_form", border=False):
+            col1, col2, col3 = st.columns([2, 2, 1])
+            with col1:
+                column = st.selectbox("Numeric column (數值欄位)", numeric, key=f"{key}_column")
+            with col2:
+                scheme = st.radio("Binning (分組方式)", list(SCHEMES), format_func=SCHEMES.get, horizontal=True, key=f"{key}_scheme")
+            with col3:
+                bins = st.number_input("Bins (組數)", 2, 20, 3, key=f"{key}_bins")
+            edges_text = st.text_input("Custom edges (自訂切點), e.g. 5000, 10000", key=f"{key}_edges")
+            name = st.text_input("New column name (新欄位名稱)", placeholder="<column>_Level", key=f"{key}_name")
+            submitted = st.form_submit_button("Add level column (新增等級欄位)", disabled=not numeric)
+
+        if submitted:
+            name = name.strip() or f"{column}_Level"
+            try:
+                edges = parse_edges(edges_text) if scheme == "custom" else ()
+            except ValueError:
+                edges = None
+            if edges is None or scheme == "custom" and not edges:
+                st.error("Custom edges must be numbers separated by commas. 自訂切點須為以逗號分隔的數字。")
+            elif name in overlay.base.columns:
+                st.error(f"'{name}' is already a column of the data. 欄位名稱已存在。")
+            else:
+                overlay.derived[name] = (column, scheme, bins if scheme != "custom" else 0, edges)
+
+        if overlay.derived:
+            st.caption("Level columns (等級欄位): " + "; ".join(
+                f"{name} ← {column} ({SCHEMES[scheme]})" for name, (column, scheme, _, _) in overlay.derived.items()
+            ))
+            st.button("Remove level columns (移除等級欄位)", key=f"{key}_remove", on_click=overlay.derived.clear)
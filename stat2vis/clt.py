@@ -0,0 +1,68 @@
+"""Populations, sample means and density estimates for the Central Limit Theorem page."""
+import numpy as np
+
+from stat2vis.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
+
+# Mean and SD of each population
+POPULATIONS = {
+    "Normal Dist.": (0.0, 1.0),
+    "Exponential Dist.": (1.0, 1.0),
+    "Uniform Dist.": (0.0, np.sqrt((2 - (-2)) ** 2 / 12)),
+}
+
+
+def generate_population(dist_type, size=100000, seed=42):
+    """A fixed draw from the population; also seeds NumPy's global generator, which the sampling uses."""
+    np.random.seed(seed)
+    return _draw(np.random, dist_type, size)
+
+
+def _draw(random, dist_type, size):
+    if dist_type == "Normal Dist.":
+        return random.normal(loc=0, scale=1, size=size)
+    elif dist_type == "Exponential Dist.":
+        return random.exponential(scale=1, size=size)
+    elif dist_type == "Uniform Dist.":
+        return random.uniform(low=-2, high=2, size=size)
+    raise ValueError(f"Unknown population: {dist_type}")
+
+
+def simulate_sample_means(population, sample_size, num_samples, random=np.random):
+    """Means of ``num_samples`` samples drawn without replacement."""
+    return np.array([np.mean(random.choice(population, size=sample_size, replace=False)) for _ in range(num_samples)])
+
+
+def iter_sample_means(dist_type, sample_size, num_samples, chunk=50, size=100000, seed=42):
+    """``simulate_sample_means`` on ``generate_population(dist_type)``, in chunks, for a background job.
+
+    Uses its own generator with the same seed, so the means equal those drawn
+    with NumPy's global generator while other threads may use that one.
+    Yields ``(fraction done, means so far)`` and returns all the means.
+    """
+    random = np.random.RandomState(seed)
+    population = _draw(random, dist_type, size)
+    means = np.empty(num_samples)
+    for start in range(0, num_samples, chunk):
+        stop = min(start + chunk, num_samples)
+        means[start:stop] = simulate_sample_means(population, sample_size, stop - start, random)
+        yield stop / num_samples, means[:stop].copy()
+    return means
+
+
+def binned_kde(data, grid_size=512):
+    """Gaussian KDE (Scott's bandwidth) on a fine histogram grid, smoothed by convolution."""
+    counts, edges = np.histogram(data, bins=grid_size)
+    step = edges[1] - edges[0]
+    bandwidth = np.std(data) * len(data) ** (-1 / 5)
+    offsets = np.arange(-4 * bandwidth, 4 * bandwidth + step, step)
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    density = np.convolve(counts, kernel / kernel.sum(), mode="same") / (len(data) * step)
+    return (edges[:-1] + edges[1:]) / 2, density
+
+
+def normal_curve(low, high, mu, se, points=200):
+    """The normal density the sample means approach, on [low, high]."""
+    x = np.linspace(low, high, points)
+    return x, stats.norm.pdf(x, loc=mu, scale=se)
@@ -0,0 +1,85 @@
+"""Contingency tables for two or three categorical variables.
+
+The full count cube is built in one pass: each variable is factorized to
+integer codes, the codes are combined into one flat index and counted with
+``np.bincount``. Per-level tables, margins, expected counts and chi-square
+statistics are then slices or reductions of that single cube, so a grouping
+variable with hundreds of levels still costs one scan of the data.
+"""
+import numpy as np
+import pandas as pd
+
+
+class ContingencyCube:
+    """Counts of every combination of levels of ``variables`` (rows, columns[, groups])."""
+
+    def __init__(self, counts, variables, levels):
+        self.counts = counts
+        self.variables = list(variables)
+        self.levels = list(levels)
+
+    @classmethod
+    def from_frame(cls, df, variables):
+        """Count ``df`` over ``variables``; rows with a missing value are skipped (as in ``pd.crosstab``)."""
+        codes, levels = [], []
+        for var in variables:
+            var_codes, uniques = pd.factorize(df[var], sort=True)
+            codes.append(var_codes)
+            levels.append(pd.Index(uniques, name=var))
+        codes = np.vstack(codes)
+        shape = tuple(len(index) for index in levels)
+
+        valid = (codes >= 0).all(axis=0)
+        flat = np.ravel_multi_index(codes[:, valid], shape) if shape else np.zeros(0, dtype=int)
+        counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+        return cls(counts, variables, levels)
+
+    # --- Slicing ---
+    def group_levels(self):
+        """Levels of the grouping (third) variable that occur in the data."""
+        if len(self.variables) < 3:
+            return []
+        totals = self.counts.sum(axis=(0, 1))
+        return [level for level, total in zip(self.levels[2], totals) if total > 0]
+
+    def _matrix(self, level=None):
+        if len(self.variables) < 3:
+            return self.counts
+        if level is None:
+            return self.counts.sum(axis=2)
+        return self.counts[:, :, self.levels[2].get_loc(level)]
+
+    def table(self, level=None, drop_empty=True):
+        """Row x column counts, for one level of the grouping variable or summed over all."""
+        matrix = self._matrix(level)
+        rows, cols = self.levels[0], self.levels[1]
+        if drop_empty:
+            keep_rows = matrix.sum(axis=1) > 0
+            keep_cols = matrix.sum(axis=0) > 0
+            matrix = matrix[keep_rows][:, keep_cols]
+            rows, cols = rows[keep_rows], cols[keep_cols]
+        return pd.DataFrame(matrix, index=rows, columns=cols)
+
+    # --- Statistics ---
+    def margins(self, level=None):
+        """Row totals, column totals and grand total of ``table(level)``."""
+        table = self.table(level)
+        return table.sum(axis=1), table.sum(axis=0), int(table.values.sum())
+
+    def expected(self, level=None):
+        """Expected counts under independence of rows and columns."""
+        row_totals, col_totals, total = self.margins(level)
+        values = np.outer(row_totals.values, col_totals.values) / total if total else np.zeros((len(row_totals), len(col_totals)))
+        return pd.DataFrame(values, index=row_totals.index, columns=col_totals.index)
+
+    def chi_square(self, level=None):
+        """Pearson chi-square test of independence for ``table(level)``."""
+        from scipy.stats import chi2
+
+        observed = self.table(level).values
+        expected = self.expected(level).values
+        dof = (observed.shape[0] - 1) * (observed.shape[1] - 1)
+        if dof <= 0:
+            return {"statistic": 0.0, "dof": 0, "p_value": float("nan")}
+        statistic = float(((observed - expected) ** 2 / expected).sum())
+        return {"statistic": statistic, "dof": dof, "p_value": float(chi2.sf(statistic, dof))}
@@ -0,0 +1,128 @@
+"""Correlation matrices computed once per dataset and served by slicing.
+
+The Pearson matrix for every numeric column (booleans count as 0 and 1)
+comes from a single product of the centered data matrix. With missing
+values the same products are taken
+over indicator masks, which gives pandas' pairwise-complete correlations and
+the pairwise observation counts in a handful of matrix multiplications.
+Spearman reuses per-column ranks, and Kendall's tau-b is computed per pair
+(on demand, then cached) with scipy's O(n log n) merge-sort algorithm.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("pearson", "spearman", "kendall")
+
+
+def numeric_columns(df):
+    """The numerical columns of ``dataset.column_types`` that have float values (numbers and booleans)."""
+    return df.select_dtypes(exclude=["object", "category"]).select_dtypes(include=["number", "bool"]).columns.tolist()
+
+
+def _pairwise_pearson(values):
+    """Pairwise-complete Pearson correlations and counts for the columns of ``values``."""
+    present = ~np.isnan(values)
+    if present.all():
+        centered = values - values.mean(axis=0)
+        cov = centered.T @ centered
+        scale = np.sqrt(np.diag(cov))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = cov / np.outer(scale, scale)
+        counts = np.full(cov.shape, len(values))
+        return np.clip(corr, -1, 1), counts
+
+    mask = present.astype(float)
+    filled = np.where(present, values, 0.0)
+    counts = mask.T @ mask                  # n_ij: rows where both i and j are present
+    sums = filled.T @ mask                  # sum of x_i over rows where j is present
+    squares = (filled ** 2).T @ mask        # sum of x_i² over rows where j is present
+    products = filled.T @ filled            # sum of x_i x_j over rows where both are present
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = products - sums * sums.T / counts
+        var_i = squares - sums ** 2 / counts
+        corr = cov / np.sqrt(var_i * var_i.T)
+    corr[counts < 2] = np.nan
+    return np.clip(corr, -1, 1), counts.astype(int)
+
+
+class CorrelationService:
+    """Correlation matrices of a frame's numeric columns, with any subset served by slicing."""
+
+    def __init__(self, df):
+        self.columns = numeric_columns(df)
+        self.values = df[self.columns].to_numpy(dtype=float, na_value=np.nan)
+        self._lock = threading.Lock()
+        self._matrices = {}
+        self._counts = None
+        self._ranks = {}
+        self._kendall = {}
+
+    # --- Per-column caches ---
+    def _rank(self, col):
+        if col not in self._ranks:
+            self._ranks[col] = pd.Series(self.values[:, self.columns.index(col)]).rank().to_numpy()
+        return self._ranks[col]
+
+    def _full_pearson(self):
+        if "pearson" not in self._matrices:
+            self._matrices["pearson"], self._counts = _pairwise_pearson(self.values)
+        return self._matrices["pearson"]
+
+    def _full_spearman(self):
+        if "spearman" not in self._matrices:
+            ranks = np.column_stack([self._rank(col) for col in self.columns]) if self.columns else self.values
+            corr, _ = _pairwise_pearson(ranks)
+            # Ranks must be taken within the pairwise-complete rows, so pairs with missing values are re-ranked
+            incomplete = np.isnan(self.values).any(axis=0)
+            for i in np.flatnonzero(incomplete):
+                for j in range(len(self.columns)):
+                    if j != i:
+                        corr[i, j] = corr[j, i] = self._pair_spearman(i, j)
+            self._matrices["spearman"] = corr
+        return self._matrices["spearman"]
+
+    def _pair_spearman(self, i, j):
+        both = ~np.isnan(self.values[:, i]) & ~np.isnan(self.values[:, j])
+        if both.sum() < 2:
+            return np.nan
+        x = pd.Series(self.values[both, i]).rank().to_numpy()
+        y = pd.Series(self.values[both, j]).rank().to_numpy()
+        return float(np.corrcoef(x, y)[0, 1])
+
+    def _pair_kendall(self, i, j):
+        key = (min(i, j), max(i, j))
+        if key not in self._kendall:
+            from scipy.stats import kendalltau
+
+            both = ~np.isnan(self.values[:, i]) & ~np.isnan(self.values[:, j])
+            tau = kendalltau(self.values[both, i], self.values[both, j]).statistic if both.sum() >= 2 else np.nan
+            self._kendall[key] = float(tau)
+        return self._kendall[key]
+
+    # --- Public API ---
+    def matrix(self, columns, method="pearson"):
+        """Correlation matrix of ``columns`` as a DataFrame."""
+        if method not in METHODS:
+            raise ValueError(f"Unknown correlation method: {method}")
+        idx = [self.columns.index(col) for col in columns]
+        with self._lock:
+            if method == "pearson":
+                values = self._full_pearson()[np.ix_(idx, idx)]
+            elif method == "spearman":
+                values = self._full_spearman()[np.ix_(idx, idx)]
+            else:
+                values = np.eye(len(idx))
+                for a in range(len(idx)):
+                    for b in range(a + 1, len(idx)):
+                        values[a, b] = values[b, a] = self._pair_kendall(idx[a], idx[b])
+        return pd.DataFrame(values, index=list(columns), columns=list(columns))
+
+    def pair_counts(self, columns):
+        """Number of rows where both columns are present, for every pair of ``columns``."""
+        idx = [self.columns.index(col) for col in columns]
+        with self._lock:
+            self._full_pearson()
+            counts = self._counts[np.ix_(idx, idx)]
+        return pd.DataFrame(counts, index=list(columns), columns=list(columns))
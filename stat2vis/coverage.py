@@ -0,0 +1,65 @@
+"""Repeated-sampling simulation of confidence-interval coverage.
+
+All samples are drawn in one vectorized step from a standardized population
+(mean 0, SD 1) rescaled to the chosen mean and SD. Z and t intervals are
+then computed for every sample at once, and large sets of intervals can be
+rasterized into an image (datashader-style) instead of drawn one by one.
+"""
+import numpy as np
+
+from stat2vis.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
+
+POPULATIONS = ("Normal", "Exponential", "Uniform")
+
+
+def simulate_sample_stats(population, mu, sigma, n, num_samples, seed):
+    """Mean and SD of ``num_samples`` samples of size ``n``."""
+    if population not in POPULATIONS:
+        raise ValueError(f"Unknown population: {population}")
+    rng = np.random.default_rng(seed)
+    if population == "Normal":
+        draws = rng.standard_normal((num_samples, n))
+    elif population == "Exponential":
+        draws = rng.standard_exponential((num_samples, n)) - 1.0
+    else:
+        draws = rng.uniform(-np.sqrt(3), np.sqrt(3), size=(num_samples, n))
+    draws = mu + sigma * draws
+    return draws.mean(axis=1), draws.std(axis=1, ddof=1)
+
+
+def coverage_intervals(means, sds, mu, sigma, n, alpha):
+    """Every Z and t interval as ``{"Z": (low, high, covered), "t": (...)}``."""
+    z_half = stats.norm.ppf(1 - alpha / 2) * sigma / np.sqrt(n)
+    t_half = stats.t.ppf(1 - alpha / 2, df=n - 1) * sds / np.sqrt(n)
+    z_low, z_high = means - z_half, means + z_half
+    t_low, t_high = means - t_half, means + t_half
+    return {
+        "Z": (z_low, z_high, (z_low <= mu) & (mu <= z_high)),
+        "t": (t_low, t_high, (t_low <= mu) & (mu <= t_high)),
+    }
+
+
+def shade_intervals(low, high, covered, x_min, x_max, width=600, height=300):
+    """RGB image of the intervals: green where they contain μ, red where they miss, darker where denser."""
+    rows = np.arange(len(low)) * height // len(low)
+    scale = (width - 1) / (x_max - x_min)
+    start = np.clip(((low - x_min) * scale).astype(int), 0, width - 1)
+    stop = np.clip(((high - x_min) * scale).astype(int), 0, width - 1) + 1
+
+    counts = {}
+    for label, mask in [("covered", covered), ("missed", ~covered)]:
+        # Difference array: +1 where a segment starts, -1 after it ends, then cumulative sum per row
+        diff = np.zeros((height, width + 1))
+        np.add.at(diff, (rows[mask], start[mask]), 1)
+        np.add.at(diff, (rows[mask], stop[mask]), -1)
+        counts[label] = np.cumsum(diff, axis=1)[:, :width]
+
+    # Blend green/red by the share of missing intervals, shade by log-scaled density
+    total = counts["covered"] + counts["missed"]
+    share_missed = np.divide(counts["missed"], total, out=np.zeros_like(total), where=total > 0)
+    color = (1 - share_missed)[..., None] * np.array([0.2, 0.6, 0.3]) + share_missed[..., None] * np.array([0.9, 0.2, 0.2])
+    density = np.log1p(total) / np.log1p(max(total.max(), 1))
+    image = 1 - density[..., None] * (1 - color)
+    return np.clip(image, 0, 1)
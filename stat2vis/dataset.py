@@ -0,0 +1,90 @@
+"""The dataset chosen in a session, shared by the EDA pages.
+
+``data_input`` draws the data selection (demo data or an uploaded file) and
+keeps the chosen data in ``st.session_state`` as a ``Dataset``: the typed
+frame and its column-type report. The values derived from it (column lists,
+summary table, ...) are nodes of the session's computation graph
+(``stat2vis.graph``), built once and reused by every page until the edits
+they depend on change. Switching pages therefore neither parses the file
+again nor recomputes those values, and an uploaded file stays selected
+although the next page's uploader starts empty.
+"""
+import pandas as pd
+import streamlit as st
+
+from stat2vis import artifacts
+from stat2vis.schema import compress, read_csv
+
+DEMO_SOURCE = "demo_data.csv"
+
+
+# --- Each file is read once per source, with compact column types (categories, downcast numbers) ---
+@st.cache_resource(max_entries=5, show_spinner=False)
+def load_table(_file, source, kind):
+    if kind == "csv":
+        return read_csv(_file)
+    return compress(pd.read_excel(_file))
+
+
+# --- The demo data is the same for every session, so it is kept in the shared artifact cache ---
+@artifacts.shared_cache
+def demo_table(path=DEMO_SOURCE):
+    return read_csv(path)
+
+
+def column_types(df):
+    """Categorical and numerical column names of ``df``."""
+    categorical = df.select_dtypes(include=["object", "category"]).columns.tolist()
+    numerical = df.select_dtypes(exclude=["object", "category"]).columns.tolist()
+    return categorical, numerical
+
+
+class Dataset:
+    def __init__(self, source, name, frame, report):
+        self.source = source    # cache key of the data: the demo file name or the upload's file id
+        self.name = name
+        self.frame = frame
+        self.report = report
+
+    @classmethod
+    def load(cls, file, source, name, kind):
+        frame, report = demo_table() if source == DEMO_SOURCE else load_table(file, source, kind)
+        return cls(source, name, frame, report)
+
+    @property
+    def is_demo(self):
+        return self.source == DEMO_SOURCE
+
+
+def _only(selected, other):
+    # Only one checkbox can be selected at a time
+    if st.session_state[selected]:
+        st.session_state[other] = False
+
+
+def data_input(key="dataset"):
+    """Draw the data selection and return the session's ``Dataset``, or None while no data is selected."""
+    # Widget state is dropped when its page is left; re-assigning keeps the selection across pages
+    for flag in ("use_demo_data", "upload_data"):
+        st.session_state[flag] = st.session_state.get(flag, False)
+    st.checkbox("Use demo data", key="use_demo_data", on_change=_only, args=("use_demo_data", "upload_data"))
+    st.checkbox("Upload your own data", key="upload_data", on_change=_only, args=("upload_data", "use_demo_data"))
+
+    dataset = st.session_state.get(key)
+    if st.session_state.use_demo_data:
+        if dataset is None or dataset.source != DEMO_SOURCE:
+            dataset = Dataset.load(DEMO_SOURCE, DEMO_SOURCE, DEMO_SOURCE, "csv")
+    elif st.session_state.upload_data:
+        uploaded_file = st.file_uploader("📂 Upload your data file (上傳您的數據)", type=["xlsx", "csv"])
+        if uploaded_file is not None:
+            if dataset is None or dataset.source != uploaded_file.file_id:
+                kind = "csv" if uploaded_file.type == "text/csv" else "excel"
+                dataset = Dataset.load(uploaded_file, uploaded_file.file_id, uploaded_file.name, kind)
+        elif dataset is not None and dataset.source != DEMO_SOURCE:
+            st.caption(f"📄 Using the uploaded file {dataset.name} (使用已上傳的檔案)")
+        else:
+            dataset = None
+    else:
+        dataset = None
+    st.session_state[key] = dataset
+    return dataset
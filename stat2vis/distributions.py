@@ -0,0 +1,135 @@
+"""Curves and summary values for the probability distributions of Ch. 3.
+
+Every function returns a plain dict: the plotting grid ``x`` with the
+density or probabilities ``y``, the ``mean`` and ``std``, and the ``lower``
+and ``upper`` ends of the shaded ~95% range with its ``x_fill``/``y_fill``
+curve. Values that are undefined for the given parameters are ``None``, so
+the page can explain why a reference line is missing.
+"""
+import numpy as np
+
+from stat2vis.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
+
+
+def _fill(pdf, lower, upper, points=300):
+    x_fill = np.linspace(lower, upper, points)
+    return x_fill, pdf(x_fill)
+
+
+def _continuous(x, pdf, mean, std, lower, upper):
+    curve = {"x": x, "y": pdf(x), "mean": mean, "std": std, "lower": lower, "upper": upper, "x_fill": None, "y_fill": None}
+    if lower is not None and upper is not None:
+        curve["x_fill"], curve["y_fill"] = _fill(pdf, lower, upper)
+    return curve
+
+
+def _discrete(x, y, mean, std, lower, upper):
+    return {"x": x, "y": y, "mean": mean, "std": std, "lower": lower, "upper": upper}
+
+
+# --- Continuous distributions ---
+def normal_curve(mean, std, fix_xlim=False, num_points=100, seed=42):
+    """Normal PDF with the central 95% range and ``num_points`` seeded sample points on the curve."""
+    x = np.linspace(-30, 30, 500) if fix_xlim else np.linspace(mean - 4 * std, mean + 4 * std, 500)
+    z = 1.96
+    curve = _continuous(x, lambda v: stats.norm.pdf(v, mean, std), mean, std, mean - z * std, mean + z * std)
+    points = np.random.default_rng(seed).normal(loc=mean, scale=std, size=num_points)
+    curve["points"], curve["points_y"] = points, stats.norm.pdf(points, mean, std)
+    return curve
+
+
+def uniform_curve(a, b):
+    x = np.linspace(a - (b - a) * 0.2, b + (b - a) * 0.2, 500)
+    curve = _continuous(x, lambda v: np.where((v >= a) & (v <= b), 1 / (b - a), 0), (a + b) / 2, np.sqrt((b - a) ** 2 / 12), None, None)
+    curve["density"] = 1 / (b - a)
+    return curve
+
+
+def exponential_curve(lam, x_max=20):
+    # mean + 2 SD approximately covers 95% of an exponential distribution
+    mean = std = 1 / lam
+    return _continuous(np.linspace(0, x_max, 500), lambda v: lam * np.exp(-lam * v), mean, std, 0, mean + 2 * std)
+
+
+def gamma_curve(alpha, beta):
+    mean = alpha / beta
+    std = np.sqrt(alpha) / beta
+    pdf = lambda v: stats.gamma.pdf(v, a=alpha, scale=1 / beta)
+    return _continuous(np.linspace(0, 5 * alpha / beta, 500), pdf, mean, std, mean - 2 * std, mean + 2 * std)
+
+
+def chi_square_curve(df):
+    mean = df
+    std = np.sqrt(2 * df)
+    return _continuous(np.linspace(0, df + 50, 500), lambda v: stats.chi2.pdf(v, df), mean, std, mean - 2 * std, mean + 2 * std)
+
+
+def t_curve(df, x_range=5):
+    """Student's t PDF; the SD (and so the ~95% range) is only defined for df > 2."""
+    std = np.sqrt(df / (df - 2)) if df > 2 else None
+    lower, upper = (-2 * std, 2 * std) if std is not None else (None, None)
+    return _continuous(np.linspace(-x_range, x_range, 500), lambda v: stats.t.pdf(v, df), 0, std, lower, upper)
+
+
+def f_curve(d1, d2):
+    """F PDF; the mean needs d2 > 2 and the SD d2 > 4."""
+    x_max = stats.f.ppf(0.995, d1, d2) if d2 > 2 else 10
+    mean = d2 / (d2 - 2) if d2 > 2 else None
+    std = np.sqrt((2 * d2 ** 2 * (d1 + d2 - 2)) / (d1 * (d2 - 2) ** 2 * (d2 - 4))) if d2 > 4 else None
+    lower, upper = (mean - 2 * std, mean + 2 * std) if mean is not None and std is not None else (None, None)
+    return _continuous(np.linspace(0.01, x_max, 500), lambda v: stats.f.pdf(v, d1, d2), mean, std, lower, upper)
+
+
+def beta_curve(alpha, beta):
+    """Beta PDF; the ~95% range is dropped when it leaves the [0, 1] domain."""
+    mean = alpha / (alpha + beta)
+    std = np.sqrt((alpha * beta) / ((alpha + beta) ** 2 * (alpha + beta + 1)))
+    lower, upper = mean - 2 * std, mean + 2 * std
+    if not (lower > 0 and upper < 1):
+        lower = upper = None
+    return _continuous(np.linspace(0, 1, 500), lambda v: stats.beta.pdf(v, alpha, beta), mean, std, lower, upper)
+
+
+# --- Discrete distributions ---
+def binomial_pmf(n, p):
+    x = np.arange(0, n + 1)
+    mean = n * p
+    std = np.sqrt(n * p * (1 - p))
+    return _discrete(x, stats.binom.pmf(x, n, p), mean, std, int(max(0, mean - 2 * std)), int(min(n, mean + 2 * std)))
+
+
+def hypergeometric_pmf(N, K, n):
+    x_min, x_max = max(0, n - (N - K)), min(n, K)
+    x = np.arange(x_min, x_max + 1)
+    mean = n * (K / N)
+    std = np.sqrt(n * (K / N) * ((N - K) / N) * ((N - n) / (N - 1)))
+    return _discrete(x, stats.hypergeom.pmf(x, N, K, n), mean, std, int(max(x_min, mean - 2 * std)), int(min(x_max, mean + 2 * std)))
+
+
+def geometric_pmf(p):
+    x = np.arange(1, int(stats.geom.ppf(0.995, p)) + 1)
+    mean = 1 / p
+    std = np.sqrt((1 - p) / (p ** 2))
+    return _discrete(x, stats.geom.pmf(x, p), mean, std, int(max(1, mean - 2 * std)), int(mean + 2 * std))
+
+
+def negative_binomial_pmf(r, p):
+    x = np.arange(0, int(stats.nbinom.ppf(0.995, r, p)) + 1)
+    mean = r * (1 - p) / p
+    std = np.sqrt(r * (1 - p) / p ** 2)
+    return _discrete(x, stats.nbinom.pmf(x, r, p), mean, std, int(max(0, mean - 2 * std)), int(mean + 2 * std))
+
+
+def poisson_pmf(lam):
+    x = np.arange(0, int(stats.poisson.ppf(0.995, lam)) + 1)
+    mean = lam
+    std = np.sqrt(lam)
+    return _discrete(x, stats.poisson.pmf(x, lam), mean, std, int(max(0, mean - 2 * std)), int(mean + 2 * std))
+
+
+def multinomial_sample(n, probs, seed=None):
+    """One draw of category counts and the expected count of each category."""
+    counts = stats.multinomial.rvs(n=n, p=probs, size=1, random_state=seed)[0]
+    return counts, [n * p for p in probs]
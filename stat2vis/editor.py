@@ -0,0 +1,194 @@
+"""Paged data editor whose edits are kept as a sparse overlay on the loaded frame.
+
+``st.data_editor(df)`` serializes the whole frame on every rerun, and its
+edits live only in the widget. Here the editor shows one page of rows at a
+time, so only that window is sent to the browser, and every edited cell is
+recorded as ``{column: {row position: value}}`` in an ``EditOverlay`` kept in
+the session. The edited view copies only the columns that have edits, and
+per-column versions give cache keys that change only for the columns an edit
+touched, so downstream statistics recompute only what the edit affects.
+"""
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from stat2vis.incremental import FrameStats
+
+PAGE_SIZES = [20, 50, 100, 500]
+
+
+class EditOverlay:
+    """Sparse cell edits on top of an unchanged ``base`` frame."""
+
+    def __init__(self, base, source):
+        self.base = base
+        self.source = source
+        self.edits = {}
+        self.versions = {}
+        self.version = 0
+        self.log = []       # every change as (row position, column, old value, new value)
+        self.derived = {}   # level columns binned from a source column, name -> (column, scheme, bins, edges); see stat2vis.binning
+        self.uid = uuid.uuid4().hex   # tells apart sessions that edited the same source the same number of times
+        self._view = None
+        self._stats = None
+        self._stats_lock = threading.Lock()
+
+    # --- Recording edits ---
+    def _coerce(self, col, value):
+        if value is None:
+            return np.nan
+        dtype = self.base[col].dtype
+        # Compact columns cannot hold every value (a new level, a wider integer, more digits); keep those as entered
+        if isinstance(dtype, pd.CategoricalDtype):
+            return value if value not in dtype.categories else dtype.categories[dtype.categories.get_loc(value)]
+        try:
+            coerced = pd.Series([value]).astype(dtype).iloc[0]
+        except (TypeError, ValueError, OverflowError):
+            return value
+        # Compared as Python numbers; NumPy would compare in the column's (narrower) type
+        exact = coerced.item() if isinstance(coerced, np.generic) else coerced
+        if isinstance(value, (int, float, np.number)) and not isinstance(value, bool) and exact != value:
+            return value
+        return coerced
+
+    def set(self, position, col, value):
+        """Record ``value`` for the cell at row ``position`` of ``col`` (dropped if it equals the original)."""
+        value = self._coerce(col, value)
+        original = self.base[col].iat[position]
+        column_edits = self.edits.setdefault(col, {})
+        previous = column_edits.get(position, original)
+        if pd.isna(original) and pd.isna(value) or original == value:
+            changed = column_edits.pop(position, None) is not None
+        else:
+            changed = previous != value
+            column_edits[position] = value
+        if not column_edits:
+            del self.edits[col]
+        if changed:
+            self.log.append((position, col, previous, value))
+            self.versions[col] = self.versions.get(col, 0) + 1
+            self.version += 1
+            self._view = None
+        return changed
+
+    def reset(self):
+        for col, column_edits in self.edits.items():
+            self.versions[col] = self.versions.get(col, 0) + 1
+            self.log.extend((position, col, value, self.base[col].iat[position]) for position, value in column_edits.items())
+        self.edits = {}
+        self.version += 1
+        self._view = None
+
+    @property
+    def n_edits(self):
+        return sum(len(column_edits) for column_edits in self.edits.values())
+
+    # --- Edited data ---
+    def _patched(self, col, rows=None):
+        series = self.base[col] if rows is None else self.base[col].iloc[rows]
+        column_edits = self.edits.get(col)
+        if not column_edits:
+            return series
+        offset = 0 if rows is None else rows.start
+        stop = len(self.base) if rows is None else rows.stop
+        positions = [p - offset for p in column_edits if offset <= p < stop]
+        if not positions:
+            return series
+        values = pd.Series([column_edits[p + offset] for p in positions])
+        # Upcast when an edit does not fit the column (e.g. a blank cell in an integer column)
+        dtype = pd.concat([series.iloc[:0], values]).dtype
+        series = series.astype(dtype, copy=True)
+        series.iloc[positions] = values.to_numpy()
+        return series
+
+    def window(self, start, stop):
+        """Rows ``start:stop`` of the edited frame; only this slice is patched."""
+        rows = slice(start, min(stop, len(self.base)))
+        return pd.DataFrame({col: self._patched(col, rows) for col in self.base.columns})
+
+    def view(self):
+        """The full edited frame; columns without edits are the base columns."""
+        if not self.edits:
+            return self.base
+        if self._view is None:
+            self._view = pd.DataFrame({col: self._patched(col) for col in self.base.columns})
+        return self._view
+
+    def stats(self):
+        """``FrameStats`` of the edited frame, brought up to date with the edits made since the last call.
+
+        May be called from a background job while the script thread records edits.
+        """
+        with self._stats_lock:
+            if self._stats is None:
+                self._stats = FrameStats(self.base)
+            return self._stats.sync(self)
+
+    def _column_key(self, col):
+        if col in self.derived:
+            column, *spec = self.derived[col]
+            return (col, *self._version_key(column), *spec)
+        return (col, *self._version_key(col))
+
+    def _version_key(self, col):
+        version = self.versions.get(col, 0)
+        return (version,) if not version else (self.uid, version)
+
+    def token(self, columns=None):
+        """Hashable cache key that changes only when ``columns`` (default: all) are edited.
+
+        A derived level column's key follows edits of its source column and its binning.
+        Edited columns are keyed by this overlay too, since other sessions edit them differently.
+        """
+        columns = self.base.columns if columns is None else columns
+        return (self.source, tuple(self._column_key(col) for col in columns))
+
+
+def edit_overlay(key, df, source):
+    """The session's overlay for ``key``, started afresh when the data source changes."""
+    overlay = st.session_state.get(key)
+    if overlay is None or overlay.source != source:
+        overlay = st.session_state[key] = EditOverlay(df, source)
+    return overlay
+
+
+def _record_edits(overlay, widget_key, start):
+    # Positions in the widget are relative to the page window
+    state = st.session_state.get(widget_key) or {}
+    for row, changes in state.get("edited_rows", {}).items():
+        for col, value in changes.items():
+            overlay.set(start + int(row), col, value)
+
+
+def paged_editor(df, key, source):
+    """Show ``df`` one page at a time in an editable table and return its ``EditOverlay``."""
+    overlay = edit_overlay(key, df, source)
+    n_rows = len(df)
+
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        page_size = st.selectbox("Rows per page (每頁列數)", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    n_pages = max(1, -(-n_rows // page_size))
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages  # Page size grew past the current page
+    with col2:
+        page = st.number_input("Page (頁數)", 1, n_pages, key=f"{key}_page")
+    start = (page - 1) * page_size
+    stop = min(start + page_size, n_rows)
+
+    # The widget key follows the overlay version, so after each recorded edit the
+    # table restarts from the patched window instead of replaying old widget state
+    widget_key = f"{key}_table_{page}_{page_size}_{overlay.version}"
+    st.data_editor(
+        overlay.window(start, stop),
+        key=widget_key,
+        on_change=_record_edits,
+        args=(overlay, widget_key, start),
+    )
+    with col3:
+        st.caption(f"Page {page} of {n_pages}: rows {start + 1:,}–{stop:,} of {n_rows:,}; {overlay.n_edits:,} edited cell(s) (已編輯儲存格)")
+        st.button("Reset edits (還原編輯)", key=f"{key}_reset", on_click=overlay.reset, disabled=not overlay.edits)
+    return overlay
@@ -0,0 +1,27 @@
+"""Small Plotly figures for the inference pages.
+
+``st.plotly_chart`` sends the complete figure spec on every rerun, so the
+payload is kept small rather than incremental: curves are rounded to the
+precision a chart can show (``compact``), and vertical markers are layout
+shapes (``vline``) instead of two-point traces. A figure is cheap to build,
+so pages build it fresh from the current values on each run; with a fixed
+``key`` the browser redraws the existing chart in place instead of mounting
+a new one.
+"""
+import numpy as np
+
+
+def compact(values, significant=5):
+    """Round an array to ``significant`` digits relative to its largest magnitude."""
+    values = np.asarray(values, dtype=float)
+    finite = values[np.isfinite(values)]
+    peak = np.abs(finite).max() if finite.size else 0.0
+    if peak == 0:
+        return values
+    decimals = int(significant - 1 - np.floor(np.log10(peak)))
+    return np.round(values, max(decimals, 0))
+
+
+def vline(fig, x, **props):
+    """Add a full-height vertical line at ``x`` as a layout shape."""
+    fig.add_shape(type="line", xref="x", yref="paper", x0=x, x1=x, y0=0, y1=1, **props)
@@ -0,0 +1,173 @@
+"""Dependency graph of the values a page computes.
+
+A page declares each computed value as a node with a function and the names
+of its inputs, ``graph.node("summary", build, "edits")``, and the widget
+values and data it starts from as sources, ``graph.source("bin_size",
+bin_size)``. A source has a key that tells when it changed (the value
+itself, or e.g. an edit token for a frame). A node keeps its value and the
+versions of the inputs it was computed from, and is computed again only when
+one of them changed, so a widget change recomputes only the nodes downstream
+of it. A node function must read nothing but its inputs; nodes are evaluated
+when read, so a node in a branch the page does not show is not computed.
+
+The graph is kept in the session and shared by all pages: a node of the same
+name is the same value on every page (the typed columns of the dataset, its
+summary), and page-specific nodes carry a page prefix (``eda1/kde``). With
+``shared``, a node whose inputs all have hashable keys is also kept in the
+process-wide artifact cache for every session, keyed by the keys of its
+inputs.
+
+``page_graph()`` starts the graph for a rerun, with a sidebar toggle for the
+debug view ``graph.view()``: which sources changed and which nodes were
+computed, taken from the shared cache or reused since the last full rerun.
+"""
+import time
+
+import streamlit as st
+
+from stat2vis import artifacts
+
+_SESSION_KEY = "_computation_graph"
+_VALUE = object()
+
+STATUS = {
+    "changed": "🔸 changed (已變更)",
+    "computed": "🔴 computed (重新計算)",
+    "shared": "🟡 shared cache (共用快取)",
+    "reused": "🟢 reused (沿用)",
+}
+
+
+def _same(a, b):
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):  # e.g. arrays, whose comparison is elementwise
+        return a is b
+
+
+def _hashable(key):
+    try:
+        hash(key)
+    except TypeError:
+        return False
+    return True
+
+
+class Source:
+    def __init__(self, key, value, version):
+        self.key = key
+        self.value = value
+        self.version = version
+
+
+class Node:
+    def __init__(self, fn, inputs, code, shared):
+        self.fn = fn
+        self.inputs = inputs
+        self.code = code        # fingerprint of the function's code; pages are recompiled on every rerun
+        self.shared = shared
+        self.value = None
+        self.stamp = None       # versions of the inputs the value was computed from
+        self.version = 0
+
+
+class Graph:
+    def __init__(self):
+        self._entries = {}    # name -> Source or Node
+        self._counter = 0
+        self.log = {}         # name -> (status, ms) since the last full rerun
+        self.show = False
+
+    def _next_version(self):
+        self._counter += 1
+        return self._counter
+
+    def begin(self):
+        self.log = {}
+
+    # --- Declaring the graph ---
+    def source(self, name, value, key=_VALUE):
+        """Set source ``name`` to ``value``; it counts as changed when ``key`` (default: the value) differs."""
+        key = value if key is _VALUE else key
+        entry = self._entries.get(name)
+        if not isinstance(entry, Source) or not _same(entry.key, key):
+            entry = self._entries[name] = Source(key, value, self._next_version())
+            self.log[name] = ("changed", 0.0)
+        entry.value = value
+        return value
+
+    def define(self, name, fn, *inputs, shared=False):
+        """Declare node ``name`` as ``fn`` applied to the values of ``inputs``."""
+        code = artifacts.fingerprint(fn)
+        entry = self._entries.get(name)
+        if isinstance(entry, Node) and entry.code == code and entry.inputs == inputs:
+            entry.fn, entry.shared = fn, shared
+        else:
+            self._entries[name] = Node(fn, inputs, code, shared)
+
+    def node(self, name, fn, *inputs, shared=False):
+        """Declare node ``name`` and return its value."""
+        self.define(name, fn, *inputs, shared=shared)
+        return self[name]
+
+    # --- Evaluation ---
+    def __getitem__(self, name):
+        entry = self._entries[name]
+        if isinstance(entry, Source):
+            return entry.value
+        values = [self[i] for i in entry.inputs]
+        stamp = tuple(self._entries[i].version for i in entry.inputs)
+        if stamp == entry.stamp:
+            self.log.setdefault(name, ("reused", 0.0))
+            return entry.value
+
+        start = time.perf_counter()
+        status = "shared"
+        key = self._key(name) if entry.shared else None
+        if key is None:
+            value, status = entry.fn(*values), "computed"
+        else:
+            def build():
+                nonlocal status
+                status = "computed"
+                return entry.fn(*values)
+            value = artifacts.cache.get_or_compute(("graph", name, key), build)
+        entry.value, entry.stamp, entry.version = value, stamp, self._next_version()
+        self.log[name] = (status, (time.perf_counter() - start) * 1000)
+        return value
+
+    def _key(self, name):
+        """Hashable key of ``name``'s value across sessions, or None."""
+        entry = self._entries[name]
+        if isinstance(entry, Source):
+            return entry.key if _hashable(entry.key) else None
+        keys = tuple(self._key(i) for i in entry.inputs)
+        return None if None in keys else (entry.code, keys)
+
+    # --- Debug view ---
+    def view(self):
+        """Sidebar table of the sources that changed and the nodes read since the last full rerun."""
+        if not self.show or not self.log:
+            return
+        import pandas as pd
+
+        rows = [
+            {"Node": name, "Status": STATUS[status], "ms": round(ms, 1),
+             "Inputs": ", ".join(getattr(self._entries.get(name), "inputs", ()))}
+            for name, (status, ms) in self.log.items()
+        ]
+        computed = sum(status == "computed" for status, _ in self.log.values())
+        nodes = sum(status != "changed" for status, _ in self.log.values())
+        with st.sidebar.expander("🔗 Computation graph (運算圖)", expanded=True):
+            st.dataframe(pd.DataFrame(rows).set_index("Node"), width="stretch")
+            st.caption(f"{computed} of {nodes} node(s) computed in the last rerun. 上次重新執行時重新計算的節點。")
+
+
+def page_graph():
+    """The session's graph, started for this rerun, with the debug view's toggle in the sidebar."""
+    graph = st.session_state.get(_SESSION_KEY)
+    if graph is None:
+        graph = st.session_state[_SESSION_KEY] = Graph()
+    graph.show = st.sidebar.toggle("Show computation graph (顯示運算圖)", key="show_graph")
+    graph.begin()
+    return graph
@@ -0,0 +1,67 @@
+"""Pre-aggregated category hierarchies for sunburst, treemap and icicle charts.
+
+Instead of handing the raw frame to Plotly Express (which groups it again and
+serializes per-node data), every path is counted once from the variables'
+integer codes and rare leaves are folded into an "Other" node, so the chart
+only ever receives at most ``max_leaves`` rows. Unlike ``ContingencyCube``
+the counts are kept sparse (only combinations that occur), since a path of
+high-cardinality variables would make a dense cube far too large.
+"""
+import numpy as np
+import pandas as pd
+
+OTHER = "Other"
+
+
+def path_counts(df, path, max_leaves=None, other_label=OTHER):
+    """One row per non-empty combination of ``path`` levels, with a ``count`` column."""
+    codes, levels = [], []
+    for var in path:
+        var_codes, uniques = pd.factorize(df[var], sort=True)
+        codes.append(var_codes)
+        levels.append(uniques)
+    codes = np.vstack(codes)
+    codes = codes[:, (codes >= 0).all(axis=0)]
+    shape = tuple(len(uniques) for uniques in levels)
+
+    # Combined index of each row's path, counted over the combinations that occur
+    combos, counts = np.unique(np.ravel_multi_index(codes, shape), return_counts=True)
+    combo_codes = np.unravel_index(combos, shape)
+    frame = pd.DataFrame({var: np.asarray(levels[d])[combo_codes[d]].astype(str) for d, var in enumerate(path)})
+    frame["count"] = counts
+    if max_leaves is not None:
+        frame = fold_leaves(frame, list(path), max_leaves, other_label)
+    return frame.reset_index(drop=True)
+
+
+def fold_leaves(frame, path, max_leaves, other_label=OTHER):
+    """Fold the smallest leaves into one ``other_label`` leaf per parent so at most ``max_leaves`` remain."""
+    if len(frame) <= max_leaves:
+        return frame
+    leaf, parents = path[-1], path[:-1]
+    frame = frame.sort_values("count", ascending=False, kind="stable").reset_index(drop=True)
+
+    if not parents:
+        kept = frame.iloc[:max_leaves - 1]
+        other = pd.DataFrame({leaf: [other_label], "count": [frame["count"].iloc[max_leaves - 1:].sum()]})
+        return pd.concat([kept, other], ignore_index=True)
+
+    # Keeping the k largest leaves adds one "Other" leaf for each parent that has a leaf among the rest;
+    # tail[k] counts those parents, i.e. parents whose last (smallest) leaf is at position >= k
+    parent_id = frame.groupby(parents, sort=False).ngroup().to_numpy()
+    last = np.zeros(parent_id.max() + 1, dtype=int)
+    np.maximum.at(last, parent_id, np.arange(len(frame)))
+    tail = np.bincount(last, minlength=len(frame) + 1)[::-1].cumsum()[::-1]
+    feasible = np.flatnonzero(np.arange(len(frame) + 1) + tail <= max_leaves)
+
+    if feasible.size == 0:
+        # Too many parents even with one leaf each: fold the parent level first
+        collapsed = frame.groupby(parents, sort=False, as_index=False)["count"].sum()
+        folded = fold_leaves(collapsed, parents, max_leaves, other_label)
+        folded[leaf] = other_label
+        return folded[path + ["count"]]
+
+    k = feasible.max()
+    others = frame.iloc[k:].groupby(parents, sort=False, as_index=False)["count"].sum()
+    others[leaf] = other_label
+    return pd.concat([frame.iloc[:k], others[path + ["count"]]], ignore_index=True)
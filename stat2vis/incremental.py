@@ -0,0 +1,373 @@
+"""Summary statistics and correlations maintained under single-cell edits.
+
+Each column keeps sufficient statistics instead of its raw values being
+re-scanned: a numeric column keeps the count and shifted sums of values and
+squares, and an order-statistic tree (a Fenwick tree over the sorted
+distinct values, with value multiplicities) for the minimum, quartiles,
+maximum and mode; other columns keep a frequency map. The numeric columns together keep the
+pairwise sums and cross-products that give pandas' pairwise-complete Pearson
+correlations. Changing one cell updates a column in O(log n) and the
+cross-products in O(k²) for k numeric columns, independently of the number
+of rows, and the results match a full recompute with ``describe()``,
+``mode()``, ``var()`` and ``corr()`` up to floating-point rounding.
+
+``FrameStats.sync(overlay)`` replays the edits an ``EditOverlay`` has
+recorded since the last call, so the statistics follow the data editor.
+"""
+from bisect import bisect_left, bisect_right, insort
+
+import numpy as np
+import pandas as pd
+
+from stat2vis.correlation import numeric_columns
+
+# Distinct values that are not in the sorted universe are kept in a small side
+# list; once it grows past this size the Fenwick tree is rebuilt in O(n)
+REBUILD_EXTRAS = 64
+
+
+def _missing(value):
+    return value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and np.isnan(value))
+
+
+class OrderStatistics:
+    """Multiset of floats with O(log n) insert/remove and k-th smallest queries."""
+
+    def __init__(self, values):
+        self._build(np.asarray(values, dtype=float))
+
+    def _build(self, values):
+        self.universe, counts = np.unique(values, return_counts=True)
+        self.counts = counts.astype(np.int64)
+        # Fenwick tree (1-based): tree[i] holds the counts of universe[i - lowbit(i):i]
+        size = len(self.universe)
+        prefix = np.concatenate([[0], np.cumsum(self.counts)])
+        index = np.arange(1, size + 1)
+        self.tree = np.zeros(size + 1, dtype=np.int64)
+        self.tree[1:] = prefix[index] - prefix[index - (index & -index)]
+        self.total = int(prefix[-1])
+        self.extras = []        # sorted distinct values outside the universe
+        self.extra_counts = {}
+        # How many distinct values occur c times, so the largest multiplicity is known in O(1)
+        self.multiplicity = dict(enumerate(np.bincount(self.counts).tolist())) if size else {}
+        self.max_count = int(self.counts.max()) if size else 0
+
+    def _add_tree(self, i, delta):
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, i):
+        """Number of universe elements with index < i."""
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return int(total)
+
+    def _extras_le(self, value):
+        return sum(self.extra_counts[v] for v in self.extras[:bisect_right(self.extras, value)])
+
+    def count_le(self, value):
+        """Number of elements <= ``value``."""
+        return self._prefix(int(np.searchsorted(self.universe, value, side="right"))) + self._extras_le(value)
+
+    def _count_moved(self, old, new):
+        # Counts move by one, so the largest multiplicity moves by at most one as well
+        self.multiplicity[old] = self.multiplicity.get(old, 0) - 1
+        self.multiplicity[new] = self.multiplicity.get(new, 0) + 1
+        if new > self.max_count:
+            self.max_count = new
+        elif old == self.max_count and self.multiplicity[old] == 0:
+            self.max_count = new
+
+    def add(self, value, delta=1):
+        i = int(np.searchsorted(self.universe, value))
+        if i < len(self.universe) and self.universe[i] == value:
+            old = int(self.counts[i])
+            self.counts[i] += delta
+            self._add_tree(i, delta)
+        else:
+            if value not in self.extra_counts:
+                insort(self.extras, value)
+                self.extra_counts[value] = 0
+            old = self.extra_counts[value]
+            self.extra_counts[value] += delta
+            if self.extra_counts[value] == 0:
+                del self.extra_counts[value]
+                self.extras.pop(bisect_left(self.extras, value))
+        self._count_moved(old, old + delta)
+        self.total += delta
+        if len(self.extras) > REBUILD_EXTRAS:
+            self._build(self.values())
+
+    def remove(self, value):
+        self.add(value, -1)
+
+    def values(self):
+        """All elements, sorted."""
+        merged = np.concatenate([self.universe, self.extras])
+        counts = np.concatenate([self.counts, [self.extra_counts[v] for v in self.extras]]).astype(np.int64)
+        order = np.argsort(merged, kind="stable")
+        return np.repeat(merged[order], counts[order])
+
+    def kth(self, k):
+        """The k-th smallest element (0-based)."""
+        # Smallest universe value whose count_le exceeds k, found by binary lifting on the tree
+        # when there are no extras, otherwise by binary search over universe and extras
+        if not self.extras:
+            pos, remaining = 0, k
+            step = 1 << (len(self.tree) - 1).bit_length()
+            while step:
+                nxt = pos + step
+                if nxt < len(self.tree) and self.tree[nxt] <= remaining:
+                    pos, remaining = nxt, remaining - self.tree[nxt]
+                step >>= 1
+            return float(self.universe[pos])
+        lo, hi = 0, len(self.universe)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._prefix(mid + 1) + self._extras_le(self.universe[mid]) > k:
+                hi = mid
+            else:
+                lo = mid + 1
+        candidates = [self.universe[lo]] if lo < len(self.universe) else []
+        candidates += [v for v in self.extras if self.count_le(v) > k][:1]
+        return float(min(candidates))
+
+    def mode(self):
+        """Most frequent element; ties go to the smallest, as in ``Series.mode()``."""
+        if self.total == 0:
+            return None
+        if self.max_count == 1:
+            return self.kth(0)  # Every element is a tie
+        candidates = self.universe[self.counts == self.max_count][:1].tolist()
+        candidates += [v for v in self.extras if self.extra_counts[v] == self.max_count][:1]
+        return float(min(candidates))
+
+    def quantile(self, q):
+        """Quantile with linear interpolation, as ``Series.quantile``."""
+        if self.total == 0:
+            return np.nan
+        h = (self.total - 1) * q
+        low = int(np.floor(h))
+        below = self.kth(low)
+        if h == low:
+            return below
+        return below + (h - low) * (self.kth(low + 1) - below)
+
+
+class FrequencyMap:
+    """Value counts with the most frequent value maintained under increments of ±1."""
+
+    def __init__(self, values):
+        counts = pd.Series(values, dtype=object if not len(values) else None).value_counts(sort=False)
+        self.counts = dict(zip(counts.index.tolist(), counts.tolist()))
+        self.by_count = {}
+        for value, count in self.counts.items():
+            self.by_count.setdefault(count, set()).add(value)
+        self.max_count = max(self.by_count, default=0)
+
+    def add(self, value, delta=1):
+        # Counts move by one, so the maximum moves by at most one as well
+        old = self.counts.get(value, 0)
+        new = old + delta
+        if old:
+            self.by_count[old].discard(value)
+            if not self.by_count[old]:
+                del self.by_count[old]
+        if new:
+            self.counts[value] = new
+            self.by_count.setdefault(new, set()).add(value)
+        else:
+            del self.counts[value]
+        if new > self.max_count:
+            self.max_count = new
+        elif old == self.max_count and old not in self.by_count:
+            self.max_count = old - 1 if old - 1 in self.by_count else max(self.by_count, default=0)
+
+    def remove(self, value):
+        self.add(value, -1)
+
+    @property
+    def unique(self):
+        return len(self.counts)
+
+    def top(self):
+        """Most frequent value; ties go to the smallest value, as in ``Series.mode()``."""
+        if not self.max_count:
+            return None
+        try:
+            return min(self.by_count[self.max_count])
+        except TypeError:
+            return min(self.by_count[self.max_count], key=str)  # Mixed types cannot be ordered
+
+
+class NumericStats:
+    """Count, moments, mode and order statistics of a numeric column."""
+
+    def __init__(self, series):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        self.shift = float(values[0]) if len(values) else 0.0
+        shifted = values - self.shift
+        self.integer = pd.api.types.is_integer_dtype(series)
+        self.n = len(values)
+        self.s1 = float(shifted.sum())
+        self.s2 = float((shifted ** 2).sum())
+        self.order = OrderStatistics(values)
+
+    def replace(self, old, new):
+        for value, sign in ((old, -1), (new, 1)):
+            if _missing(value):
+                continue
+            value = float(value)
+            self.n += sign
+            self.s1 += sign * (value - self.shift)
+            self.s2 += sign * (value - self.shift) ** 2
+            self.order.add(value, sign)
+
+    @property
+    def mean(self):
+        return self.shift + self.s1 / self.n if self.n else np.nan
+
+    @property
+    def var(self):
+        if self.n < 2:
+            return np.nan
+        return max(self.s2 - self.s1 ** 2 / self.n, 0.0) / (self.n - 1)
+
+    def describe(self):
+        """Same rows as ``Series.describe()`` plus Mode, Variance, SD and CV."""
+        std = np.sqrt(self.var)
+        mean = self.mean
+        empty = self.n == 0
+        top = self.order.mode()
+        if self.integer and top is not None and float(top).is_integer():
+            top = int(top)
+        return {
+            "count": float(self.n), "mean": mean, "std": std,
+            "min": np.nan if empty else self.order.kth(0),
+            "25%": self.order.quantile(0.25), "50%": self.order.quantile(0.5), "75%": self.order.quantile(0.75),
+            "max": np.nan if empty else self.order.kth(self.n - 1),
+            "top": top,
+            "Variance": self.var, "SD": std, "CV": std / mean if mean else None,
+        }
+
+
+class CategoricalStats:
+    """Count, number of levels and most frequent level of a non-numeric column."""
+
+    def __init__(self, series):
+        values = series.dropna().to_numpy(dtype=object)
+        self.n = len(values)
+        self.freq = FrequencyMap(values)
+
+    def replace(self, old, new):
+        for value, sign in ((old, -1), (new, 1)):
+            if not _missing(value):
+                self.n += sign
+                self.freq.add(value, sign)
+
+    def describe(self):
+        return {"count": float(self.n), "unique": self.freq.unique, "top": self.freq.top(), "freq": self.freq.max_count}
+
+
+class CrossProducts:
+    """Pairwise-complete sums and cross-products of numeric columns (see ``correlation._pairwise_pearson``)."""
+
+    def __init__(self, values, shift):
+        self.shift = np.asarray(shift, dtype=float)
+        present = ~np.isnan(values)
+        mask = present.astype(float)
+        filled = np.where(present, values - self.shift, 0.0)
+        self.counts = mask.T @ mask
+        self.sums = filled.T @ mask
+        self.squares = (filled ** 2).T @ mask
+        self.products = filled.T @ filled
+
+    def update_row(self, old_row, new_row):
+        for row, sign in ((old_row, -1), (new_row, 1)):
+            present = ~np.isnan(row)
+            mask = present.astype(float)
+            filled = np.where(present, row - self.shift, 0.0)
+            self.counts += sign * np.outer(mask, mask)
+            self.sums += sign * np.outer(filled, mask)
+            self.squares += sign * np.outer(filled ** 2, mask)
+            self.products += sign * np.outer(filled, filled)
+
+    def pearson(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = self.products - self.sums * self.sums.T / self.counts
+            var_i = self.squares - self.sums ** 2 / self.counts
+            corr = cov / np.sqrt(var_i * var_i.T)
+        corr[self.counts < 2] = np.nan
+        np.fill_diagonal(corr, np.where(np.diag(self.counts) >= 2, 1.0, np.nan))
+        return np.clip(corr, -1, 1)
+
+
+class FrameStats:
+    """Per-column statistics and numeric cross-products of a frame, kept in step with an ``EditOverlay``."""
+
+    def __init__(self, base):
+        self.base = base
+        # Booleans take part in correlations but are described like categories, as in describe()
+        self.numeric = numeric_columns(base)
+        self.columns = {
+            col: NumericStats(base[col]) if col in self.numeric and not pd.api.types.is_bool_dtype(base[col]) else CategoricalStats(base[col])
+            for col in base.columns
+        }
+        values = base[self.numeric].to_numpy(dtype=float, na_value=np.nan)
+        self.cross = CrossProducts(values, [getattr(self.columns[col], "shift", 0.0) for col in self.numeric])
+        self.cells = {}     # current value of every edited cell: {(row position, column): value}
+        self.applied = 0    # number of overlay log entries replayed so far
+
+    def _value(self, position, col):
+        if (position, col) in self.cells:
+            return self.cells[(position, col)]
+        return self.base[col].iat[position]
+
+    def _numeric_row(self, position):
+        row = [self._value(position, col) for col in self.numeric]
+        return np.array([np.nan if _missing(value) else float(value) for value in row])
+
+    def replace(self, position, col, new):
+        """Apply one cell change."""
+        old = self._value(position, col)
+        if isinstance(self.columns[col], NumericStats):
+            try:
+                new = np.nan if _missing(new) else float(new)
+            except (TypeError, ValueError):
+                new = np.nan  # Text in a numeric column counts as missing, as in pd.to_numeric(errors="coerce")
+        if col in self.numeric:
+            old_row = self._numeric_row(position)
+        self.columns[col].replace(old, new)
+        self.cells[(position, col)] = new
+        if col in self.numeric:
+            self.cross.update_row(old_row, self._numeric_row(position))
+
+    def sync(self, overlay):
+        """Replay the edits ``overlay`` recorded since the last call."""
+        pending = overlay.log[self.applied:]   # edits recorded meanwhile are replayed next time
+        for position, col, _old, new in pending:
+            self.replace(position, col, new)
+        self.applied += len(pending)
+        return self
+
+    # --- Results ---
+    def describe(self):
+        """One row per column with ``describe()``'s statistics and Mode, Variance, SD, CV for numeric columns."""
+        rows = {col: stats.describe() for col, stats in self.columns.items()}
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def matrix(self, columns, method="pearson"):
+        """Pairwise-complete Pearson correlations of ``columns`` (same interface as ``CorrelationService``)."""
+        if method != "pearson":
+            raise ValueError(f"Only Pearson correlations are maintained incrementally, not {method}")
+        idx = [self.numeric.index(col) for col in columns]
+        return pd.DataFrame(self.cross.pearson()[np.ix_(idx, idx)], index=list(columns), columns=list(columns))
+
+    def pair_counts(self, columns):
+        idx = [self.numeric.index(col) for col in columns]
+        return pd.DataFrame(self.cross.counts[np.ix_(idx, idx)].astype(int), index=list(columns), columns=list(columns))
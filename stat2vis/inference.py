@@ -0,0 +1,93 @@
+"""Z and t tests for one and two means, with the curves the test pages draw.
+
+The test functions return plain dicts with the standard error, degrees of
+freedom, critical value, test statistic, two-sided p-value, confidence
+interval and decision, so the same numbers can be shown, benchmarked or
+checked without a Streamlit session.
+"""
+import numpy as np
+
+from stat2vis.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
+
+TWO_SAMPLE_METHODS = ("pooled", "welch", "paired")
+
+
+def one_sample_test(sample_mean, sd, n, mu_0, alpha, sigma_known=True):
+    """Two-sided Z test (``sigma_known``) or t test of H₀: μ = μ₀ and the matching confidence interval."""
+    se = sd / np.sqrt(n)
+    df = n - 1
+    statistic = (sample_mean - mu_0) / se
+    if sigma_known:
+        critical = stats.norm.ppf(1 - alpha / 2)
+        p_value = 2 * (1 - stats.norm.cdf(abs(statistic)))
+    else:
+        critical = stats.t.ppf(1 - alpha / 2, df=df)
+        p_value = 2 * (1 - stats.t.cdf(abs(statistic), df=df))
+    ci_low = sample_mean - critical * se
+    ci_high = sample_mean + critical * se
+    return {
+        "se": se, "df": df, "critical": critical, "statistic": statistic, "p_value": p_value,
+        "ci_low": ci_low, "ci_high": ci_high, "reject": bool(mu_0 < ci_low or mu_0 > ci_high),
+    }
+
+
+def two_sample_test(mean1, sd1, n1, mean2, sd2, n2, alpha, method="pooled", sd_diff=None):
+    """Two-sided t test of H₀: μ₁ = μ₂ (pooled, Welch or paired), with power against the observed difference."""
+    if method not in TWO_SAMPLE_METHODS:
+        raise ValueError(f"Unknown two-sample method: {method}")
+    diff = mean1 - mean2
+    if method == "pooled":
+        sp_squared = ((n1 - 1) * sd1 ** 2 + (n2 - 1) * sd2 ** 2) / (n1 + n2 - 2)
+        se = np.sqrt(sp_squared * (1 / n1 + 1 / n2))
+        df = n1 + n2 - 2
+    elif method == "welch":
+        se = np.sqrt(sd1 ** 2 / n1 + sd2 ** 2 / n2)
+        df = (sd1 ** 2 / n1 + sd2 ** 2 / n2) ** 2 / ((sd1 ** 2 / n1) ** 2 / (n1 - 1) + (sd2 ** 2 / n2) ** 2 / (n2 - 1))
+    else:
+        # Each group has the same sample size and the SD of the differences is given
+        se = sd_diff / np.sqrt(n1)
+        df = n1 - 1
+
+    statistic = diff / se
+    p_value = 2 * (1 - stats.t.cdf(abs(statistic), df))
+    critical = stats.t.ppf(1 - alpha / 2, df)
+    crit_left, crit_right = -critical * se, critical * se
+    # Type II error: chance that the difference falls inside the acceptance region when it equals the observed one
+    beta = stats.norm.cdf(crit_right, loc=diff, scale=se) - stats.norm.cdf(crit_left, loc=diff, scale=se)
+    return {
+        "diff": diff, "se": se, "df": df, "critical": critical, "statistic": statistic, "p_value": p_value,
+        "reject": bool(p_value < alpha), "crit_left": crit_left, "crit_right": crit_right,
+        "beta": beta, "power": 1 - beta, "ci_low": diff - critical * se, "ci_high": diff + critical * se,
+    }
+
+
+# --- Curves for the sampling-distribution charts ---
+def one_sample_curves(center, se, ci_low, ci_high, points=200):
+    """Normal curve around ``center`` and its two tails outside the confidence interval."""
+    x = np.linspace(center - 4 * se, center + 4 * se, points)
+    x_left = np.append(x[x < ci_low], ci_low)
+    x_right = np.insert(x[x > ci_high], 0, ci_high)
+    pdf = lambda v: stats.norm.pdf(v, center, se)
+    return {
+        "x": x, "y": pdf(x),
+        "x_left": x_left, "y_left": pdf(x_left),
+        "x_right": x_right, "y_right": pdf(x_right),
+    }
+
+
+def two_sample_curves(diff, se, crit_left, crit_right, points=200):
+    """H₀ and H₁ curves of the mean difference with the α regions (under H₀) and β region (under H₁)."""
+    x = np.linspace(diff - 8 * se, diff + 8 * se, points)
+    x_alpha_left = np.append(x[x <= crit_left], crit_left)
+    x_alpha_right = np.insert(x[x >= crit_right], 0, crit_right)
+    x_beta = np.concatenate([[crit_left], x[(x > crit_left) & (x < crit_right)], [crit_right]])
+    h0 = lambda v: stats.norm.pdf(v, 0, se)
+    h1 = lambda v: stats.norm.pdf(v, diff, se)
+    return {
+        "x": x, "y_h0": h0(x), "y_h1": h1(x),
+        "x_alpha_left": x_alpha_left, "y_alpha_left": h0(x_alpha_left),
+        "x_alpha_right": x_alpha_right, "y_alpha_right": h0(x_alpha_right),
+        "x_beta": x_beta, "y_beta": h1(x_beta),
+    }
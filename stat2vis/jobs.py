@@ -0,0 +1,163 @@
+"""Background jobs for long computations, run off the script thread.
+
+``start_job(name, key, fn, *args)`` runs ``fn(*args)`` in a process-wide
+thread pool (NumPy releases the GIL in its array operations) and returns a
+``Job``. Jobs are shared by key: sessions asking for the same computation
+(the same CLT parameters, the same pairplot of the demo data) wait on one
+run, and finished results are kept in the shared artifact cache. A job
+function may be a generator that yields ``(progress, partial)`` pairs and
+returns the result, so partial results can be drawn while it runs.
+
+When a session starts a job under a ``name`` with a different key (an input
+changed), its previous job under that name is released, and cancelled when
+no other session waits for it; a generator job stops at its next yield.
+
+``wait_for(job, show_partial)`` draws a progress bar and the partial
+results (e.g. a histogram of the samples drawn so far) until the job
+finishes. Every update is a Streamlit call, so a
+widget change still stops the rerun at once and the page stays responsive.
+"""
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from stat2vis import artifacts
+
+MAX_WORKERS = 4
+POLL_SECONDS = 0.25
+FAST_SECONDS = 0.05    # jobs finishing within this time are shown without a progress bar
+_SESSION_KEY = "_background_jobs"
+
+_MISSING = object()
+_lock = threading.Lock()
+_running = {}          # (name, key) -> Job
+_executor = None
+
+
+class Job:
+    def __init__(self, key):
+        self.key = key
+        self.progress = 0.0
+        self.partial = None
+        self.value = None
+        self.error = None
+        self.watchers = 0
+        self._done = threading.Event()
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def finished(cls, key, value):
+        job = cls(key)
+        job.progress, job.value = 1.0, value
+        job._done.set()
+        return job
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _pool():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="stat2vis-job")
+        return _executor
+
+
+def _drain(job, steps):
+    while True:
+        if job.cancelled:
+            steps.close()
+            return None
+        try:
+            job.progress, job.partial = next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _run(job, fn, args, kwargs):
+    try:
+        value = fn(*args, **kwargs)
+        if inspect.isgenerator(value):
+            value = _drain(job, value)
+        job.value = value
+        if not job.cancelled:
+            artifacts.cache.put(("job", *job.key), value)
+    except Exception as exc:  # re-raised on the script thread by Job.result()
+        job.error = exc
+    finally:
+        with _lock:
+            if _running.get(job.key) is job:
+                del _running[job.key]
+        job.progress = 1.0
+        job._done.set()
+
+
+def _release(job):
+    job.watchers -= 1
+    if job.watchers <= 0 and not job.done:
+        job._cancelled.set()
+
+
+def start_job(name, key, fn, *args, **kwargs):
+    """The job computing ``fn(*args, **kwargs)`` for ``key`` (a hashable summary of the inputs), started if needed."""
+    full_key = (name, key)
+    cached = artifacts.cache.get(("job", *full_key), _MISSING)
+    session_jobs = st.session_state.setdefault(_SESSION_KEY, {})
+    previous = session_jobs.get(name)
+    with _lock:
+        if cached is not _MISSING:
+            job = Job.finished(full_key, cached)
+        else:
+            job = _running.get(full_key)
+            if job is None or job.cancelled:
+                job = _running[full_key] = Job(full_key)
+                submit = True
+            else:
+                submit = False
+        if previous is not job:
+            job.watchers += 1
+            if previous is not None:
+                _release(previous)
+    if cached is _MISSING and submit:
+        _pool().submit(_run, job, fn, args, kwargs)
+    session_jobs[name] = job
+    return job
+
+
+def wait_for(job, show_partial=None, placeholder=None, text="Computing… (計算中)"):
+    """Wait for ``job`` on the script thread and return its result.
+
+    Meanwhile a progress bar is shown, and ``show_partial(partial)`` draws the
+    latest partial result into ``placeholder`` (a new ``st.empty`` by default).
+    """
+    if not job.wait(FAST_SECONDS):
+        bar = st.progress(0.0, text=text)
+        area = placeholder if placeholder is not None else st.empty()
+        shown = None
+        while not job.wait(POLL_SECONDS):
+            bar.progress(min(job.progress, 1.0), text=text)  # each update lets a pending rerun stop the script
+            partial = job.partial
+            if show_partial is not None and partial is not None and partial is not shown:
+                with area.container():
+                    show_partial(partial)
+                shown = partial
+        bar.empty()
+        if placeholder is None:
+            area.empty()
+    return job.result()
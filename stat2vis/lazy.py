@@ -0,0 +1,43 @@
+"""Deferred imports for the pages.
+
+``px = lazy_import("plotly.express")`` binds a placeholder module; the real
+module is imported the first time one of its attributes is used. A page then
+pays only for the libraries used by the sections it actually renders, e.g.
+the EDA pages do not import Plotly until a dataset has been selected.
+"""
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module placeholder that imports its target on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name):
+    """Return ``name`` if it is already imported, otherwise a ``LazyModule``."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
@@ -0,0 +1,77 @@
+"""Ordered levels of categorical columns.
+
+Grades such as diamond cut, color and clarity, and binned ranges such as
+``< 5000``/``5000-10000``/``> 10000``, have a natural order that sorting the
+labels as strings gets wrong. ``order_levels`` recognizes them when a column
+is loaded and stores the column as an ordered categorical, so its integer
+codes follow the true order. Counting, sorting, crosstabs and chart axes then
+work on those codes instead of comparing strings on every rerun.
+"""
+import math
+import re
+
+import numpy as np
+import pandas as pd
+
+# Known grade scales, listed in order
+ORDINAL_SCALES = [
+    ["Fair", "Good", "Very Good", "Premium", "Ideal"],            # cut quality
+    ["D", "E", "F", "G", "H", "I", "J"],                          # color grade
+    ["I1", "SI2", "SI1", "VS2", "VS1", "VVS2", "VVS1", "IF"],     # clarity grade
+]
+
+_NUMBER = r"(-?\d+(?:\.\d+)?)"
+_BELOW = re.compile(rf"^\s*<=?\s*{_NUMBER}\s*$")
+_ABOVE = re.compile(rf"^\s*>=?\s*{_NUMBER}\s*$")
+_RANGE = re.compile(rf"^\s*{_NUMBER}\s*(?:-|~|to)\s*{_NUMBER}\s*$")
+
+
+def _bin_bounds(label):
+    """``(lower, upper)`` of a bin label like ``< 5000``, ``5000-10000`` or ``> 10000``; None otherwise."""
+    if not isinstance(label, str):
+        return None
+    if m := _BELOW.match(label):
+        return (-math.inf, float(m.group(1)))
+    if m := _ABOVE.match(label):
+        return (float(m.group(1)), math.inf)
+    if m := _RANGE.match(label):
+        return (float(m.group(1)), float(m.group(2)))
+    return None
+
+
+def ordinal_levels(levels):
+    """``levels`` in their natural order if they form a known grade scale or a set of bins, else None."""
+    levels = list(levels)
+    if len(levels) < 2:
+        return None
+    present = set(levels)
+    for scale in ORDINAL_SCALES:
+        if present <= set(scale):
+            return [level for level in scale if level in present]
+    bounds = [_bin_bounds(level) for level in levels]
+    if all(b is not None for b in bounds):
+        return [level for _, level in sorted(zip(bounds, levels))]
+    return None
+
+
+def order_levels(series):
+    """A categorical ``series`` as an ordered categorical when its levels are ordinal (unchanged otherwise)."""
+    if not isinstance(series.dtype, pd.CategoricalDtype) or series.cat.ordered:
+        return series
+    order = ordinal_levels(series.cat.categories)
+    return series.cat.reorder_categories(order, ordered=True) if order else series
+
+
+def level_counts(series):
+    """Count of each level that occurs, in level order; categorical columns are counted on their codes."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        return pd.Series(counts, index=series.cat.categories)[counts > 0]
+    return series.value_counts().sort_index()
+
+
+def category_orders(df, columns=None):
+    """Level order of the categorical ``columns``, as Plotly Express's ``category_orders``."""
+    columns = df.columns if columns is None else columns
+    return {col: df[col].cat.categories.tolist() for col in columns if isinstance(df[col].dtype, pd.CategoricalDtype)}
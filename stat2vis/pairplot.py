@@ -0,0 +1,162 @@
+"""Pairplot built from binned counts instead of raw points.
+
+Each column is binned once into integer codes (per bin count). An
+off-diagonal cell is then a single ``np.bincount`` over the combined codes of
+two columns (the mirrored cell is its transpose), and a diagonal cell a 1D
+histogram, so the figure size depends on the number of bins rather than the
+number of rows. Cells are cached and computed in a thread pool; NumPy
+releases the GIL inside the array operations. ``pairplot_steps`` counts the
+cells as a background job (see ``stat2vis.jobs``) that reports its progress;
+the job's result, kept in the shared cache, is only the count arrays, and
+each session builds its own figure from them with ``pairplot_figure``.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+
+class PairGrid:
+    """Cached 1D/2D histograms of a frame's numeric columns."""
+
+    def __init__(self, df):
+        self.df = df
+        self._lock = threading.Lock()
+        self._codes = {}
+        self._cells = {}
+
+    def codes(self, col, bins):
+        """Bin index of every row of ``col`` (-1 for missing) and the bin edges."""
+        key = (col, bins)
+        with self._lock:
+            cached = self._codes.get(key)
+        if cached is not None:
+            return cached
+        values = self.df[col].to_numpy(dtype=float)
+        present = ~np.isnan(values)
+        low, high = (values[present].min(), values[present].max()) if present.any() else (0.0, 1.0)
+        if high == low:
+            high = low + 1.0
+        edges = np.linspace(low, high, bins + 1)
+        codes = np.full(len(values), -1, dtype=np.int32)
+        codes[present] = np.minimum(((values[present] - low) / (high - low) * bins).astype(np.int32), bins - 1)
+        with self._lock:
+            self._codes[key] = (codes, edges)
+        return codes, edges
+
+    def cell(self, row_col, col_col, bins):
+        """Counts for one grid cell: a 1D histogram on the diagonal, otherwise a 2D histogram (rows = y)."""
+        key = (row_col, col_col, bins)
+        with self._lock:
+            cached = self._cells.get(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            mirrored = self._cells.get((col_col, row_col, bins))
+        if mirrored is not None:
+            return mirrored.T
+
+        x_codes, _ = self.codes(col_col, bins)
+        if row_col == col_col:
+            counts = np.bincount(x_codes[x_codes >= 0], minlength=bins)
+        else:
+            y_codes, _ = self.codes(row_col, bins)
+            combined = y_codes * bins + x_codes
+            if self.df[row_col].hasnans or self.df[col_col].hasnans:
+                combined = combined[(x_codes >= 0) & (y_codes >= 0)]
+            counts = np.bincount(combined, minlength=bins * bins).reshape(bins, bins)
+        with self._lock:
+            self._cells[key] = counts
+        return counts
+
+    def iter_compute(self, columns, bins, max_workers=None):
+        """``compute`` step by step: yields ``(fraction of cells counted, None)`` and returns the cells."""
+        pairs = [(r, c) for i, r in enumerate(columns) for c in columns[i:]]
+        # Bin each column once up front so the cell tasks only count
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(lambda col: self.codes(col, bins), columns))
+            futures = [executor.submit(self.cell, r, c, bins) for r, c in pairs]
+            try:
+                for done, _ in enumerate(as_completed(futures), 1):
+                    yield done / len(pairs), None
+            finally:
+                for future in futures:  # cells not started yet are dropped when the job is cancelled
+                    future.cancel()
+        cells = {pair: future.result() for pair, future in zip(pairs, futures)}
+        cells.update({(c, r): counts.T for (r, c), counts in cells.items() if r != c})
+        return cells
+
+    def compute(self, columns, bins, max_workers=None):
+        """All cells of the ``columns`` x ``columns`` grid, computed in parallel."""
+        steps = self.iter_compute(columns, bins, max_workers)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+
+# Approximately logarithmic colour steps so sparse regions stay visible next to dense ones
+COLORSCALE = [[0.0, "#eff3ff"], [0.02, "#c6dbef"], [0.08, "#9ecae1"], [0.2, "#6baed6"], [0.45, "#3182bd"], [1.0, "#08519c"]]
+
+
+def _with_centers(grid, columns, bins, cells):
+    centers = {}
+    for col in columns:
+        _, edges = grid.codes(col, bins)
+        centers[col] = np.round((edges[:-1] + edges[1:]) / 2, 6)
+    return {"cells": cells, "centers": centers}
+
+
+def pairplot_counts(grid, columns, bins=30):
+    """Counts of every cell of the ``columns`` x ``columns`` grid and the bin centers of each column."""
+    return _with_centers(grid, columns, bins, grid.compute(columns, bins))
+
+
+def pairplot_figure(grid_counts, columns, size=600, gap=0.01):
+    """Plotly figure of ``pairplot_counts``: 2D-histogram heatmaps off the diagonal, 1D histograms on it."""
+    import plotly.graph_objects as go
+
+    cells, centers = grid_counts["cells"], grid_counts["centers"]
+
+    # Axes are laid out directly (one pair per cell) rather than through make_subplots
+    k = len(columns)
+    data, layout = [], {}
+    for i, row_col in enumerate(columns):
+        for j, col_col in enumerate(columns):
+            n = i * k + j + 1
+            suffix = "" if n == 1 else str(n)
+            counts = cells[(row_col, col_col)]
+            if i == j:
+                data.append(dict(
+                    type="bar", x=centers[col_col], y=counts, marker=dict(color="#636efa"), showlegend=False,
+                    hovertemplate=f"{col_col}: %{{x:.3g}}<br>Count: %{{y}}<extra></extra>",
+                    xaxis=f"x{suffix}", yaxis=f"y{suffix}",
+                ))
+            else:
+                data.append(dict(
+                    type="heatmap", x=centers[col_col], y=centers[row_col],
+                    z=np.where(counts > 0, counts, np.nan), coloraxis="coloraxis",
+                    hovertemplate=f"{col_col}: %{{x:.3g}}<br>{row_col}: %{{y:.3g}}<br>Count: %{{z}}<extra></extra>",
+                    xaxis=f"x{suffix}", yaxis=f"y{suffix}",
+                ))
+            layout[f"xaxis{suffix}"] = dict(
+                domain=[j / k + gap, (j + 1) / k - gap], anchor=f"y{suffix}",
+                showticklabels=i == k - 1, title=dict(text=col_col) if i == k - 1 else None,
+            )
+            layout[f"yaxis{suffix}"] = dict(
+                domain=[1 - (i + 1) / k + gap, 1 - i / k - gap], anchor=f"x{suffix}",
+                showticklabels=j == 0 and i != j, title=dict(text=row_col) if j == 0 else None,
+            )
+
+    layout.update(
+        height=size, width=size, bargap=0, margin=dict(l=40, r=20, t=20, b=40),
+        coloraxis=dict(colorscale=COLORSCALE, showscale=False),
+    )
+    return go.Figure(data=data, layout=layout)
+
+
+def pairplot_steps(grid, columns, bins=30):
+    """``pairplot_counts`` for a background job: yields the progress of the counting, returns the counts."""
+    cells = yield from grid.iter_compute(columns, bins)
+    return _with_centers(grid, columns, bins, cells)
@@ -0,0 +1,174 @@
+"""Opt-in timing of the numbered sections of a page.
+
+A page creates one ``PageProfiler`` at the top and calls ``start(name)`` at
+each numbered section, which closes the previous one; ``section(name)`` is
+the same measurement as a context manager. For every section the profiler
+records wall time, CPU time of the script thread, memory allocated and peak
+(tracemalloc) and the bytes of the messages and images sent to the browser.
+Messages are counted by wrapping the script context's enqueue for as long as
+a profiled section is open; nothing is patched while profiling is off, and a
+wrapper left by a rerun that stopped early is removed at the next full run.
+
+Profiling is off unless the sidebar toggle is switched on, which shows the
+results in a sidebar panel, or ``STAT2VIS_PROFILE_LOG`` names a file, to
+which every profiled section is appended as one JSON line. When off, the
+calls cost nothing beyond a flag check.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+import weakref
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from stat2vis.artifacts import cache_summary
+
+LOG_ENV = "STAT2VIS_PROFILE_LOG"
+
+# tracemalloc slows every allocation, so it only runs while some rerun is being profiled
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+# Payload counters of the sections open on each script thread; media bytes are reported by render.show_figure
+_local = threading.local()
+
+
+def add_payload(nbytes):
+    """Count ``nbytes`` sent outside the page's ForwardMsgs (e.g. image files) towards the open sections."""
+    for counter in getattr(_local, "payloads", []):
+        counter[0] += nbytes
+
+
+def _acquire_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+def _release_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            tracemalloc.stop()
+
+
+def _install_counter(ctx):
+    """Count the bytes of the page's ForwardMsgs towards the open sections until ``_remove_counter``."""
+    enqueue = ctx._enqueue
+
+    def counting(msg):
+        add_payload(msg.ByteSize())
+        enqueue(msg)
+
+    counting.original = enqueue
+    ctx._enqueue = counting
+    return counting
+
+
+def _remove_counter(ctx, counter=None):
+    """Restore the original enqueue, if ``counter`` (default: any counter) is the one installed."""
+    installed = ctx._enqueue
+    if hasattr(installed, "original") and counter in (None, installed):
+        ctx._enqueue = installed.original
+
+
+def _reset_thread():
+    """Drop the counters left by a profiled rerun that stopped before closing its section."""
+    _local.payloads = []
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        _remove_counter(ctx)
+
+
+class PageProfiler:
+    def __init__(self, page, show=False, log_path=None):
+        self.page = page
+        self.show = show
+        self.log_path = log_path
+        self.enabled = show or bool(log_path)
+        self.records = []
+        self.run_id = uuid.uuid4().hex[:12]
+        self._open = None
+        self._release = None
+        if self.enabled:
+            _acquire_tracing()
+            # Released by finish(), or when the profiler is collected after a rerun that stopped early
+            self._release = weakref.finalize(self, _release_tracing)
+
+    @contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        payload = [0]
+        # The outermost open section patches the (private) enqueue of the script thread's context and restores it
+        ctx = get_script_run_ctx() if not getattr(_local, "payloads", []) else None
+        counter = _install_counter(ctx) if ctx is not None else None
+        _local.payloads = getattr(_local, "payloads", []) + [payload]
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            if counter is not None:
+                _remove_counter(ctx, counter)
+            current, peak = tracemalloc.get_traced_memory()
+            self.records.append({
+                "section": name,
+                "wall_ms": (time.perf_counter() - wall) * 1000,
+                "cpu_ms": (time.thread_time() - cpu) * 1000,
+                "alloc_kb": (current - memory_before) / 1024,
+                "peak_kb": (peak - memory_before) / 1024,
+                "payload_kb": payload[0] / 1024,
+            })
+            _local.payloads = [p for p in getattr(_local, "payloads", []) if p is not payload]
+
+    def start(self, name):
+        """Close the running section and open ``name``."""
+        self.stop()
+        if self.enabled:
+            self._open = self.section(name)
+            self._open.__enter__()
+
+    def stop(self):
+        if self._open is not None:
+            self._open, section = None, self._open
+            section.__exit__(None, None, None)
+
+    def finish(self):
+        """Close the last section, append the log lines and draw the sidebar panel."""
+        self.stop()
+        if self._release is not None:
+            self._release()
+        if not self.records:
+            return
+        if self.log_path:
+            stamp = time.time()
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                for record in self.records:
+                    f.write(json.dumps({"time": stamp, "page": self.page, "run": self.run_id, **record}) + "\n")
+        if self.show:
+            import pandas as pd
+
+            table = pd.DataFrame(self.records).set_index("section").round(1)
+            table.loc["Total"] = table.sum()
+            with st.sidebar.expander("⏱️ Section profile (區段效能)", expanded=True):
+                st.dataframe(table, width="stretch")
+                st.caption("Wall/CPU time in ms; allocated, peak and payload in KB. 時間單位為毫秒，記憶體與傳輸量為 KB。")
+                st.caption(f"Shared artifact cache (共用快取): {cache_summary()}")
+
+
+def page_profiler(page):
+    """The profiler for this rerun, with the opt-in toggle in the sidebar."""
+    _reset_thread()
+    show = st.sidebar.toggle("Profile sections (區段效能分析)", key="profile_sections")
+    return PageProfiler(page, show=show, log_path=os.environ.get(LOG_ENV))
@@ -0,0 +1,101 @@
+"""Cached matplotlib rendering for the Streamlit pages.
+
+Figures are drawn with the Agg backend on pooled ``Figure`` objects that are
+never registered with pyplot, so nothing accumulates in pyplot's global figure
+manager. The encoded PNG/SVG bytes are kept in the process-wide artifact cache
+(``stat2vis.artifacts``) keyed by a hash of the draw function and its inputs,
+so a repeated state costs neither drawing nor encoding, in any session.
+"""
+import io
+import threading
+from contextlib import contextmanager
+
+import streamlit as st
+
+from stat2vis import artifacts
+from stat2vis.artifacts import fingerprint
+from stat2vis.profiling import add_payload
+
+# Same encoding defaults as st.pyplot, so the pages look unchanged
+DEFAULT_DPI = 200
+POOL_MAX_PER_SIZE = 4
+
+_figure_class = None
+
+
+def _new_figure(figsize):
+    # matplotlib is imported on the first render, not when a page imports this module
+    global _figure_class
+    if _figure_class is None:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        from matplotlib.figure import Figure
+
+        _figure_class = Figure
+    return _figure_class(figsize=figsize)
+
+
+# --- Figure pool ---
+class FigurePool:
+    """Reusable Agg figures grouped by size; figures are cleared on release."""
+
+    def __init__(self, max_per_size=POOL_MAX_PER_SIZE):
+        self.max_per_size = max_per_size
+        self._free = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    @contextmanager
+    def figure(self, figsize):
+        figsize = tuple(figsize)
+        with self._lock:
+            free = self._free.setdefault(figsize, [])
+            fig = free.pop() if free else None
+        if fig is None:
+            fig = _new_figure(figsize)
+            self.created += 1
+        try:
+            yield fig
+        finally:
+            fig.clf()
+            with self._lock:
+                free = self._free.setdefault(figsize, [])
+                if len(free) < self.max_per_size:
+                    free.append(fig)
+
+
+pool = FigurePool()
+
+
+def render_figure(draw, *args, figsize=(7, 3), fmt="png", dpi=DEFAULT_DPI, cache=True, **kwargs):
+    """Encode ``draw(fig, *args, **kwargs)`` and return the image bytes.
+
+    ``draw`` must take every input that affects the picture as an argument;
+    values captured from an enclosing scope are not part of the cache key.
+    """
+    key = ("image", fingerprint(draw, args, kwargs, figsize, fmt, dpi)) if cache else None
+    if key is not None:
+        data = artifacts.cache.get(key)
+        if data is not None:
+            return data
+
+    with pool.figure(figsize) as fig:
+        draw(fig, *args, **kwargs)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+        data = buffer.getvalue()
+
+    if key is not None:
+        artifacts.cache.put(key, data)
+    return data
+
+
+def show_figure(draw, *args, figsize=(7, 3), fmt="png", width="stretch", cache=True, container=None, **kwargs):
+    """Render (or reuse) a figure and display it in place of ``st.pyplot``."""
+    data = render_figure(draw, *args, figsize=figsize, fmt=fmt, cache=cache, **kwargs)
+    add_payload(len(data))  # image bytes are served as a media file, outside the page's messages
+    target = container if container is not None else st
+    if fmt == "svg":
+        return target.image(data.decode("utf-8"), width=width)
+    return target.image(data, width=width)
@@ -0,0 +1,76 @@
+"""Bounded samples of rows for the charts that draw every point.
+
+Strip, 3D scatter, violin and box-with-points charts send one marker per row
+to the browser, so their cost grows with the data. ``sample_rows`` picks a
+reproducible sample of at most about ``budget`` rows by reservoir sampling
+with random keys: every row draws a uniform key from a seeded generator and
+the reservoir keeps the rows with the smallest keys, which is a uniform
+sample found in one vectorized pass. With a stratum column (a chart's color
+variable) each level gets a share of the budget proportional to its size and
+at least one point, so rare levels stay visible.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+POINT_BUDGETS = [1000, 2000, 5000, 10000, 20000, 50000]
+DEFAULT_BUDGET = 5000
+
+
+def _strata_codes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy()
+    return pd.factorize(series)[0]
+
+
+def _quotas(sizes, budget):
+    """Points per stratum: proportional to its size, at least one, at most all of it."""
+    share = np.rint(sizes * budget / sizes.sum()).astype(int)
+    return np.minimum(sizes, np.maximum(share, sizes > 0))
+
+
+def sample_rows(df, budget, stratum=None, seed=0):
+    """Sorted positions of a reproducible sample of about ``budget`` rows of ``df``, stratified by ``stratum``."""
+    n_rows = len(df)
+    if n_rows <= budget:
+        return np.arange(n_rows)
+    keys = np.random.default_rng(seed).random(n_rows)
+    if stratum is None:
+        chosen = np.argpartition(keys, budget)[:budget]
+    else:
+        codes = _strata_codes(df[stratum]) + 1  # missing values form their own stratum
+        sizes = np.bincount(codes)
+        order = np.lexsort((keys, codes))  # by stratum, then by key
+        rank = np.arange(n_rows) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        chosen = order[rank < np.repeat(_quotas(sizes, budget), sizes)]
+    return np.sort(chosen)
+
+
+@st.cache_data(max_entries=20, show_spinner=False)
+def point_sample(_df, token, budget, stratum):
+    """``sample_rows`` of ``_df``, cached per dataset and edits (``token``), budget and stratum, for all pages."""
+    return sample_rows(_df, budget, stratum)
+
+
+def box_stats(values):
+    """Quartiles and whisker ends of ``values`` (Tukey fences), for a box drawn from the full data."""
+    values = np.asarray(values, dtype=float)
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    return {
+        "q1": q1, "median": median, "q3": q3,
+        "lowerfence": values[values >= q1 - 1.5 * iqr].min(),
+        "upperfence": values[values <= q3 + 1.5 * iqr].max(),
+    }
+
+
+def point_budget(key="point_budget"):
+    """Sidebar control for the number of points a chart may draw."""
+    return st.sidebar.select_slider("Max points per chart (每張圖最多點數)", POINT_BUDGETS, value=DEFAULT_BUDGET, key=key)
+
+
+def sample_caption(n_shown, n_rows, stratum=None):
+    if n_shown >= n_rows:
+        return None
+    by = f", stratified by {stratum} (依 {stratum} 分層)" if stratum else ""
+    return f"Showing a sample of {n_shown:,} of {n_rows:,} points{by}. 僅繪製抽樣的資料點。"
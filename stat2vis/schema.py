@@ -0,0 +1,110 @@
+"""Compact column types for loaded data.
+
+Text columns with few distinct values become ``category`` (integer codes and
+one copy of each level instead of a Python string per row), integer columns
+get the smallest integer type that holds their range and float columns become
+float32 when every value has at most six significant digits, the precision
+float32 reproduces exactly. Categories with a natural order (grades, binned
+ranges) are stored as ordered categoricals, see ``stat2vis.levels``. For CSV files the category columns are chosen
+from a sample of the first rows and parsed as categories directly, so the
+full column of Python strings is never built.
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from stat2vis.levels import order_levels
+
+SAMPLE_ROWS = 10_000
+MAX_LEVEL_RATIO = 0.5   # at most this many distinct values per non-missing value in the sample
+FLOAT32_DIGITS = 6
+
+
+def category_columns(sample):
+    """Text columns of ``sample`` that repeat their values enough to be stored as categories."""
+    columns = []
+    for col in sample.select_dtypes(include="object").columns:
+        values = sample[col].dropna()
+        if len(values) and values.map(type).eq(str).all() and values.nunique() <= MAX_LEVEL_RATIO * len(values):
+            columns.append(col)
+    return columns
+
+
+def _fits_float32(values):
+    finite = values[np.isfinite(values)]
+    if not finite.size:
+        return True
+    if np.abs(finite).max() >= np.finfo(np.float32).max:
+        return False
+    # Values with at most FLOAT32_DIGITS significant digits are unchanged by rounding to that many digits
+    nonzero = finite[finite != 0]
+    magnitude = np.floor(np.log10(np.abs(nonzero)))
+    scale = 10.0 ** (FLOAT32_DIGITS - 1 - magnitude)
+    return bool(np.array_equal(np.round(nonzero * scale) / scale, nonzero))
+
+
+def downcast(series):
+    """``series`` with the smallest numeric type that keeps every value (unchanged otherwise)."""
+    if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    if series.dtype == np.float64 and _fits_float32(series.to_numpy()):
+        return series.astype(np.float32)
+    return series
+
+
+def _object_bytes(series):
+    """Memory ``series`` would take as a column of Python strings (as ``memory_usage(deep=True)`` counts it)."""
+    counts = series.value_counts(sort=False)
+    return len(series) * 8 + sum(sys.getsizeof(level) * n for level, n in counts.items())
+
+
+def compress(df, categories=None):
+    """Return ``df`` with compact types and a report of each column's type and memory before and after.
+
+    ``categories`` are the columns to store as categories; by default they are
+    chosen from the first ``SAMPLE_ROWS`` rows.
+    """
+    if categories is None:
+        categories = category_columns(df.head(SAMPLE_ROWS))
+    columns, rows = {}, []
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            before, before_bytes = "object", _object_bytes(series)  # parsed as categories by read_csv
+        else:
+            before, before_bytes = str(series.dtype), series.memory_usage(index=False, deep=True)
+        if col in categories and series.dtype == object:
+            series = series.astype("category")
+        columns[col] = series = order_levels(downcast(series))
+        ordered = isinstance(series.dtype, pd.CategoricalDtype) and series.cat.ordered
+        rows.append({
+            "column": col, "before": before, "after": str(series.dtype),
+            "before_bytes": before_bytes, "after_bytes": series.memory_usage(index=False, deep=True),
+            "order": " → ".join(map(str, series.cat.categories)) if ordered else "",
+        })
+    report = pd.DataFrame(rows).set_index("column")
+    return pd.DataFrame(columns, index=df.index), report
+
+
+def read_csv(source, sample_rows=SAMPLE_ROWS):
+    """Read a CSV path or file object with compact types; returns the frame and the ``compress`` report."""
+    sample = pd.read_csv(source, nrows=sample_rows)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    categories = category_columns(sample)
+    df = pd.read_csv(source, dtype={col: "category" for col in categories})
+    return compress(df, categories)
+
+
+def memory_summary(report):
+    """One line with the total memory before and after and the share saved."""
+    before, after = report["before_bytes"].sum(), report["after_bytes"].sum()
+    saved = 1 - after / before if before else 0.0
+    return f"{_size(before)} → {_size(after)} ({saved:.0%} saved)"
+
+
+def _size(nbytes):
+    return f"{nbytes / 2 ** 20:,.2f} MB" if nbytes >= 2 ** 20 else f"{nbytes / 2 ** 10:,.1f} KB"
@@ -0,0 +1,98 @@
+"""Page sections that rerun on their own, and debounced number inputs.
+
+Every widget change reruns the whole page script. ``page_section(profiler,
+name)`` turns a numbered section into an ``st.fragment``: a widget inside it
+reruns only that section, with the arguments of the last full run (the
+dataset, column lists, parameters chosen in earlier sections), so a
+section's inputs are its arguments. A change outside the section still
+reruns the whole page, this section included. Sections cannot draw into the
+sidebar, so sidebar controls are placed before them and passed in.
+
+``debounce(key, *values)`` lets the first change of a group of sliders and
+number inputs through at once, and holds a rerun for ``DEBOUNCE_SECONDS``
+(env ``STAT2VIS_DEBOUNCE_MS``, default 300) only when the group already
+changed less than that long ago, i.e. during a burst of clicks on a number
+input's +/-. The time of the last change is kept in the session state. A
+newer change ends the held rerun, so a burst computes only the final value.
+Outside a section the newer rerun interrupts the held one at its next
+Streamlit call. A change inside a section is queued behind the running
+section instead, and the held section stops itself when it sees one queued;
+Streamlit has no public way to see that, so when its internal request state
+is not available a section is never held.
+"""
+import functools
+import os
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+try:
+    from streamlit.runtime.scriptrunner_utils.script_requests import ScriptRequestType
+except ImportError:  # internal module, moved between Streamlit versions
+    ScriptRequestType = None
+
+from stat2vis.profiling import PageProfiler
+
+DEBOUNCE_ENV = "STAT2VIS_DEBOUNCE_MS"
+DEBOUNCE_SECONDS = float(os.environ.get(DEBOUNCE_ENV, 300)) / 1000
+_TICK = 0.05
+
+
+def fragment_rerun():
+    """Whether this rerun runs only sections (a widget inside a section changed)."""
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and ctx.fragment_ids_this_run)
+
+
+def _rerun_queued():
+    """Whether a rerun is queued behind this one, or None when Streamlit does not tell."""
+    requests = getattr(get_script_run_ctx(), "script_requests", None)
+    state = getattr(requests, "_state", None)
+    if ScriptRequestType is None or state is None:
+        return None
+    return state == ScriptRequestType.RERUN
+
+
+def page_section(profiler, name):
+    """Decorator running a page section as an ``st.fragment``, profiled as ``name``."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            if not fragment_rerun():
+                profiler.start(name)
+                return fn(*args, **kwargs)
+            # The page's profiler finished with the last full run, and a section cannot draw the sidebar panel
+            section_profiler = PageProfiler(profiler.page, log_path=profiler.log_path)
+            with section_profiler.section(name):
+                result = fn(*args, **kwargs)
+            section_profiler.finish()
+            return result
+
+        return st.fragment(run)
+
+    return decorate
+
+
+def debounce(key, *values, delay=None):
+    """Hold this rerun for ``delay`` seconds if ``values`` changed, and also changed less than ``delay`` ago."""
+    delay = DEBOUNCE_SECONDS if delay is None else delay
+    state_key = f"_debounce_{key}"
+    last, changed_at = st.session_state.get(state_key, (None, None))
+    if last == values:
+        return
+    now = time.monotonic()
+    # Recorded before holding, so the rerun that interrupts this one sees a burst
+    st.session_state[state_key] = (values, None if last is None else now)
+    if changed_at is None or now - changed_at >= delay or delay <= 0:
+        return
+    in_section = fragment_rerun()
+    if in_section and _rerun_queued() is None:
+        return  # a held section could not tell that a newer change is waiting
+    pause = st.empty()
+    deadline = now + delay
+    while time.monotonic() < deadline:
+        time.sleep(_TICK)
+        if in_section and _rerun_queued():
+            st.stop()  # the queued rerun has the newer values
+        pause.empty()  # a newer change outside the sections stops this rerun here
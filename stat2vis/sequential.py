@@ -0,0 +1,175 @@
+"""Sequential two-sample testing on a stream of batches.
+
+Each group is summarized by its sufficient statistics (n, mean, M2 = sum of
+squared deviations), which a batch updates without re-reading earlier
+observations. Every step recomputes the fixed-n t statistic and p-value and
+a mixture-SPRT always-valid p-value.
+
+``spending_boundaries`` gives group-sequential boundaries for the looks
+taken so far: the Lan-DeMets O'Brien-Fleming spending function fixes how
+much of α may be spent up to each information fraction n / max_n, and each
+look's boundary is solved so that the probability under H₀ of first
+crossing at that look equals its share. The crossing probabilities come from
+the density of the B-value W(t) = Z·√t (a Brownian motion under H₀), carried
+from look to look on a grid and cut at each boundary.
+
+A file stream is read from a file in ``STREAM_DIR`` (env
+``STAT2VIS_STREAM_DIR``, default ``streams/`` in the app directory); the
+page passes a file name, and paths leading outside that directory are not
+read.
+"""
+import functools
+import os
+from pathlib import Path
+
+import numpy as np
+
+from stat2vis.lazy import lazy_import
+
+stats = lazy_import("scipy.stats")
+
+STREAM_DIR_ENV = "STAT2VIS_STREAM_DIR"
+STREAM_DIR = Path(os.environ.get(STREAM_DIR_ENV) or Path(__file__).resolve().parent.parent / "streams")
+
+
+def empty_group_stats():
+    return {"n": 0, "mean": 0.0, "m2": 0.0}
+
+
+def update_group_stats(group, values):
+    """Merge a batch into ``group`` (Chan et al. parallel update)."""
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return group
+    n_b = values.size
+    mean_b = values.mean()
+    m2_b = ((values - mean_b) ** 2).sum()
+    n = group["n"] + n_b
+    delta = mean_b - group["mean"]
+    return {
+        "n": n,
+        "mean": group["mean"] + delta * n_b / n,
+        "m2": group["m2"] + m2_b + delta ** 2 * group["n"] * n_b / n,
+    }
+
+
+def sequential_step(g1, g2, pooled, tau, max_n, prev_p_always):
+    """Test results after the latest batch; ``pooled`` selects the equal-variance t test over Welch's."""
+    n1, n2 = g1["n"], g2["n"]
+    var1 = g1["m2"] / (n1 - 1)
+    var2 = g2["m2"] / (n2 - 1)
+    diff = g1["mean"] - g2["mean"]
+
+    if pooled:
+        sp2 = (g1["m2"] + g2["m2"]) / (n1 + n2 - 2)
+        v = sp2 * (1 / n1 + 1 / n2)
+        dof = n1 + n2 - 2
+    else:
+        v = var1 / n1 + var2 / n2
+        dof = v ** 2 / ((var1 / n1) ** 2 / (n1 - 1) + (var2 / n2) ** 2 / (n2 - 1))
+    stat = diff / np.sqrt(v)
+    p_fixed = 2 * (1 - stats.t.cdf(abs(stat), dof))
+
+    # mSPRT with a N(0, τ²) mixture over the mean difference; the always-valid p-value never increases
+    log_lr = 0.5 * np.log(v / (v + tau ** 2)) + tau ** 2 * diff ** 2 / (2 * v * (v + tau ** 2))
+    p_always = min(prev_p_always, 1.0, float(np.exp(-log_lr)))
+
+    return {
+        "n1": n1, "n2": n2, "diff": diff, "stat": stat, "df": dof,
+        "p_fixed": p_fixed, "p_always": p_always,
+        "info": min(1.0, min(n1, n2) / max_n),  # information fraction of this look
+    }
+
+
+# --- Group-sequential boundaries ---
+_GRID_STEP = 0.01
+_GRID_LIMIT = 8.0   # the B-value has variance t <= 1
+
+
+def obf_spending(t, alpha):
+    """α spent by information fraction ``t`` under the Lan-DeMets O'Brien-Fleming spending function (two-sided)."""
+    if t <= 0:
+        return 0.0
+    return float(2 * (1 - stats.norm.cdf(stats.norm.ppf(1 - alpha / 2) / np.sqrt(min(t, 1.0)))))
+
+
+@functools.lru_cache(maxsize=32)
+def spending_boundaries(fractions, alpha):
+    """Two-sided z boundaries for looks at the increasing information ``fractions`` (a tuple in (0, 1])."""
+    x = np.arange(-_GRID_LIMIT, _GRID_LIMIT + _GRID_STEP / 2, _GRID_STEP)
+    mass = np.zeros_like(x)
+    mass[len(x) // 2] = 1.0          # W(0) = 0
+    by_distance = np.argsort(-np.abs(x), kind="stable")
+    boundaries = []
+    prev_t = 0.0
+    for t in fractions:
+        t = min(t, 1.0)
+        if t <= prev_t:              # no new information: nothing to spend at this look
+            boundaries.append(np.inf)
+            continue
+        # Continuation density moves on by an independent N(0, t - prev_t) increment
+        sd = np.sqrt(t - prev_t)
+        half = min(int(np.ceil(8 * sd / _GRID_STEP)), len(x) // 2)
+        edges = (np.arange(-half, half + 2) - 0.5) * _GRID_STEP / sd
+        mass = np.convolve(mass, np.diff(stats.norm.cdf(edges)), mode="same")
+
+        # Smallest |W| cut whose tail mass stays within this look's share of α
+        share = obf_spending(t, alpha) - obf_spending(prev_t, alpha)
+        tail = np.cumsum(mass[by_distance])
+        inside = np.searchsorted(tail, share, side="right")
+        cut = np.abs(x[by_distance[inside]]) + _GRID_STEP / 2 if inside < len(x) else 0.0
+        mass = np.where(np.abs(x) < cut, mass, 0.0)
+        boundaries.append(cut / np.sqrt(t))
+        prev_t = t
+    return np.array(boundaries)
+
+
+def first_rejection(history, alpha, rule):
+    """Index of the first look at which ``rule`` ("boundary" or "msprt") rejects H₀, or None."""
+    if rule == "msprt":
+        hits = [i for i, h in enumerate(history) if h["p_always"] < alpha]
+    else:
+        boundaries = spending_boundaries(tuple(h["info"] for h in history), alpha)
+        hits = [i for i, (h, b) in enumerate(zip(history, boundaries)) if abs(h["stat"]) >= b]
+    return hits[0] if hits else None
+
+
+# --- Batch sources ---
+def simulated_batch(rng, mu1, sd1, mu2, sd2, batch_size):
+    return rng.normal(mu1, sd1, batch_size), rng.normal(mu2, sd2, batch_size)
+
+
+def stream_path(name):
+    """Path of the stream file ``name`` in ``STREAM_DIR``, or None when it would lie outside it."""
+    root = STREAM_DIR.resolve()
+    path = (root / name).resolve()
+    return path if path.parent == root and path.suffix.lower() in (".csv", ".txt") else None
+
+
+def file_batch(name, offset):
+    """``group,value`` rows appended to stream file ``name`` since byte ``offset``, up to the last complete line."""
+    path = stream_path(name)
+    if path is None:
+        raise ValueError(f"{name!r} is not a stream file in {STREAM_DIR}")
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return [], [], offset
+    end = chunk.rfind(b"\n") + 1
+    values1, values2 = [], []
+    for line in chunk[:end].decode("utf-8").splitlines():
+        parts = line.strip().split(",")
+        if len(parts) != 2:
+            continue
+        group, value = parts[0].strip().upper(), parts[1].strip()
+        try:
+            value = float(value)
+        except ValueError:
+            continue  # header or malformed row
+        if group in ("1", "A"):
+            values1.append(value)
+        elif group in ("2", "B"):
+            values2.append(value)
+    return values1, values2, offset + end
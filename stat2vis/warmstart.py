@@ -0,0 +1,106 @@
+"""Build the warm-start bundle: the cached artifacts of every page's default view.
+
+Every page is run headlessly with ``streamlit.testing.v1.AppTest`` in its
+default state (the EDA pages with the demo data, the CLT page with its final
+distribution shown), which fills the process-wide artifact cache with the
+curves, simulations, summaries and rendered images of those views. The
+entries are written to ``warm_start/bundle-<version>.pkl``; the version is
+``stat2vis.artifacts.bundle_version()``, so a bundle is only used by the
+code, data and libraries it was built with. Bundles of other versions are
+removed.
+
+    python -m stat2vis.warmstart
+    python -m stat2vis.warmstart --output-dir /srv/stat2vis/warm_start
+    python -m stat2vis.warmstart --check
+
+Serve with ``STAT2VIS_WARM_START`` set to the same directory when it is not
+the default ``warm_start/`` of the repository.
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+
+from stat2vis import artifacts
+
+# --- Default views: the interactions after the initial load that a first visit shows ---
+DEFAULT_VIEWS = {
+    "Home.py": [],
+    "pages/01_Ch1_EDA I.py": [lambda at: at.checkbox(key="use_demo_data").check()],
+    "pages/02_Ch2_EDA II.py": [lambda at: at.checkbox(key="use_demo_data").check()],
+    "pages/03_Ch3_Prob. Dist..py": [],
+    "pages/04_Ch4_CLT.py": [lambda at: next(b for b in at.button if b.label.startswith("⏩ Show Final")).click()],
+    "pages/05_Ch5_One-sample Test.py": [],
+    "pages/06_Ch6_Two-sample Test.py": [],
+}
+
+
+def run_default_views(root, timeout=300):
+    """Run every page's default view; returns the pages that raised an exception."""
+    from streamlit import logger
+    from streamlit.testing.v1 import AppTest
+
+    logger.set_log_level("error")  # bare-mode warnings on every run
+    failed = []
+    for page, steps in DEFAULT_VIEWS.items():
+        at = AppTest.from_file(str(root / page), default_timeout=timeout)
+        at.run()
+        for interact in steps:
+            interact(at).run()
+        if at.exception:
+            failed.append((page, at.exception[0].message))
+    return failed
+
+
+def write_bundle(path, entries):
+    """Pickle ``entries`` (key, value) to ``path`` atomically and remove bundles of other versions."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    bundle = {
+        "version": artifacts.bundle_version(),
+        "created": time.time(),
+        "entries": {key: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) for key, value in entries},
+    }
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(bundle, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    for stale in path.parent.glob("bundle-*.pkl"):
+        if stale != path:
+            stale.unlink()
+    return bundle
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output-dir", default=None, help="bundle directory (default: STAT2VIS_WARM_START or warm_start/)")
+    parser.add_argument("--check", action="store_true", help="only report whether a bundle exists for the current version")
+    args = parser.parse_args(argv)
+
+    path = artifacts.bundle_path(args.output_dir)
+    if args.check:
+        print(f"{path}: {'up to date' if path.exists() else 'missing'}")
+        return 0 if path.exists() else 1
+
+    # Everything the default views compute is recomputed and kept, whatever the memory budget
+    artifacts.cache.clear()
+    artifacts.cache.max_bytes = sys.maxsize
+    root = artifacts.ROOT
+    os.chdir(root)  # the pages read demo_data.csv relative to the working directory
+    sys.path.insert(0, str(root))
+    start = time.perf_counter()
+    failed = run_default_views(root)
+    for page, message in failed:
+        print(f"{page}: {message}", file=sys.stderr)
+    if failed:
+        return 1
+
+    bundle = write_bundle(path, artifacts.cache.entries())
+    size = path.stat().st_size
+    print(f"{len(bundle['entries'])} entries, {size / 2 ** 20:,.1f} MB, built in {time.perf_counter() - start:.1f} s: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""``CorrelationService`` agrees with ``DataFrame.corr`` on the columns ``column_types`` calls numerical."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from stat2vis.correlation import CorrelationService
+from stat2vis.dataset import column_types
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 300
+    return pd.DataFrame({
+        "x": rng.normal(size=n),
+        "y": np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 20, n).astype(float)),
+        "flag": rng.random(n) < 0.4,
+        "cat": pd.Categorical(rng.choice(list("ab"), n)),
+        "text": rng.choice(["u", "v"], n).astype(object),
+    })
+
+
+@pytest.mark.parametrize("method", ["pearson", "spearman", "kendall"])
+def test_matrix_matches_pandas_for_every_numerical_column(frame, method):
+    _, numerical = column_types(frame)
+    assert "flag" in numerical
+    got = CorrelationService(frame).matrix(numerical, method)
+    expected = frame[numerical].astype(float).corr(method)
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), atol=1e-9)
+
+
+def test_pair_counts_include_boolean_columns(frame):
+    _, numerical = column_types(frame)
+    present = frame[numerical].notna().astype(int)
+    np.testing.assert_array_equal(CorrelationService(frame).pair_counts(numerical).to_numpy(), (present.T @ present).to_numpy())
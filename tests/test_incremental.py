@@ -0,0 +1,91 @@
+"""``FrameStats`` under random edits agrees with a full recompute on the edited frame."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from stat2vis.editor import EditOverlay
+
+NUMERIC = ["a", "b", "c", "flag"]
+LEVELS = list("ABCDE")
+NEW_LEVELS = list("FG")
+
+
+def make_frame(rng, n):
+    return pd.DataFrame({
+        "a": rng.normal(10, 3, n).round(1),
+        "b": rng.integers(0, 50, n),
+        "c": np.where(rng.random(n) < 0.1, np.nan, rng.exponential(2, n).round(2)),
+        "cat": pd.Categorical(rng.choice(LEVELS, n), categories=LEVELS),
+        "text": rng.choice(["x", "y", "z"], n).astype(object),
+        "flag": rng.random(n) < 0.3,
+    })
+
+
+def random_value(rng, col):
+    if col == "cat":
+        return rng.choice(LEVELS + NEW_LEVELS)       # includes levels the column does not have
+    if col == "text":
+        return None if rng.random() < 0.1 else rng.choice(["x", "y", "z", "w"])
+    if col == "flag":
+        return bool(rng.random() < 0.5)
+    if rng.random() < 0.1:
+        return None                                  # a cleared cell
+    if col == "b":
+        return int(rng.integers(-5, 60))
+    return float(np.round(rng.normal(10, 5), rng.integers(0, 3)))
+
+
+def assert_matches_full_recompute(stats, view):
+    got = stats.describe()
+    for col in view.columns:
+        series = view[col]
+        mode = series.mode()
+        if col in NUMERIC and col != "flag":
+            expected = series.describe()
+            for key in ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]:
+                np.testing.assert_allclose(float(got.loc[col, key]), expected[key], rtol=1e-9, atol=1e-9, err_msg=f"{col} {key}")
+            np.testing.assert_allclose(float(got.loc[col, "Variance"]), series.var(), rtol=1e-9, atol=1e-9)
+            np.testing.assert_allclose(float(got.loc[col, "SD"]), series.std(), rtol=1e-9, atol=1e-9)
+            assert float(got.loc[col, "top"]) == float(mode.iloc[0]), col
+        else:
+            expected = series.astype(object).describe()
+            assert got.loc[col, "count"] == expected["count"], col
+            assert got.loc[col, "unique"] == expected["unique"], col
+            assert got.loc[col, "freq"] == expected["freq"], col
+            assert got.loc[col, "top"] == mode.iloc[0], col     # ties go to the smallest level, as in mode()
+
+    numeric = view[NUMERIC].astype(float)
+    np.testing.assert_allclose(stats.matrix(NUMERIC).to_numpy(), numeric.corr().to_numpy(), atol=1e-9)
+    present = numeric.notna().astype(int)
+    np.testing.assert_array_equal(stats.pair_counts(NUMERIC).to_numpy(), (present.T @ present).to_numpy())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edits_match_full_recompute(seed):
+    rng = np.random.default_rng(seed)
+    n = 500
+    overlay = EditOverlay(make_frame(rng, n), "test")
+    overlay.stats()
+    columns = list(overlay.base.columns)
+    for step in range(400):
+        col = columns[rng.integers(len(columns))]
+        overlay.set(int(rng.integers(n)), col, random_value(rng, col))
+        if rng.random() < 0.01:
+            overlay.reset()
+        if step % 50 == 49:
+            assert_matches_full_recompute(overlay.stats(), overlay.view())
+
+
+def test_reset_restores_the_base_statistics():
+    rng = np.random.default_rng(7)
+    base = make_frame(rng, 200)
+    overlay = EditOverlay(base, "test")
+    before = overlay.stats().describe()
+    for position in range(0, 200, 3):
+        overlay.set(position, "a", None)
+        overlay.set(position, "cat", "G")
+        overlay.set(position, "b", 1000)
+    overlay.stats()
+    overlay.reset()
+    assert_matches_full_recompute(overlay.stats(), base)
+    pd.testing.assert_frame_equal(overlay.stats().describe(), before)
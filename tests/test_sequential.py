@@ -0,0 +1,100 @@
+"""Sequential A/B statistics: merged group statistics, spending boundaries, stopping rules and stream paths."""
+import numpy as np
+import pytest
+from scipy import stats
+
+from stat2vis import sequential
+from stat2vis.sequential import (
+    empty_group_stats, first_rejection, obf_spending, sequential_step, spending_boundaries, stream_path, update_group_stats,
+)
+
+
+def test_merged_batches_match_the_concatenated_data():
+    rng = np.random.default_rng(0)
+    batches = [rng.normal(5, 2, size) for size in (1, 7, 30, 2, 100)]
+    group = empty_group_stats()
+    for batch in batches:
+        group = update_group_stats(group, batch)
+    group = update_group_stats(group, [])
+    values = np.concatenate(batches)
+    assert group["n"] == len(values)
+    assert group["mean"] == pytest.approx(values.mean(), rel=1e-12)
+    assert group["m2"] / (group["n"] - 1) == pytest.approx(np.var(values, ddof=1), rel=1e-12)
+
+
+def test_obf_spending_reaches_alpha_at_the_planned_size():
+    assert obf_spending(0, 0.05) == 0
+    assert obf_spending(1, 0.05) == pytest.approx(0.05)
+    assert obf_spending(0.5, 0.05) < obf_spending(0.8, 0.05) < 0.05
+
+
+def test_a_single_final_look_is_the_fixed_sample_test():
+    assert spending_boundaries((1.0,), 0.05)[0] == pytest.approx(stats.norm.ppf(0.975), abs=0.02)
+
+
+def test_the_first_of_equal_looks_spends_its_share_of_alpha():
+    boundaries = spending_boundaries((0.2, 0.4, 0.6, 0.8, 1.0), 0.05)
+    # Nothing is spent before the first look, so it is a fixed test at the spent level, z_{α/2} / √t
+    assert boundaries[0] == pytest.approx(stats.norm.ppf(0.975) / np.sqrt(0.2), abs=0.02)
+    # Later looks are less strict, and the last one a little stricter than the fixed-sample test
+    assert np.all(np.diff(boundaries) < 0)
+    assert stats.norm.ppf(0.975) < boundaries[-1] < 2.15
+
+
+def test_boundaries_hold_the_type_one_error_under_repeated_looks():
+    rng = np.random.default_rng(1)
+    fractions = tuple(np.arange(1, 11) / 10)
+    boundaries = spending_boundaries(fractions, 0.05)
+    # Z at each look from a Brownian motion at the information fractions
+    increments = rng.normal(0, np.sqrt(np.diff((0,) + fractions)), (20000, len(fractions)))
+    z = np.cumsum(increments, axis=1) / np.sqrt(fractions)
+    rejected = (np.abs(z) >= boundaries).any(axis=1).mean()
+    assert rejected == pytest.approx(0.05, abs=0.006)
+
+
+def test_no_new_information_spends_nothing():
+    boundaries = spending_boundaries((0.5, 0.5, 1.0), 0.05)
+    assert np.isinf(boundaries[1])
+
+
+def history_of(rng, delta, looks=30, batch=20, max_n=600):
+    g1, g2 = empty_group_stats(), empty_group_stats()
+    history = []
+    for _ in range(looks):
+        g1 = update_group_stats(g1, rng.normal(delta, 1, batch))
+        g2 = update_group_stats(g2, rng.normal(0, 1, batch))
+        prev = history[-1]["p_always"] if history else 1.0
+        history.append(sequential_step(g1, g2, False, 1.0, max_n, prev))
+    return history
+
+
+def test_the_always_valid_p_value_never_increases():
+    history = history_of(np.random.default_rng(2), 0.0)
+    p_always = [h["p_always"] for h in history]
+    assert all(later <= earlier for earlier, later in zip(p_always, p_always[1:]))
+    assert all(0 <= p <= 1 for p in p_always)
+    assert history[-1]["info"] == 1.0
+
+
+def test_first_rejection_follows_the_chosen_rule():
+    history = history_of(np.random.default_rng(3), 1.0)
+    for rule in ("boundary", "msprt"):
+        index = first_rejection(history, 0.05, rule)
+        assert index is not None
+        assert first_rejection(history[:index], 0.05, rule) is None
+    at = first_rejection(history, 0.05, "msprt")
+    assert history[at]["p_always"] < 0.05
+    assert first_rejection(history_of(np.random.default_rng(4), 0.0, looks=3), 0.05, "boundary") is None
+
+
+def test_stream_paths_stay_in_the_stream_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(sequential, "STREAM_DIR", tmp_path)
+    (tmp_path / "ab.csv").write_text("group,value\n1,2.5\nB,3\n2,4")
+    assert stream_path("ab.csv") == (tmp_path / "ab.csv").resolve()
+    for name in ("../x.csv", "/etc/passwd", "sub/../../x.csv", "notes.py"):
+        assert stream_path(name) is None
+        with pytest.raises(ValueError):
+            sequential.file_batch(name, 0)
+    values1, values2, offset = sequential.file_batch("ab.csv", 0)
+    assert (values1, values2) == ([2.5], [3.0])  # the last line is not complete yet
+    assert offset == len("group,value\n1,2.5\nB,3\n")